@@ -21,14 +21,16 @@ from automation.paths import (
     OPENAPI_FILE,
     ERROR_CATALOG_FILE,
     PRD_JSON_FILE,
+    PROJECT_MANIFEST_FILE,
     PROMPTS_DIR,
+    RESOURCE_PLAN_FILE,
     RESEARCH_FILE,
     RESEARCH_JSON_FILE,
     ROUTE_MAP_FILE,
     UX_FLOWS_FILE,
     AGENTS_GUIDE,
 )
-from .base import PromptSpec, load_prompt_text
+from .base import PromptSpec
 
 # Optional artifact paths (created later in pipeline but tracked for completeness)
 ARTIFACTS_WITHOUT_PRIMARY_PROMPTS: List[Path] = [AGENTS_GUIDE]
@@ -45,14 +47,17 @@ def _spec(
     prompt_key: str,
     deliverables: Iterable[Path],
     placeholder: str | None = None,
+    inputs: Iterable[Path] = (),
+    depends_on: Iterable[int] = (),
 ) -> PromptSpec:
-    template = load_prompt_text(_prompt_path(prompt_key))
     return PromptSpec(
         number=number,
         name=name,
-        template=template,
+        template_path=_prompt_path(prompt_key),
         deliverables=tuple(deliverables),
         placeholder=placeholder,
+        inputs=tuple(inputs),
+        depends_on=tuple(depends_on),
     )
 
 
@@ -63,36 +68,54 @@ PRIMARY_PROMPTS: List[PromptSpec] = [
         prompt_key="intake_pm",
         deliverables=[PRD_JSON_FILE, DOCUMENTATION_FILE],
         placeholder="<<<PROJECT_IDEA>>>",
+        inputs=[PROJECT_MANIFEST_FILE],
     ),
     _spec(
         number=1,
         name="Researcher",
         prompt_key="researcher",
         deliverables=[RESEARCH_FILE, RESEARCH_JSON_FILE],
+        inputs=[PRD_JSON_FILE, PROJECT_MANIFEST_FILE],
+        depends_on=[0],
     ),
     _spec(
         number=2,
         name="Solution Architect",
         prompt_key="solution_architect",
         deliverables=[ARCHITECTURE_FILE, ARCHITECTURE_JSON_FILE],
+        inputs=[PRD_JSON_FILE, RESEARCH_JSON_FILE, PROJECT_MANIFEST_FILE],
+        depends_on=[0, 1],
     ),
     _spec(
         number=3,
         name="API Designer",
         prompt_key="api_designer",
         deliverables=[API_MARKDOWN_FILE, OPENAPI_FILE, ERROR_CATALOG_FILE],
+        inputs=[PRD_JSON_FILE, ARCHITECTURE_JSON_FILE],
+        depends_on=[0, 2],
     ),
     _spec(
         number=4,
         name="UX Designer",
         prompt_key="ux_designer",
         deliverables=[UX_FLOWS_FILE, ROUTE_MAP_FILE],
+        inputs=[PRD_JSON_FILE, API_MARKDOWN_FILE],
+        depends_on=[0, 3],
     ),
     _spec(
         number=5,
         name="Planner",
         prompt_key="planner",
         deliverables=[BACKLOG_FILE],
+        inputs=[
+            PRD_JSON_FILE,
+            ARCHITECTURE_JSON_FILE,
+            OPENAPI_FILE,
+            UX_FLOWS_FILE,
+            RESOURCE_PLAN_FILE,
+            PROJECT_MANIFEST_FILE,
+        ],
+        depends_on=[0, 2, 3, 4],
     ),
     _spec(
         number=6,
@@ -109,6 +132,8 @@ PRIMARY_PROMPTS: List[PromptSpec] = [
             FRONTEND_PACKAGE_JSON,
             BACKEND_PACKAGE_JSON,
         ],
+        inputs=[BACKLOG_FILE, PROJECT_MANIFEST_FILE],
+        depends_on=[5],
     ),
 ]
 
@@ -1,27 +1,71 @@
 from __future__ import annotations
 
+import threading
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional, Sequence
+from typing import Dict, Optional, Sequence, Tuple
 
 from automation.paths import PROMPTS_DIR
 
+GUARDRAILS_PATH = PROMPTS_DIR / "global_guardrails.md"
+
 
 @dataclass(frozen=True)
 class PromptSpec:
     number: int
     name: str
-    template: str
+    # Loaded on first use of ``template``; ``None`` for ad-hoc specs without a template.
+    template_path: Optional[Path]
     deliverables: Sequence[Path]
     placeholder: Optional[str] = None
+    inputs: Sequence[Path] = ()
+    depends_on: Sequence[int] = ()
+
+    @property
+    def template(self) -> str:
+        if self.template_path is None:
+            return ""
+        return load_prompt_text(self.template_path)
+
+
+class _TextCache:
+    """Stripped file contents keyed by path, reloaded when the file's mtime or size changes."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._entries: Dict[Path, Tuple[Tuple[int, int], str]] = {}
+
+    def read(self, path: Path) -> Optional[str]:
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            with self._lock:
+                self._entries.pop(path, None)
+            return None
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            entry = self._entries.get(path)
+        if entry is not None and entry[0] == stamp:
+            return entry[1]
+        text = path.read_text(encoding="utf-8").strip()
+        with self._lock:
+            self._entries[path] = (stamp, text)
+        return text
+
+
+_TEXT_CACHE = _TextCache()
 
 
 def load_prompt_text(path: Path) -> str:
-    if not path.exists():
+    """Return the template at ``path`` with ``{{GUARDRAILS}}`` expanded.
+
+    Templates and the shared guardrails are read once and cached; each call
+    only stats the files, so edits made while the workflow runs are picked up.
+    """
+    text = _TEXT_CACHE.read(path)
+    if text is None:
         raise FileNotFoundError(f"Prompt template not found: {path}")
-    text = path.read_text(encoding="utf-8").strip()
-    guardrails_path = PROMPTS_DIR / "global_guardrails.md"
-    guardrails = ""
-    if guardrails_path.exists():
-        guardrails = guardrails_path.read_text(encoding="utf-8").strip()
+    if "{{GUARDRAILS}}" not in text:
+        return text
+    guardrails = _TEXT_CACHE.read(GUARDRAILS_PATH) or ""
     return text.replace("{{GUARDRAILS}}", guardrails)
@@ -12,17 +12,16 @@ from automation.paths import (
     ENV_EXAMPLE_FILE,
 )
 
-from ..base import PromptSpec, load_prompt_text
+from ..base import PromptSpec
 
 PROMPT_PATH = Path(__file__).with_name("prompt.txt")
 
 
 def get_prompt_spec() -> PromptSpec:
-    template = load_prompt_text(PROMPT_PATH)
     return PromptSpec(
         number=0,
         name="DevOps Bootstrap",
-        template=template,
+        template_path=PROMPT_PATH,
         deliverables=[
             DOCKER_COMPOSE_DEV_FILE,
             DEVOPS_START_SCRIPT,
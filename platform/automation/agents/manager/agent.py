@@ -6,7 +6,6 @@ from typing import Optional, Sequence
 from ..base import load_prompt_text
 
 PROMPT_PATH = Path(__file__).with_name("prompt.txt")
-BASE_PROMPT = load_prompt_text(PROMPT_PATH)
 
 
 def build_prompt(
@@ -28,7 +27,7 @@ def build_prompt(
     else:
         deliverable_text = "- (no direct file deliverables)"
     parts = [
-        BASE_PROMPT,
+        load_prompt_text(PROMPT_PATH),
         f"Deliverable locations:\n{deliverable_text}",
     ]
     if task_id and task_source:
@@ -6,7 +6,6 @@ from typing import Optional
 from ..base import load_prompt_text
 
 PROMPT_PATH = Path(__file__).with_name("prompt.txt")
-BASE_PROMPT = load_prompt_text(PROMPT_PATH)
 
 
 def build_prompt(
@@ -28,7 +27,7 @@ def build_prompt(
             pass
 
     parts = [
-        BASE_PROMPT,
+        load_prompt_text(PROMPT_PATH),
         f"Task ID: {task_id}",
         f"Task definition source: {task_source}",
         f"Agent report: {report_path}",
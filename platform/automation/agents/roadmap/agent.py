@@ -4,16 +4,15 @@ from pathlib import Path
 
 from automation.paths import ROADMAP_FILE
 
-from ..base import PromptSpec, load_prompt_text
+from ..base import PromptSpec
 
 PROMPT_PATH = Path(__file__).with_name("prompt.txt")
 
 
 def get_prompt_spec() -> PromptSpec:
-    template = load_prompt_text(PROMPT_PATH)
     return PromptSpec(
         number=2,
         name="Milestone Roadmap",
-        template=template,
+        template_path=PROMPT_PATH,
         deliverables=[ROADMAP_FILE],
     )
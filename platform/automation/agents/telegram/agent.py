@@ -4,16 +4,15 @@ from pathlib import Path
 
 from automation.paths import TELEGRAM_BASE_DIR
 
-from ..base import PromptSpec, load_prompt_text
+from ..base import PromptSpec
 
 PROMPT_PATH = Path(__file__).with_name("prompt.txt")
 
 
 def get_prompt_spec() -> PromptSpec:
-    template = load_prompt_text(PROMPT_PATH)
     return PromptSpec(
         number=-1,
         name="Telegram Relay",
-        template=template,
+        template_path=PROMPT_PATH,
         deliverables=[TELEGRAM_BASE_DIR],
     )
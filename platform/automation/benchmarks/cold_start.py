@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""Cold-start benchmark: time from launching workflow.py to its first Codex call.
+
+Every run is a fresh ``workflow.py --profile-startup`` process against a
+throwaway workspace, with ``fake_codex.py`` on PATH as ``codex``. Scenarios:
+
+    tasks   a synthetic backlog of ``--tasks`` entries; the first task is
+            the first Codex call (primary chain skipped, --max-tasks 1)
+    bug     one pending bug report and no backlog tasks, like the short
+            triage runs the Telegram bot starts
+
+The per-phase breakdown comes from the run's startup profile
+(``automation_artifacts/profiles/``); ``interpreter`` is the time between
+spawning the process and the start of workflow.py's imports. Medians over
+``--runs`` are printed, compared with the previous entry for the same
+scenario in ``--history`` and appended to it, so regressions show up over time.
+
+    python platform/automation/benchmarks/cold_start.py --runs 10 --scenarios tasks bug
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from workflow_bench import REPO_ROOT, WORKFLOW_SCRIPT, build_backlog, prepare_workspace
+
+SCENARIOS = ("tasks", "bug")
+DEFAULT_HISTORY = REPO_ROOT / "platform" / "automation_artifacts" / "benchmarks" / "cold_start.jsonl"
+# Phases shown as columns; every recorded phase still goes to the history file.
+COLUMNS = ("interpreter", "imports", "workflow_init", "primary_chain", "backlog")
+
+
+def prepare_scenario(root: Path, scenario: str, task_count: int) -> tuple[Path, List[str]]:
+    backlog = build_backlog(task_count if scenario == "tasks" else 0, seed=7, dep_density=0.3)
+    workspace = prepare_workspace(root, backlog)
+    if scenario == "tasks":
+        return workspace, ["--max-tasks", "1"]
+    bug_dir = workspace / "platform" / "automation_artifacts" / "bugs" / "BUG-0001"
+    bug_dir.mkdir(parents=True)
+    submission = {
+        "bug_id": "BUG-0001",
+        "summary": "Login button does nothing",
+        "steps": "Open the app and press Login.",
+        "expected": "The login form opens.",
+        "actual": "Nothing happens.",
+        "reporter": {"id": "bench"},
+        "submitted_at": "1970-01-01T00:00:00Z",
+    }
+    (bug_dir / "submission.json").write_text(json.dumps(submission), encoding="utf-8")
+    return workspace, ["--skip-tasks"]
+
+
+def run_once(root: Path, workspace: Path, scenario_args: List[str]) -> Optional[Dict[str, float]]:
+    """Run workflow.py once; return phase durations in ms, or None without a profile."""
+    profiles_dir = workspace / "platform" / "automation_artifacts" / "profiles"
+    shutil.rmtree(profiles_dir, ignore_errors=True)
+    env = {**os.environ, "FAKE_CODEX_STATE_DIR": str(root / "fake-state")}
+    env["PATH"] = f"{root / 'bin'}{os.pathsep}{env.get('PATH', '')}"
+    command = [
+        sys.executable,
+        str(WORKFLOW_SCRIPT),
+        "--workspace",
+        str(workspace),
+        "--skip-docs",
+        "--skip-backlog",
+        "--skip-devops",
+        "--reprocess-tasks",
+        "--agent-retries",
+        "0",
+        "--profile-startup",
+        *scenario_args,
+    ]
+    spawned_at = time.time()
+    subprocess.run(command, cwd=REPO_ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    reports = sorted(profiles_dir.glob("startup-*.json"))
+    if not reports:
+        return None
+    report = json.loads(reports[-1].read_text(encoding="utf-8"))
+    interpreter_ms = max(0.0, (report["origin_unix"] - spawned_at) * 1000)
+    phases: Dict[str, float] = {"interpreter": interpreter_ms, "first_call": interpreter_ms + report["total_ms"]}
+    for phase in report["phases"]:
+        phases[phase["name"]] = phases.get(phase["name"], 0.0) + phase["duration_ms"]
+    return phases
+
+
+def git_commit() -> str:
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=REPO_ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+    return result.stdout.strip()
+
+
+def previous_entry(history: Path, scenario: str) -> Optional[dict]:
+    if not history.exists():
+        return None
+    latest = None
+    for line in history.read_text(encoding="utf-8").splitlines():
+        try:
+            entry = json.loads(line)
+        except json.JSONDecodeError:
+            continue
+        if entry.get("scenario") == scenario:
+            latest = entry
+    return latest
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--runs", type=int, default=5, help="Fresh processes per scenario (default: 5).")
+    parser.add_argument("--tasks", type=int, default=200, help="Backlog size for the tasks scenario.")
+    parser.add_argument("--history", type=Path, default=DEFAULT_HISTORY, help="JSON Lines file of past results.")
+    parser.add_argument("--no-record", action="store_true", help="Do not append the results to --history.")
+    args = parser.parse_args()
+
+    commit = git_commit()
+    header = f"{'scenario':<9} {'first call ms':>13} " + " ".join(f"{name:>13}" for name in COLUMNS) + "  vs previous"
+    print(header)
+    for scenario in args.scenarios:
+        root = Path(tempfile.mkdtemp(prefix="cold-start-"))
+        samples: List[Dict[str, float]] = []
+        try:
+            workspace, scenario_args = prepare_scenario(root, scenario, args.tasks)
+            for _ in range(max(1, args.runs)):
+                phases = run_once(root, workspace, scenario_args)
+                if phases is not None:
+                    samples.append(phases)
+        finally:
+            shutil.rmtree(root, ignore_errors=True)
+        if not samples:
+            print(f"{scenario:<9} no startup profile was written; run workflow.py by hand to see why.")
+            continue
+
+        names = sorted({name for sample in samples for name in sample})
+        medians = {name: statistics.median(sample.get(name, 0.0) for sample in samples) for name in names}
+        previous = previous_entry(args.history, scenario)
+        comparison = ""
+        if previous:
+            delta = medians["first_call"] - previous["median_ms"]["first_call"]
+            comparison = f"{delta:+.1f} ms vs {previous.get('commit', '?')}"
+        print(
+            f"{scenario:<9} {medians['first_call']:13.1f} "
+            + " ".join(f"{medians.get(name, 0.0):13.1f}" for name in COLUMNS)
+            + f"  {comparison}"
+        )
+
+        if not args.no_record:
+            args.history.parent.mkdir(parents=True, exist_ok=True)
+            entry = {
+                "recorded_at": datetime.now(timezone.utc).isoformat(),
+                "commit": commit,
+                "python": platform.python_version(),
+                "host": platform.node(),
+                "scenario": scenario,
+                "runs": len(samples),
+                "median_ms": {name: round(value, 2) for name, value in medians.items()},
+            }
+            with args.history.open("a", encoding="utf-8") as handle:
+                handle.write(json.dumps(entry) + "\n")
+
+
+if __name__ == "__main__":
+    main()
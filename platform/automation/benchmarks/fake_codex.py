@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""Deterministic stand-in for the ``codex`` CLI.
+
+Accepts the ``codex exec`` command lines built by ``CodexRunner`` and the
+Telegram bot, reads the prompt from stdin and prints a transcript in the same
+shape as the real CLI: a ``session id:`` header, filler output, then a
+``codex`` block with a JSON verdict followed by ``tokens used``. Behaviour is
+configured through the environment:
+
+    FAKE_CODEX_LATENCY        seconds to sleep per run (default: 0)
+    FAKE_CODEX_JITTER         +/- fraction applied to the latency (default: 0)
+    FAKE_CODEX_OUTPUT_BYTES   approximate transcript size (default: 2048)
+    FAKE_CODEX_FAILURE_RATE   probability of exiting with status 1 (default: 0)
+    FAKE_CODEX_REJECT_RATE    probability of a "fail" verdict (default: 0)
+    FAKE_CODEX_SEED           seed for all random choices (default: 0)
+    FAKE_CODEX_STATE_DIR      directory for per-prompt call counters; without
+                              it a repeated prompt always gets the same outcome
+
+Outcomes are derived from the seed, a hash of the prompt and how often that
+prompt has been seen, so a benchmark run is reproducible end to end.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import random
+import sys
+import time
+import uuid
+from pathlib import Path
+from typing import List, Optional
+
+FILLER_LINE = "exec: synthetic tool output for benchmark runs ................................\n"
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+def _option(argv: List[str], flag: str) -> Optional[str]:
+    if flag in argv:
+        index = argv.index(flag)
+        if index + 1 < len(argv):
+            return argv[index + 1]
+    return None
+
+
+def _call_count(state_dir: Optional[str], digest: str) -> int:
+    if not state_dir:
+        return 0
+    path = Path(state_dir) / digest
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # O_APPEND keeps concurrent invocations of the same prompt from losing counts.
+    fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        os.write(fd, b".")
+    finally:
+        os.close(fd)
+    return path.stat().st_size - 1
+
+
+def main() -> int:
+    argv = sys.argv[1:]
+    prompt = sys.stdin.read()
+    digest = hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:16]
+    seed = os.environ.get("FAKE_CODEX_SEED", "0")
+    calls = _call_count(os.environ.get("FAKE_CODEX_STATE_DIR"), digest)
+    rng = random.Random(f"{seed}:{digest}:{calls}")
+
+    resume = _option(argv, "resume")
+    session_id = resume or str(uuid.UUID(int=rng.getrandbits(128)))
+
+    out = sys.stdout
+    out.write("OpenAI Codex (fake)\n--------\n")
+    out.write(f"workdir: {_option(argv, '--cd') or os.getcwd()}\n")
+    out.write(f"model: {_option(argv, '-m') or 'default'}\n")
+    out.write(f"session id: {session_id}\n--------\n")
+    out.write("user\n" + (prompt.strip().splitlines() or [""])[0][:200] + "\n")
+    out.flush()
+
+    latency = max(0.0, _env_float("FAKE_CODEX_LATENCY", 0.0))
+    jitter = max(0.0, _env_float("FAKE_CODEX_JITTER", 0.0))
+    if latency:
+        time.sleep(latency * max(0.0, 1 + jitter * rng.uniform(-1, 1)))
+
+    output_bytes = int(_env_float("FAKE_CODEX_OUTPUT_BYTES", 2048))
+    if output_bytes > 0:
+        out.write(FILLER_LINE * max(1, output_bytes // len(FILLER_LINE)))
+
+    if rng.random() < _env_float("FAKE_CODEX_FAILURE_RATE", 0.0):
+        out.write("ERROR: synthetic failure injected by FAKE_CODEX_FAILURE_RATE\n")
+        out.flush()
+        return 1
+
+    if rng.random() < _env_float("FAKE_CODEX_REJECT_RATE", 0.0):
+        verdict = {
+            "status": "fail",
+            "issues": [f"Synthetic issue {digest[:6]}-{calls}"],
+            "summary": "Rejected by the fake reviewer.",
+            "next_actor": "agent",
+        }
+    else:
+        verdict = {"status": "pass", "issues": [], "summary": "Accepted by the fake reviewer."}
+    out.write("codex\n" + json.dumps(verdict) + "\ntokens used\n")
+    out.write(f"{len(prompt) // 4 + output_bytes // 4}\n")
+    out.flush()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
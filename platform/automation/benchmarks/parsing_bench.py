@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""Micro-benchmark for the fallback JSON extraction in automation.parsing.
+
+Builds noisy agent outputs (prose, stray brackets, malformed JSON fragments)
+that end with a valid review object and times ``_extract_json_object`` on
+them. The pre-scanner extractor is timed alongside for comparison, but only
+up to ``--legacy-max-bytes`` because its cost grows quadratically.
+
+A second, adversarial case puts the review object first and follows it with
+``--nested-count`` malformed objects nested ``--nested-depth`` deep, so every
+one of them has to be rejected before the review is reached.
+
+Extraction must stay linear: the run fails when a noisy payload takes more
+than ``--budget-ms`` per MiB (default: 500 ms).
+
+    python platform/automation/benchmarks/parsing_bench.py --sizes 65536 1048576
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Callable, List, Optional
+
+if __package__ is None or __package__ == "":
+    sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from automation.parsing import _extract_json_object
+
+NOISE_FRAGMENTS = [
+    "Running tests for module {name} ... ",
+    "{ partial object without close ",
+    "[array, of, bare words] ",
+    '{"unterminated": "value ',
+    "See docs/[section] for details. ",
+    "} stray closer ",
+    '{"key": tru} ',
+    "[1, 2, 3, ",
+    "plain prose with no brackets at all. ",
+    "\n",
+]
+
+
+def _legacy_extract(payload: str) -> Optional[dict]:
+    decoder = json.JSONDecoder()
+    idx = 0
+    length = len(payload)
+    while idx < length:
+        char = payload[idx]
+        if char in "{[":
+            try:
+                obj, _ = decoder.raw_decode(payload[idx:])
+                return obj
+            except json.JSONDecodeError:
+                pass
+        idx += 1
+    return None
+
+
+def build_payload(size: int, *, seed: int) -> str:
+    rng = random.Random(seed)
+    review = json.dumps(
+        {
+            "status": "pass",
+            "issues": [],
+            "summary": "Synthetic review appended after noisy transcript output.",
+        }
+    )
+    parts: List[str] = []
+    total = 0
+    budget = max(0, size - len(review))
+    while total < budget:
+        fragment = rng.choice(NOISE_FRAGMENTS)
+        parts.append(fragment)
+        total += len(fragment)
+    parts.append(review)
+    return "".join(parts)
+
+
+def build_nested_payload(count: int, depth: int) -> str:
+    review = json.dumps({"status": "pass", "issues": [], "summary": "Review followed by nested noise."})
+    malformed = '{"k": ' * depth + "tru" + "}" * depth
+    return " ".join([review, *([malformed] * count)])
+
+
+def _time(fn: Callable[[str], Optional[dict]], payload: str, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn(payload)
+        elapsed = time.perf_counter() - started
+        if not isinstance(result, dict) or result.get("status") != "pass":
+            raise RuntimeError(f"{fn.__name__} did not recover the review object")
+        best = min(best, elapsed)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[16 * 1024, 128 * 1024, 1024 * 1024],
+        help="Payload sizes in bytes (default: 16 KiB, 128 KiB, 1 MiB).",
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per size; the best time is reported.")
+    parser.add_argument("--seed", type=int, default=7, help="Seed for the noise generator.")
+    parser.add_argument(
+        "--legacy-max-bytes",
+        type=int,
+        default=128 * 1024,
+        help="Largest payload the legacy extractor is timed on (default: 128 KiB).",
+    )
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=500.0,
+        help="Fail when extraction takes longer than this per MiB of noisy payload (default: 500; 0 disables).",
+    )
+    parser.add_argument("--nested-count", type=int, default=200, help="Malformed objects in the nested case.")
+    parser.add_argument("--nested-depth", type=int, default=500, help="Nesting depth of each malformed object.")
+    args = parser.parse_args()
+
+    print(f"{'bytes':>10}  {'scanner ms':>11}  {'legacy ms':>10}")
+    over_budget: List[str] = []
+    for size in args.sizes:
+        payload = build_payload(size, seed=args.seed)
+        scanner_ms = _time(_extract_json_object, payload, args.repeat) * 1000
+        # Tiny payloads are dominated by fixed costs; only judge from 64 KiB up.
+        allowed_ms = args.budget_ms * len(payload) / (1024 * 1024)
+        if args.budget_ms > 0 and size >= 64 * 1024 and scanner_ms > allowed_ms:
+            over_budget.append(f"{len(payload)} bytes took {scanner_ms:.1f} ms (budget {allowed_ms:.1f} ms)")
+        if size <= args.legacy_max_bytes:
+            legacy_ms = f"{_time(_legacy_extract, payload, 1) * 1000:10.1f}"
+        else:
+            legacy_ms = f"{'skipped':>10}"
+        print(f"{len(payload):>10}  {scanner_ms:11.1f}  {legacy_ms}")
+
+    payload = build_nested_payload(args.nested_count, args.nested_depth)
+    scanner_ms = _time(_extract_json_object, payload, args.repeat) * 1000
+    print(
+        f"{len(payload):>10}  {scanner_ms:11.1f}  {'':>10}  "
+        f"({args.nested_count} malformed objects nested {args.nested_depth} deep)"
+    )
+    if over_budget:
+        raise SystemExit("Extraction is over budget: " + "; ".join(over_budget))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""End-to-end benchmark of workflow.py's task loop against the fake Codex CLI.
+
+For every backlog size (and ``--parallel`` setting), builds a throwaway
+workspace with a synthetic BACKLOG/backlog.json, puts ``fake_codex.py`` on
+PATH as ``codex`` and runs ``workflow.py`` with the primary chain skipped.
+Task and Codex timings come from the run's OTLP span file
+(``automation_artifacts/traces/spans.jsonl``). Reported columns:
+
+    tasks/s      completed tasks per second of workflow wall time
+    p50/p99 ms   task span latency
+    orch p50 ms  per-task time outside Codex processes (prompt building,
+                 parsing, state writes)
+    idle s       wall time with no task in flight (start-up and scheduling gaps)
+    rss MB       peak RSS of the workflow process
+
+    python platform/automation/benchmarks/workflow_bench.py --tasks 10 100 1000 5000 --parallel 1 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import shutil
+import stat
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+REPO_ROOT = Path(__file__).resolve().parents[3]
+WORKFLOW_SCRIPT = REPO_ROOT / "platform" / "automation" / "workflow.py"
+FAKE_CODEX = Path(__file__).resolve().parent / "fake_codex.py"
+# Owners that map to supporting prompts; "Dev" tasks also run a QA review.
+OWNERS = ("Dev", "Doc", "Reviewer", "Security", "Perf")
+
+
+def build_backlog(count: int, *, seed: int, dep_density: float) -> dict:
+    rng = random.Random(seed)
+    tasks = []
+    for index in range(count):
+        task_id = f"T-{index + 1:03d}"
+        deps: List[str] = []
+        if index and rng.random() < dep_density:
+            window = range(max(0, index - 50), index)
+            deps = sorted({f"T-{rng.choice(window) + 1:03d}" for _ in range(rng.randint(1, 2))})
+        tasks.append(
+            {
+                "id": task_id,
+                "title": f"Synthetic task {index + 1}",
+                "owner": OWNERS[index % len(OWNERS)],
+                "area": "bench",
+                "deps": deps,
+                "dod": ["Synthetic definition of done."],
+                "tests": [],
+                "artifacts": [],
+                "estimate_points": rng.randint(1, 5),
+                "tags": ["bench"],
+            }
+        )
+    return {"version": 1, "generated_at": "1970-01-01T00:00:00Z", "tasks": tasks}
+
+
+def prepare_workspace(root: Path, backlog: dict) -> Path:
+    workspace = root / "workspace"
+    (workspace / "docs").mkdir(parents=True)
+    backlog_path = workspace / "platform" / "BACKLOG" / "backlog.json"
+    backlog_path.parent.mkdir(parents=True)
+    backlog_path.write_text(json.dumps(backlog), encoding="utf-8")
+    bin_dir = root / "bin"
+    bin_dir.mkdir()
+    shim = bin_dir / "codex"
+    shim.write_text(f'#!/bin/sh\nexec "{sys.executable}" "{FAKE_CODEX}" "$@"\n', encoding="utf-8")
+    shim.chmod(shim.stat().st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+    return workspace
+
+
+def run_workflow(
+    root: Path,
+    workspace: Path,
+    *,
+    parallel: int,
+    policy: str,
+    fake_env: Dict[str, str],
+    extra_args: Sequence[str],
+) -> Tuple[int, float, float]:
+    """Run workflow.py once; return (exit code, wall seconds, peak RSS in MB)."""
+    env = {**os.environ, **fake_env}
+    env["PATH"] = f"{root / 'bin'}{os.pathsep}{env.get('PATH', '')}"
+    env["FAKE_CODEX_STATE_DIR"] = str(root / "fake-state")
+    command = [
+        sys.executable,
+        str(WORKFLOW_SCRIPT),
+        "--workspace",
+        str(workspace),
+        "--skip-docs",
+        "--skip-backlog",
+        "--skip-devops",
+        "--max-parallel-tasks",
+        str(parallel),
+        "--schedule-policy",
+        policy,
+        *extra_args,
+    ]
+    with (root / "workflow.log").open("w", encoding="utf-8") as log:
+        started = time.perf_counter()
+        process = subprocess.Popen(command, cwd=REPO_ROOT, env=env, stdout=log, stderr=subprocess.STDOUT)
+        # wait4 reports this child's own rusage, so RSS is not mixed up across runs.
+        _, status, usage = os.wait4(process.pid, 0)
+        wall = time.perf_counter() - started
+    process.returncode = os.waitstatus_to_exitcode(status)
+    # ru_maxrss is in KiB on Linux; the fake Codex children are far smaller than the workflow.
+    return process.returncode, wall, usage.ru_maxrss / 1024
+
+
+def load_spans(path: Path) -> List[dict]:
+    spans: List[dict] = []
+    if not path.exists():
+        return spans
+    with path.open("r", encoding="utf-8") as handle:
+        for line in handle:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            for resource in record.get("resourceSpans", []):
+                for scope in resource.get("scopeSpans", []):
+                    spans.extend(scope.get("spans", []))
+    return spans
+
+
+def percentile(values: Sequence[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def summarize(spans: List[dict], wall: float) -> Dict[str, float]:
+    by_id = {span["spanId"]: span for span in spans}
+
+    def bounds(span: dict) -> Tuple[int, int]:
+        return int(span["startTimeUnixNano"]), int(span["endTimeUnixNano"])
+
+    def task_of(span: dict) -> Optional[str]:
+        current: Optional[dict] = span
+        while current is not None:
+            if current["name"] == "task":
+                return current["spanId"]
+            current = by_id.get(current.get("parentSpanId", ""))
+        return None
+
+    tasks = [span for span in spans if span["name"] == "task"]
+    codex_ns: Dict[str, int] = {}
+    for span in spans:
+        if span["name"] == "codex.exec":
+            owner = task_of(span)
+            if owner is not None:
+                start, end = bounds(span)
+                codex_ns[owner] = codex_ns.get(owner, 0) + end - start
+
+    latencies = []
+    orchestration = []
+    for span in tasks:
+        start, end = bounds(span)
+        latencies.append((end - start) / 1e6)
+        orchestration.append((end - start - codex_ns.get(span["spanId"], 0)) / 1e6)
+
+    busy_ns = 0
+    covered_until = 0
+    for start, end in sorted(bounds(span) for span in tasks):
+        start = max(start, covered_until)
+        if end > start:
+            busy_ns += end - start
+            covered_until = end
+
+    completed = sum(1 for span in tasks if span.get("status", {}).get("code") != 2)
+    return {
+        "completed": completed,
+        "throughput": completed / wall if wall else 0.0,
+        "p50": percentile(latencies, 0.50),
+        "p99": percentile(latencies, 0.99),
+        "orch_p50": percentile(orchestration, 0.50),
+        "idle": max(0.0, wall - busy_ns / 1e9),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, nargs="+", default=[10, 100, 1000], help="Backlog sizes to run.")
+    parser.add_argument("--parallel", type=int, nargs="+", default=[1], help="--max-parallel-tasks values to run.")
+    parser.add_argument("--schedule-policy", default="id", help="Passed through to workflow.py (default: id).")
+    parser.add_argument("--dep-density", type=float, default=0.3, help="Fraction of tasks with dependencies.")
+    parser.add_argument("--latency", type=float, default=0.0, help="FAKE_CODEX_LATENCY in seconds.")
+    parser.add_argument("--jitter", type=float, default=0.0, help="FAKE_CODEX_JITTER fraction.")
+    parser.add_argument("--output-bytes", type=int, default=2048, help="FAKE_CODEX_OUTPUT_BYTES per run.")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="FAKE_CODEX_FAILURE_RATE.")
+    parser.add_argument("--reject-rate", type=float, default=0.0, help="FAKE_CODEX_REJECT_RATE.")
+    parser.add_argument("--seed", type=int, default=7, help="Seed for the backlog and the fake CLI.")
+    parser.add_argument("--json", dest="json_path", help="Also write the results as JSON to this path.")
+    parser.add_argument("--keep", action="store_true", help="Keep the temporary workspaces for inspection.")
+    parser.add_argument(
+        "workflow_args",
+        nargs="*",
+        help="Extra workflow.py arguments, after '--' (e.g. -- --agent-retries 2 --codex-pool-size 2).",
+    )
+    args = parser.parse_args()
+
+    fake_env = {
+        "FAKE_CODEX_LATENCY": str(args.latency),
+        "FAKE_CODEX_JITTER": str(args.jitter),
+        "FAKE_CODEX_OUTPUT_BYTES": str(args.output_bytes),
+        "FAKE_CODEX_FAILURE_RATE": str(args.failure_rate),
+        "FAKE_CODEX_REJECT_RATE": str(args.reject_rate),
+        "FAKE_CODEX_SEED": str(args.seed),
+    }
+
+    results = []
+    header = (
+        f"{'tasks':>6} {'par':>4} {'done':>6} {'wall s':>8} {'tasks/s':>8} {'p50 ms':>8} "
+        f"{'p99 ms':>8} {'orch p50 ms':>11} {'idle s':>7} {'rss MB':>7} {'exit':>4}"
+    )
+    print(header)
+    for count in args.tasks:
+        backlog = build_backlog(count, seed=args.seed, dep_density=args.dep_density)
+        for parallel in args.parallel:
+            root = Path(tempfile.mkdtemp(prefix="workflow-bench-"))
+            try:
+                workspace = prepare_workspace(root, backlog)
+                exit_code, wall, rss_mb = run_workflow(
+                    root,
+                    workspace,
+                    parallel=parallel,
+                    policy=args.schedule_policy,
+                    fake_env=fake_env,
+                    extra_args=args.workflow_args,
+                )
+                spans = load_spans(workspace / "platform" / "automation_artifacts" / "traces" / "spans.jsonl")
+                stats = summarize(spans, wall)
+            finally:
+                if args.keep:
+                    print(f"  kept {root}")
+                else:
+                    shutil.rmtree(root, ignore_errors=True)
+            row = {"tasks": count, "parallel": parallel, "wall": wall, "rss_mb": rss_mb, "exit": exit_code, **stats}
+            results.append(row)
+            print(
+                f"{count:>6} {parallel:>4} {row['completed']:>6} {wall:8.2f} {row['throughput']:8.2f} "
+                f"{row['p50']:8.1f} {row['p99']:8.1f} {row['orch_p50']:11.1f} {row['idle']:7.2f} "
+                f"{rss_mb:7.1f} {exit_code:>4}"
+            )
+
+    if args.json_path:
+        Path(args.json_path).write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
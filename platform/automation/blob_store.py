@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+import gzip
+import hashlib
+import io
+import json
+import os
+import shutil
+import threading
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import BinaryIO, Dict, List, Optional, Tuple
+
+try:
+    import zstandard
+except ImportError:  # Optional; without it blobs are gzip-compressed.
+    zstandard = None  # type: ignore[assignment]
+
+BLOBS_DIR_NAME = "blobs"
+MANIFEST_NAME = "manifest.jsonl"
+CODEC_SUFFIXES = {"zstd": ".zst", "gzip": ".gz"}
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+@dataclass(frozen=True)
+class BlobRecord:
+    # Path of the original file relative to the artifacts directory, e.g. "tasks/t-011/agent-retry3.log".
+    label: str
+    sha256: str
+    size: int
+    stored_size: int
+    codec: str
+    archived_at: str
+
+
+class BlobStore:
+    """Content-addressed, compressed storage for Codex transcripts.
+
+    Blobs live under ``<root>/objects/<first two hex digits>/<sha256><suffix>``
+    and are named after the SHA-256 of their uncompressed content, so a
+    transcript identical to one already stored costs no extra space. They are
+    compressed with zstd when ``zstandard`` is installed and gzip otherwise;
+    the codec is recorded per blob, so either kind can be read back.
+
+    ``<root>/manifest.jsonl`` maps labels to blobs, one JSON record per
+    archived file; the newest record for a label wins. Writers append whole
+    lines, so readers in other processes (the Telegram bot) can follow the
+    manifest incrementally while the workflow keeps archiving.
+    """
+
+    def __init__(self, root: Path, *, codec: Optional[str] = None) -> None:
+        self.root = root
+        self.objects_dir = root / "objects"
+        self.manifest_path = root / MANIFEST_NAME
+        self.codec = codec or ("zstd" if zstandard is not None else "gzip")
+        if self.codec not in CODEC_SUFFIXES:
+            raise ValueError(f"Unknown blob codec: {self.codec}")
+        if self.codec == "zstd" and zstandard is None:
+            raise ValueError("The zstd codec needs the zstandard package.")
+        self._lock = threading.Lock()
+        self._records: Dict[str, BlobRecord] = {}
+        # Manifest bytes already parsed, and the inode they came from.
+        self._manifest_offset = 0
+        self._manifest_inode: Optional[int] = None
+
+    # writing
+
+    def archive(self, path: Path, label: str) -> BlobRecord:
+        """Store ``path`` under ``label``, record it in the manifest and delete the original."""
+        digest, size = _hash_file(path)
+        existing = self._find_object(digest)
+        if existing is not None:
+            blob_path, codec = existing
+        else:
+            codec = self.codec
+            blob_path = self._object_path(digest, codec)
+            blob_path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = blob_path.with_name(f"{blob_path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            with path.open("rb") as source, temp_path.open("wb") as target:
+                _compress(source, target, codec)
+            os.replace(temp_path, blob_path)
+        record = BlobRecord(
+            label=label,
+            sha256=digest,
+            size=size,
+            stored_size=0 if existing is not None else blob_path.stat().st_size,
+            codec=codec,
+            archived_at=datetime.now(timezone.utc).isoformat(),
+        )
+        line = (json.dumps(asdict(record), sort_keys=True) + "\n").encode("utf-8")
+        with self._lock:
+            self.root.mkdir(parents=True, exist_ok=True)
+            fd = os.open(self.manifest_path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+            try:
+                os.write(fd, line)
+            finally:
+                os.close(fd)
+        path.unlink()
+        return record
+
+    # reading
+
+    def lookup(self, label: str) -> Optional[BlobRecord]:
+        with self._lock:
+            self._refresh()
+            return self._records.get(label)
+
+    def labels(self, prefix: str = "") -> List[str]:
+        """Archived labels starting with ``prefix``, oldest archive first."""
+        with self._lock:
+            self._refresh()
+            records = [record for label, record in self._records.items() if label.startswith(prefix)]
+        return [record.label for record in sorted(records, key=lambda record: (record.archived_at, record.label))]
+
+    def read_bytes(self, label: str) -> Optional[bytes]:
+        record = self.lookup(label)
+        if record is None:
+            return None
+        blob_path = self._object_path(record.sha256, record.codec)
+        try:
+            with blob_path.open("rb") as handle:
+                return _decompress(handle, record.codec)
+        except FileNotFoundError:
+            return None
+
+    def read_text(self, label: str) -> Optional[str]:
+        data = self.read_bytes(label)
+        return data.decode("utf-8", errors="replace") if data is not None else None
+
+    def _refresh(self) -> None:
+        try:
+            stat = self.manifest_path.stat()
+        except FileNotFoundError:
+            self._records.clear()
+            self._manifest_offset = 0
+            self._manifest_inode = None
+            return
+        if stat.st_ino != self._manifest_inode or stat.st_size < self._manifest_offset:
+            self._records.clear()
+            self._manifest_offset = 0
+            self._manifest_inode = stat.st_ino
+        if stat.st_size == self._manifest_offset:
+            return
+        with self.manifest_path.open("rb") as handle:
+            handle.seek(self._manifest_offset)
+            data = handle.read(stat.st_size - self._manifest_offset)
+        # A line still being appended is picked up on the next refresh.
+        complete = data[: data.rfind(b"\n") + 1]
+        self._manifest_offset += len(complete)
+        for raw in complete.splitlines():
+            try:
+                record = BlobRecord(**json.loads(raw))
+            except (TypeError, ValueError):
+                continue
+            self._records[record.label] = record
+
+    def _object_path(self, digest: str, codec: str) -> Path:
+        return self.objects_dir / digest[:2] / f"{digest}{CODEC_SUFFIXES[codec]}"
+
+    def _find_object(self, digest: str) -> Optional[Tuple[Path, str]]:
+        for codec in CODEC_SUFFIXES:
+            blob_path = self._object_path(digest, codec)
+            if blob_path.exists():
+                return blob_path, codec
+        return None
+
+
+def read_artifact_text(path: Path, artifacts_dir: Path, store: Optional[BlobStore] = None) -> Optional[str]:
+    """Read an artifact file, falling back to its archived copy once it has been moved to the blob store."""
+    try:
+        return path.read_text(encoding="utf-8")
+    except FileNotFoundError:
+        pass
+    try:
+        label = path.relative_to(artifacts_dir).as_posix()
+    except ValueError:
+        return None
+    store = store or BlobStore(artifacts_dir / BLOBS_DIR_NAME)
+    return store.read_text(label)
+
+
+def _hash_file(path: Path) -> Tuple[str, int]:
+    digest = hashlib.sha256()
+    size = 0
+    with path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+            size += len(chunk)
+    return digest.hexdigest(), size
+
+
+def _compress(source: BinaryIO, target: BinaryIO, codec: str) -> None:
+    if codec == "zstd":
+        zstandard.ZstdCompressor(level=10).copy_stream(source, target)
+        return
+    with gzip.GzipFile(fileobj=target, mode="wb", compresslevel=6, mtime=0) as compressed:
+        shutil.copyfileobj(source, compressed, HASH_CHUNK_SIZE)
+
+
+def _decompress(handle: BinaryIO, codec: str) -> bytes:
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("Reading a zstd blob needs the zstandard package.")
+        output = io.BytesIO()
+        zstandard.ZstdDecompressor().copy_stream(handle, output)
+        return output.getvalue()
+    with gzip.GzipFile(fileobj=handle, mode="rb") as compressed:
+        return compressed.read()
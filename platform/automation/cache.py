@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Mapping, Optional
+
+from .manifest import hash_text
+
+
+class ValidationCache:
+    """Persistent map from (spec, manager prompt, deliverable hashes) to a passing review.
+
+    Entries expire after ``ttl_seconds`` and the least recently used entries
+    are evicted once more than ``max_entries`` are stored. A ``ttl_seconds``
+    or ``max_entries`` of zero disables the cache.
+    """
+
+    VERSION = 1
+
+    def __init__(self, path: Path, *, ttl_seconds: float, max_entries: int) -> None:
+        self.path = path
+        self.ttl_seconds = max(0.0, ttl_seconds)
+        self.max_entries = max(0, max_entries)
+        self._lock = threading.Lock()
+        self._entries: Optional[Dict[str, dict]] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0 and self.max_entries > 0
+
+    @staticmethod
+    def make_key(
+        *,
+        spec: str,
+        prompt: str,
+        model: Optional[str],
+        deliverables: Mapping[str, str],
+    ) -> str:
+        payload = json.dumps(
+            {
+                "spec": spec,
+                "prompt": hash_text(prompt),
+                "model": model,
+                "deliverables": dict(sorted(deliverables.items())),
+            },
+            sort_keys=True,
+        )
+        return hash_text(payload)
+
+    def get(self, key: str) -> Optional[dict]:
+        if not self.enabled:
+            return None
+        with self._lock:
+            entries = self._load()
+            entry = entries.get(key)
+            if entry is None:
+                return None
+            now = time.time()
+            if now - entry.get("stored_at", 0) > self.ttl_seconds:
+                del entries[key]
+                self._save()
+                return None
+            entry["used_at"] = now
+            self._save()
+            review = entry.get("review")
+            return dict(review) if isinstance(review, dict) else None
+
+    def put(self, key: str, review: dict, *, spec: str) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            entries = self._load()
+            now = time.time()
+            entries[key] = {"spec": spec, "review": review, "stored_at": now, "used_at": now}
+            self._evict(now)
+            self._save()
+
+    def _evict(self, now: float) -> None:
+        assert self._entries is not None
+        expired = [
+            key
+            for key, entry in self._entries.items()
+            if now - entry.get("stored_at", 0) > self.ttl_seconds
+        ]
+        for key in expired:
+            del self._entries[key]
+        overflow = len(self._entries) - self.max_entries
+        if overflow > 0:
+            oldest = sorted(self._entries, key=lambda key: self._entries[key].get("used_at", 0))
+            for key in oldest[:overflow]:
+                del self._entries[key]
+
+    def _load(self) -> Dict[str, dict]:
+        if self._entries is not None:
+            return self._entries
+        entries: Dict[str, dict] = {}
+        if self.path.exists():
+            try:
+                data = json.loads(self.path.read_text(encoding="utf-8"))
+            except json.JSONDecodeError:
+                print(f"[warn] Could not parse {self.path}, starting with an empty validation cache.")
+                data = {}
+            if isinstance(data, dict) and data.get("version") == self.VERSION:
+                stored = data.get("entries")
+                if isinstance(stored, dict):
+                    entries = stored
+        self._entries = entries
+        return entries
+
+    def _save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        tmp_path.write_text(
+            json.dumps({"version": self.VERSION, "entries": self._entries}, indent=2),
+            encoding="utf-8",
+        )
+        tmp_path.replace(self.path)
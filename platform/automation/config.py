@@ -6,6 +6,9 @@ from typing import Optional
 
 from .errors import WorkflowError
 from .paths import PROJECT_IDEA_FILE
+from .lanes import LANE_POLICIES
+from .profiling import PROFILE_MODES
+from .scheduler import SCHEDULE_POLICIES
 
 
 def parse_args() -> argparse.Namespace:
@@ -83,12 +86,78 @@ def parse_args() -> argparse.Namespace:
         default=None,
         help="Maximum number of tasks to process with Prompt 4. Omit for no limit.",
     )
+    parser.add_argument(
+        "--max-parallel-tasks",
+        type=int,
+        default=1,
+        help="Maximum number of backlog tasks to run concurrently once their deps pass (default: 1).",
+    )
+    parser.add_argument(
+        "--max-parallel-stages",
+        type=int,
+        default=1,
+        help=(
+            "Maximum number of primary stages (Intake PM through Scaffolder) to run concurrently once "
+            "the stages they depend on have settled (default: 1)."
+        ),
+    )
+    parser.add_argument(
+        "--bug-concurrency",
+        type=int,
+        default=1,
+        help="Bug reports processed at the same time, next to the task loop (default: 1).",
+    )
+    parser.add_argument(
+        "--feedback-concurrency",
+        type=int,
+        default=1,
+        help="Feedback items processed at the same time, next to the task loop (default: 1).",
+    )
+    parser.add_argument(
+        "--lane-fairness",
+        default="round-robin",
+        choices=list(LANE_POLICIES),
+        help=(
+            "Order in which the bug and feedback lanes pick up items: 'round-robin' alternates between "
+            "reporters, oldest first; 'fifo' takes the oldest submission first (default: round-robin)."
+        ),
+    )
+    parser.add_argument(
+        "--schedule-policy",
+        default="id",
+        choices=list(SCHEDULE_POLICIES),
+        help=(
+            "How ready tasks are prioritised: 'id' (lexicographic), 'critical-path' (longest remaining "
+            "estimate_points path first) or 'fanout' (tasks that unblock the most work first) (default: id)."
+        ),
+    )
+    parser.add_argument(
+        "--task-isolation",
+        default="shared",
+        choices=["shared", "worktree"],
+        help=(
+            "Where task agents run: 'shared' uses the workspace directly; 'worktree' gives each task "
+            "its own git worktree under automation_artifacts/worktrees, started from a snapshot of the "
+            "workspace, and merges passing tasks into the automation/integration branch (default: shared)."
+        ),
+    )
     parser.add_argument(
         "--agent-retries",
         type=int,
         default=10,
         help="Maximum number of manager-driven retries per agent run (default: 10).",
     )
+    parser.add_argument(
+        "--retry-prompt-max-bytes",
+        type=int,
+        default=0,
+        help=(
+            "Byte budget for retry prompts that start a fresh Codex session; low-priority sections of the "
+            "original instructions (rules, output, deliverables; never the guardrails, role, goal or inputs) "
+            "are trimmed to fit. Retries that resume the session only send the new issues "
+            "(default: 0, no budget)."
+        ),
+    )
     parser.add_argument(
         "--manager-retries",
         type=int,
@@ -101,6 +170,83 @@ def parse_args() -> argparse.Namespace:
         default=5,
         help="Maximum number of retries for QA validation prompts (default: 5).",
     )
+    parser.add_argument(
+        "--retry-backoff-base",
+        type=float,
+        default=2.0,
+        help=(
+            "Base delay in seconds before retrying a failed Codex run; doubles per failure, with jitter "
+            "(default: 2, 0 retries immediately)."
+        ),
+    )
+    parser.add_argument(
+        "--retry-backoff-max",
+        type=float,
+        default=120.0,
+        help="Upper bound in seconds for a single retry delay (default: 120).",
+    )
+    parser.add_argument(
+        "--retry-wait-budget",
+        action="append",
+        metavar="ROLE=SECONDS",
+        help=(
+            "Total time one agent, manager or qa retry loop may spend backing off before giving up; "
+            "repeatable (defaults: agent=1800, manager=600, qa=600; 0 removes the cap)."
+        ),
+    )
+    parser.add_argument(
+        "--circuit-breaker-threshold",
+        type=int,
+        default=5,
+        help=(
+            "Pause all Codex calls after this many consecutive failed runs, then probe with a single run "
+            "(default: 5, 0 disables)."
+        ),
+    )
+    parser.add_argument(
+        "--circuit-breaker-cooldown",
+        type=float,
+        default=60.0,
+        help="Seconds Codex calls stay paused once the circuit breaker opens; doubles while probes fail (default: 60).",
+    )
+    parser.add_argument(
+        "--validation-cache-ttl-hours",
+        type=float,
+        default=168.0,
+        help=(
+            "How long a passing manager review stays reusable for byte-identical deliverables "
+            "(default: 168). Use 0 to disable the validation cache."
+        ),
+    )
+    parser.add_argument(
+        "--validation-cache-max-entries",
+        type=int,
+        default=500,
+        help="Maximum number of cached manager reviews; least recently used entries are evicted (default: 500).",
+    )
+    parser.add_argument(
+        "--codex-pool-size",
+        type=int,
+        default=0,
+        help="Keep up to N pre-spawned Codex processes warm for fresh-session runs (default: 0, disabled).",
+    )
+    parser.add_argument(
+        "--codex-pool-idle-timeout",
+        type=float,
+        default=300.0,
+        help="Seconds an unused pre-spawned Codex process is kept before it is retired (default: 300).",
+    )
+    parser.add_argument(
+        "--metrics-port",
+        type=int,
+        default=0,
+        help="Serve Prometheus metrics on 127.0.0.1:PORT/metrics while the workflow runs (default: disabled).",
+    )
+    parser.add_argument(
+        "--no-trace",
+        action="store_true",
+        help="Do not write OTLP/JSON spans to <artifacts-dir>/traces/spans.jsonl.",
+    )
     parser.add_argument(
         "--mvp-mode",
         action="store_true",
@@ -126,6 +272,40 @@ def parse_args() -> argparse.Namespace:
         action="store_true",
         help="Force regeneration of BACKLOG/backlog.json even if populated.",
     )
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help=(
+            "Keep running after the primary chain: watch the bug and feedback directories and backlog.json, "
+            "process only the items that change, retry items that fail with backoff, and accept submissions on "
+            "<artifacts-dir>/workflow.sock."
+        ),
+    )
+    parser.add_argument(
+        "--daemon-poll-interval",
+        type=float,
+        default=2.0,
+        help="Seconds between change scans in --daemon mode; with inotify_simple installed, writes wake it sooner (default: 2).",
+    )
+    parser.add_argument(
+        "--plain-transcripts",
+        action="store_true",
+        help=(
+            "Keep Codex transcripts as plain <label>.log files instead of moving them into the compressed, "
+            "deduplicated blob store under <artifacts-dir>/blobs/."
+        ),
+    )
+    parser.add_argument(
+        "--profile-startup",
+        nargs="?",
+        const="timings",
+        choices=PROFILE_MODES,
+        help=(
+            "Record how long each start-up phase (imports, workspace setup, prompt loading, backlog parsing) "
+            "takes until the first Codex call and write it to <artifacts-dir>/profiles/. "
+            "Pass 'cprofile' to also dump cProfile stats of the main thread."
+        ),
+    )
     parser.add_argument(
         "--smoke-test",
         action="store_true",
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, Optional, Tuple
+
+BLOCK_SIZE = 64 * 1024
+
+
+def iter_lines_reverse(path: Path, *, start: Optional[int] = None, stop: int = 0) -> Iterator[Tuple[int, bytes]]:
+    """Yield ``(offset, line)`` pairs from ``path`` newest first, reading fixed-size blocks backwards.
+
+    Only lines that begin at or after ``stop`` and end before ``start``
+    (default: end of file) are produced.
+    """
+    with path.open("rb") as handle:
+        handle.seek(0, os.SEEK_END)
+        position = handle.tell() if start is None else min(start, handle.tell())
+        remainder = b""
+        while position > stop:
+            read_size = min(BLOCK_SIZE, position - stop)
+            position -= read_size
+            handle.seek(position)
+            chunk = handle.read(read_size) + remainder
+            lines = chunk.split(b"\n")
+            remainder = lines[0]
+            offset = position + len(remainder) + 1
+            trailing = []
+            for line in lines[1:]:
+                trailing.append((offset, line))
+                offset += len(line) + 1
+            for item in reversed(trailing):
+                if item[1].strip():
+                    yield item
+        if remainder.strip():
+            yield stop, remainder
+
+
+class ConversationLog:
+    """Append-only ``conversations.jsonl`` with newest-first lookups.
+
+    The workflow's state store is the indexed copy of these runs; this class
+    is the fallback reader when SQLite is unavailable. Lookups read the log
+    backwards in fixed-size blocks and stop at the first match, so finding a
+    recent entry does not load the whole file.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+
+    def append(self, entry: dict) -> int:
+        """Append ``entry`` and return its byte offset; callers serialize concurrent writers."""
+        line = (json.dumps(entry) + "\n").encode("utf-8")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.path.open("ab") as handle:
+            offset = handle.tell()
+            handle.write(line)
+        return offset
+
+    def latest(
+        self,
+        *,
+        role: Optional[str] = None,
+        agent_label: Optional[str] = None,
+        prompt_numbers: Optional[Iterable[int]] = None,
+        where: Optional[Callable[[dict], bool]] = None,
+    ) -> Optional[dict]:
+        """Return the newest entry matching every given filter, or ``None``."""
+        numbers = {int(number) for number in prompt_numbers} if prompt_numbers is not None else None
+
+        def matches(entry: dict) -> bool:
+            if role is not None and entry.get("role") != role:
+                return False
+            if agent_label is not None and entry.get("agent_label") != agent_label:
+                return False
+            if numbers is not None and entry.get("prompt_number") not in numbers:
+                return False
+            return where is None or where(entry)
+
+        return self._scan(matches)
+
+    def latest_session(self, *, label_prefix: str, role: str = "agent") -> Optional[str]:
+        """Return the newest session id recorded under a label starting with ``label_prefix``.
+
+        Prefix matching picks up retries such as ``tasks/t-001/agent-retry2``.
+        """
+
+        def matches(entry: dict) -> bool:
+            return (
+                entry.get("role") == role
+                and str(entry.get("agent_label") or "").startswith(label_prefix)
+                and bool(entry.get("session_id"))
+            )
+
+        entry = self._scan(matches)
+        return entry.get("session_id") if entry else None
+
+    def _scan(self, matches: Callable[[dict], bool]) -> Optional[dict]:
+        try:
+            for _, raw in iter_lines_reverse(self.path):
+                entry = self._decode(raw)
+                if entry is not None and matches(entry):
+                    return entry
+        except FileNotFoundError:
+            return None
+        return None
+
+    @staticmethod
+    def _decode(raw: bytes) -> Optional[dict]:
+        try:
+            entry = json.loads(raw)
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            return None
+        return entry if isinstance(entry, dict) else None
@@ -0,0 +1,472 @@
+from __future__ import annotations
+
+import json
+import os
+import signal
+import socket
+import socketserver
+import threading
+import time
+import traceback
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, Optional, Set, Tuple
+
+try:
+    from inotify_simple import INotify, flags as inotify_flags
+except ImportError:  # Optional; without it the watcher polls.
+    INotify = None  # type: ignore[assignment,misc]
+    inotify_flags = None  # type: ignore[assignment]
+
+from automation.errors import WorkflowError
+from automation.paths import BACKLOG_FILE
+from automation.retry import Backoff
+
+if TYPE_CHECKING:
+    from automation.workflow import Workflow
+
+SOCKET_NAME = "workflow.sock"
+# Files inside a bug or feedback directory whose changes queue the item. The bot
+# rewrites submission.json with every (re)submission; state.json is left out
+# because the daemon writes it itself after every stage.
+WATCHED_ITEM_FILES = ("submission.json",)
+REQUEST_TIMEOUT = 2.0
+# Items whose batch left them unfinished are queued again after a capped,
+# doubling delay, so a transient Codex outage does not park them until restart.
+RETRY_BASE = 30.0
+RETRY_CAP = 1800.0
+
+Snapshot = Dict[Path, Tuple[int, int]]
+
+
+@dataclass
+class Changes:
+    bugs: Set[str] = field(default_factory=set)
+    feedback: Set[str] = field(default_factory=set)
+    backlog: bool = False
+
+    def __bool__(self) -> bool:
+        return bool(self.bugs or self.feedback or self.backlog)
+
+
+class ChangeWatcher:
+    """Reports which bug and feedback items and whether the backlog changed since the last poll.
+
+    Changes are found by comparing ``(mtime_ns, size)`` of every item's
+    submission file and of ``backlog.json``, so a poll costs one ``stat``
+    call per item instead of reading them. When ``inotify_simple``
+    is installed, :meth:`wait` wakes up as soon as something is written;
+    otherwise it sleeps for ``interval`` seconds.
+    """
+
+    def __init__(self, *, bugs_dir: Path, feedback_dir: Path, backlog_path: Path, interval: float = 2.0) -> None:
+        self.bugs_dir = bugs_dir
+        self.feedback_dir = feedback_dir
+        self.backlog_path = backlog_path
+        self.interval = max(0.1, interval)
+        self._lock = threading.Lock()
+        self._snapshot = self._scan()
+        self._inotify = INotify() if INotify is not None else None
+        self._watched: Dict[Path, int] = {}
+
+    @property
+    def mode(self) -> str:
+        return "inotify" if self._inotify is not None else "polling"
+
+    def _scan(self) -> Snapshot:
+        snapshot: Snapshot = {}
+        for root in (self.bugs_dir, self.feedback_dir):
+            if not root.is_dir():
+                continue
+            for item_dir in root.iterdir():
+                for name in WATCHED_ITEM_FILES:
+                    self._stat_into(snapshot, item_dir / name)
+        self._stat_into(snapshot, self.backlog_path)
+        return snapshot
+
+    @staticmethod
+    def _stat_into(snapshot: Snapshot, path: Path) -> None:
+        try:
+            stat = path.stat()
+        except OSError:
+            return
+        snapshot[path] = (stat.st_mtime_ns, stat.st_size)
+
+    def poll(self) -> Changes:
+        current = self._scan()
+        with self._lock:
+            changed = {
+                path for path in current.keys() | self._snapshot.keys() if current.get(path) != self._snapshot.get(path)
+            }
+            self._snapshot = current
+        changes = Changes()
+        for path in changed:
+            if path == self.backlog_path:
+                changes.backlog = True
+            elif path.parent.parent == self.bugs_dir:
+                changes.bugs.add(path.parent.name)
+            elif path.parent.parent == self.feedback_dir:
+                changes.feedback.add(path.parent.name)
+        return changes
+
+    def acknowledge(self, changes: Changes) -> None:
+        """Record the current files of already-queued items so the next poll does not queue them again."""
+        items = [(self.bugs_dir, name) for name in changes.bugs] + [(self.feedback_dir, name) for name in changes.feedback]
+        with self._lock:
+            for root, name in items:
+                for file_name in WATCHED_ITEM_FILES:
+                    path = root / name / file_name
+                    self._snapshot.pop(path, None)
+                    self._stat_into(self._snapshot, path)
+
+    def wait(self, stop: threading.Event) -> None:
+        if self._inotify is None:
+            stop.wait(self.interval)
+            return
+        self._sync_watches()
+        # Still time out so directories created in the meantime get a watch.
+        self._inotify.read(timeout=int(self.interval * 1000), read_delay=50)
+
+    def _sync_watches(self) -> None:
+        assert self._inotify is not None and inotify_flags is not None
+        mask = inotify_flags.CREATE | inotify_flags.CLOSE_WRITE | inotify_flags.MOVED_TO | inotify_flags.DELETE
+        directories = [self.backlog_path.parent]
+        for root in (self.bugs_dir, self.feedback_dir):
+            if root.is_dir():
+                directories.append(root)
+                directories.extend(path for path in root.iterdir() if path.is_dir())
+            elif root.parent.is_dir():
+                directories.append(root.parent)
+        for directory in directories:
+            if directory in self._watched or not directory.is_dir():
+                continue
+            try:
+                self._watched[directory] = self._inotify.add_watch(str(directory), mask)
+            except OSError:
+                continue
+
+    def close(self) -> None:
+        if self._inotify is not None:
+            self._inotify.close()
+
+
+class _LaneWorker:
+    """One thread per lane that processes the keys queued since its last batch.
+
+    ``handler`` returns the keys of the batch that did not finish (every key
+    when it raises). Those are queued again after a :class:`Backoff` delay; a
+    fresh submission of a key runs it at once and resets its backoff.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        handler: Callable[[Set[str]], Set[str]],
+        stop: threading.Event,
+        *,
+        backoff: Optional[Backoff] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.name = name
+        self.handler = handler
+        self.busy = False
+        self.backoff = backoff or Backoff(RETRY_BASE, RETRY_CAP)
+        self._clock = clock
+        self._stop = stop
+        self._pending: Set[str] = set()
+        # key -> (consecutive unfinished batches, clock time of the next attempt)
+        self._retries: Dict[str, Tuple[int, float]] = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = threading.Thread(target=self._loop, name=f"daemon-{name}", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def submit(self, keys: Iterable[str]) -> None:
+        with self._lock:
+            for key in keys:
+                self._pending.add(key)
+                self._retries.pop(key, None)
+        self._wake.set()
+
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    def retrying(self) -> Dict[str, dict]:
+        now = self._clock()
+        with self._lock:
+            return {
+                key: {"failures": failures, "retry_in": round(max(0.0, due - now), 1)}
+                for key, (failures, due) in sorted(self._retries.items())
+            }
+
+    def join(self) -> None:
+        self._wake.set()
+        self._thread.join()
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            self._wake.wait(self._next_retry_in())
+            self._wake.clear()
+            with self._lock:
+                now = self._clock()
+                due = [key for key, (_, at) in self._retries.items() if at <= now]
+                self._pending.update(due)
+                batch, self._pending = self._pending, set()
+            if not batch or self._stop.is_set():
+                continue
+            self.busy = True
+            try:
+                print(f"[daemon] {self.name}: processing {', '.join(sorted(batch))}.")
+                unfinished = self.handler(batch) & batch
+            except Exception as exc:  # noqa: BLE001 - one failed batch must not stop the daemon
+                print(f"[daemon] {self.name} batch failed: {exc}")
+                traceback.print_exc()
+                unfinished = batch
+            finally:
+                self.busy = False
+            self._schedule_retries(batch, unfinished)
+
+    def _next_retry_in(self) -> Optional[float]:
+        with self._lock:
+            if not self._retries:
+                return None
+            return max(0.0, min(at for _, at in self._retries.values()) - self._clock())
+
+    def _schedule_retries(self, batch: Set[str], unfinished: Set[str]) -> None:
+        now = self._clock()
+        with self._lock:
+            for key in batch:
+                if key in self._pending:
+                    # Submitted again while it ran; that run decides.
+                    continue
+                if key not in unfinished:
+                    self._retries.pop(key, None)
+                    continue
+                failures = self._retries.get(key, (0, 0.0))[0] + 1
+                delay = self.backoff.delay(failures)
+                self._retries[key] = (failures, now + delay)
+                print(f"[daemon] {self.name}: {key} did not finish; retrying in {delay:.0f}s.")
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    server: "_DaemonSocketServer"
+
+    def handle(self) -> None:
+        self.request.settimeout(REQUEST_TIMEOUT)
+        try:
+            line = self.rfile.readline(64 * 1024)
+            request = json.loads(line.decode("utf-8") or "{}")
+            if not isinstance(request, dict):
+                raise ValueError("request must be a JSON object")
+            response = self.server.daemon_ref.handle_request(request)
+        except (OSError, ValueError) as exc:
+            response = {"ok": False, "error": str(exc)}
+        try:
+            self.wfile.write((json.dumps(response) + "\n").encode("utf-8"))
+        except OSError:
+            pass
+
+
+class _DaemonSocketServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, path: Path, daemon_ref: "WorkflowDaemon") -> None:
+        self.daemon_ref = daemon_ref
+        super().__init__(str(path), _RequestHandler)
+
+
+def request(socket_path: Path, payload: dict, *, timeout: float = REQUEST_TIMEOUT) -> dict:
+    """Send one JSON request to a running daemon and return its reply; raises ``OSError`` if none answers."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.settimeout(timeout)
+        client.connect(str(socket_path))
+        client.sendall((json.dumps(payload) + "\n").encode("utf-8"))
+        data = b""
+        while not data.endswith(b"\n"):
+            chunk = client.recv(65536)
+            if not chunk:
+                break
+            data += chunk
+    try:
+        reply = json.loads(data.decode("utf-8"))
+    except ValueError as exc:
+        raise OSError(f"Invalid reply from workflow daemon: {data[:200]!r}") from exc
+    return reply if isinstance(reply, dict) else {"ok": False, "error": "invalid reply"}
+
+
+class WorkflowDaemon:
+    """Keeps a Workflow alive and processes bug, feedback and backlog changes as they happen.
+
+    Every lane (bugs, feedback, tasks) has a worker thread that runs the
+    workflow's own pipeline for just the items queued since its previous
+    batch. Items are queued by the :class:`ChangeWatcher` and by clients of the
+    Unix socket at ``socket_path``. Each client sends one JSON line
+    (``{"op": "submit", "kind": "bug", "id": "BUG-..."}``, ``{"op": "status"}``
+    or ``{"op": "ping"}``) and reads one JSON line back. Everything is queued
+    once at start-up; items a batch leaves unfinished are retried with backoff
+    and listed under ``retrying`` in the status reply. SIGTERM and SIGINT stop the daemon once the running
+    batches finish.
+    """
+
+    def __init__(self, workflow: "Workflow", *, socket_path: Path, poll_interval: float = 2.0) -> None:
+        self.workflow = workflow
+        self.socket_path = socket_path
+        self.watcher = ChangeWatcher(
+            bugs_dir=workflow.bugs_dir,
+            feedback_dir=workflow.feedback_dir,
+            backlog_path=workflow.workspace / BACKLOG_FILE,
+            interval=poll_interval,
+        )
+        self._stop = threading.Event()
+        self.lanes: Dict[str, _LaneWorker] = {
+            "bugs": _LaneWorker("bugs", self._run_bugs, self._stop),
+            "feedback": _LaneWorker("feedback", self._run_feedback, self._stop),
+        }
+        if not workflow.skip_tasks:
+            self.lanes["tasks"] = _LaneWorker("tasks", self._run_tasks, self._stop)
+        self._server: Optional[_DaemonSocketServer] = None
+
+    def serve_forever(self) -> None:
+        self._install_signal_handlers()
+        self._open_socket()
+        for lane in self.lanes.values():
+            lane.start()
+        self._queue_everything()
+        print(
+            f"[daemon] Watching bugs, feedback and the backlog ({self.watcher.mode}); "
+            f"socket {self.socket_path if self._server else 'disabled'}."
+        )
+        try:
+            while not self._stop.is_set():
+                self.watcher.wait(self._stop)
+                changes = self.watcher.poll()
+                if changes:
+                    self._queue(changes)
+        finally:
+            self.shutdown()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def shutdown(self) -> None:
+        self._stop.set()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+            try:
+                self.socket_path.unlink()
+            except FileNotFoundError:
+                pass
+        busy = [lane.name for lane in self.lanes.values() if lane.busy]
+        if busy:
+            print(f"[daemon] Waiting for running batches to finish: {', '.join(busy)}.")
+        for lane in self.lanes.values():
+            lane.join()
+        self.watcher.close()
+        print("[daemon] Stopped.")
+
+    def handle_request(self, request: dict) -> dict:
+        op = request.get("op")
+        if op == "ping":
+            return {"ok": True, "pid": os.getpid()}
+        if op == "status":
+            return {
+                "ok": True,
+                "pid": os.getpid(),
+                "watcher": self.watcher.mode,
+                "lanes": {
+                    name: {"busy": lane.busy, "pending": lane.pending(), "retrying": lane.retrying()}
+                    for name, lane in self.lanes.items()
+                },
+            }
+        if op == "submit":
+            kind = request.get("kind")
+            item_id = str(request.get("id") or "")
+            changes = Changes()
+            if kind == "bug" and item_id:
+                changes.bugs.add(item_id)
+            elif kind == "feedback" and item_id:
+                changes.feedback.add(item_id)
+            elif kind == "tasks":
+                changes.backlog = True
+            else:
+                return {"ok": False, "error": f"cannot submit kind={kind!r} id={item_id!r}"}
+            # The submitter wrote the item's files just before calling; skip the watcher's copy of this change.
+            self.watcher.acknowledge(changes)
+            self._queue(changes)
+            return {"ok": True, "queued": kind, "id": item_id}
+        return {"ok": False, "error": f"unknown op {op!r}"}
+
+    def _run_bugs(self, keys: Set[str]) -> Set[str]:
+        self.workflow._run_bug_pipeline(only=keys)
+        return self._unfinished(self.workflow.bugs_dir, keys, self.workflow._load_bug_state)
+
+    def _run_feedback(self, keys: Set[str]) -> Set[str]:
+        self.workflow._run_feedback_pipeline(only=keys)
+        return self._unfinished(self.workflow.feedback_dir, keys, self.workflow._load_feedback_state)
+
+    def _run_tasks(self, _keys: Set[str]) -> Set[str]:
+        # A failed task raises out of the task loop, which retries the whole backlog.
+        self.workflow._run_task_loop()
+        return set()
+
+    @staticmethod
+    def _unfinished(root: Path, keys: Set[str], load_state: Callable[[Path], dict]) -> Set[str]:
+        """Items the pipeline stopped on without finishing or handing over to a human (a failed stage)."""
+        unfinished: Set[str] = set()
+        for key in keys:
+            item_dir = root / key
+            if not item_dir.is_dir():
+                continue
+            state = load_state(item_dir)
+            if state.get("pending_stage") != "done" and not state.get("awaiting_human"):
+                unfinished.add(key)
+        return unfinished
+
+    def _queue(self, changes: Changes) -> None:
+        if changes.bugs:
+            self.lanes["bugs"].submit(changes.bugs)
+        if changes.feedback:
+            self.lanes["feedback"].submit(changes.feedback)
+        if changes.backlog and "tasks" in self.lanes:
+            self.lanes["tasks"].submit(["backlog"])
+
+    def _queue_everything(self) -> None:
+        changes = Changes(backlog=True)
+        for root, target in ((self.workflow.bugs_dir, changes.bugs), (self.workflow.feedback_dir, changes.feedback)):
+            if root.is_dir():
+                target.update(path.name for path in root.iterdir() if path.is_dir())
+        self._queue(changes)
+
+    def _open_socket(self) -> None:
+        if self.socket_path.exists():
+            try:
+                request(self.socket_path, {"op": "ping"}, timeout=0.5)
+            except OSError:
+                self.socket_path.unlink()
+            else:
+                raise WorkflowError(f"Another workflow daemon is already listening on {self.socket_path}.")
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            self._server = _DaemonSocketServer(self.socket_path, self)
+        except OSError as exc:
+            # AF_UNIX paths are limited to ~108 bytes; the watcher still picks up submissions.
+            print(f"[daemon] Could not open control socket {self.socket_path}: {exc}")
+            return
+        thread = threading.Thread(target=self._server.serve_forever, name="daemon-socket", daemon=True)
+        thread.start()
+
+    def _install_signal_handlers(self) -> None:
+        if threading.current_thread() is not threading.main_thread():
+            return
+
+        def handle(signum: int, _frame) -> None:
+            print(f"[daemon] Received signal {signum}; stopping after the running batches.")
+            self._stop.set()
+
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            signal.signal(signum, handle)
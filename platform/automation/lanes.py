@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Sequence
+
+LANE_POLICIES = ("round-robin", "fifo")
+
+
+@dataclass(frozen=True)
+class LaneItem:
+    key: str
+    # Who the item belongs to (the Telegram reporter or chat); round-robin rotates over these.
+    group: str
+    submitted_at: str
+
+
+def fair_order(items: Sequence[LaneItem], policy: str) -> List[str]:
+    """Return item keys in the order a lane should start them.
+
+    ``fifo`` starts the oldest submission first. ``round-robin`` takes the
+    oldest pending item of each group in turn, starting with the group that
+    has waited longest, so one reporter's burst cannot push everybody else's
+    items to the back of the lane. Ties fall back to the item key.
+    """
+    if policy not in LANE_POLICIES:
+        raise ValueError(f"Unknown lane policy: {policy}")
+    ordered = sorted(items, key=lambda item: (item.submitted_at, item.key))
+    if policy == "fifo":
+        return [item.key for item in ordered]
+
+    groups: Dict[str, List[LaneItem]] = OrderedDict()
+    for item in ordered:
+        groups.setdefault(item.group, []).append(item)
+    queues = list(groups.values())
+    result: List[str] = []
+    for index in range(max((len(queue) for queue in queues), default=0)):
+        result.extend(queue[index].key for queue in queues if index < len(queue))
+    return result
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import json
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+PIDFILE_NAME = "workflow.pid"
+HEARTBEAT_INTERVAL = 10.0
+# A heartbeat older than this means the process died without cleaning up
+# (or its pid was reused), even if ``os.kill(pid, 0)`` still succeeds.
+HEARTBEAT_STALE_AFTER = 45.0
+
+
+class Heartbeat:
+    """Pidfile under automation_artifacts refreshed by a background thread.
+
+    Status readers such as the Telegram bot check it with ``workflow_liveness``
+    instead of scanning the process table.
+    """
+
+    def __init__(self, path: Path, *, interval: float = HEARTBEAT_INTERVAL) -> None:
+        self.path = path
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._record = {
+            "pid": os.getpid(),
+            "command": " ".join([sys.executable, *sys.argv]),
+            "started_at": time.time(),
+        }
+
+    def __enter__(self) -> "Heartbeat":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._beat()
+        self._thread = threading.Thread(target=self._loop, name="workflow-heartbeat", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        record = read_pidfile(self.path)
+        if record is not None and record.get("pid") == self._record["pid"]:
+            try:
+                self.path.unlink()
+            except FileNotFoundError:
+                pass
+
+    def _loop(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self._beat()
+            except OSError as exc:
+                print(f"[warn] Could not refresh heartbeat {self.path}: {exc}")
+
+    def _beat(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(
+            json.dumps({**self._record, "heartbeat_at": time.time()}),
+            encoding="utf-8",
+        )
+        tmp_path.replace(self.path)
+
+
+def read_pidfile(path: Path) -> Optional[dict]:
+    try:
+        record = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return None
+    if not isinstance(record, dict) or not isinstance(record.get("pid"), int):
+        return None
+    return record
+
+
+def pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def workflow_liveness(path: Path, *, stale_after: float = HEARTBEAT_STALE_AFTER) -> Optional[dict]:
+    """Return the pidfile record when its process is alive and still beating."""
+    record = read_pidfile(path)
+    if record is None or not pid_alive(record["pid"]):
+        return None
+    heartbeat_at = record.get("heartbeat_at")
+    if not isinstance(heartbeat_at, (int, float)) or time.time() - heartbeat_at > stale_after:
+        return None
+    return record
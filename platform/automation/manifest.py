@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Optional, Sequence
+
+from .agents.base import PromptSpec
+
+
+def hash_text(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def hash_file(path: Path) -> Optional[str]:
+    if not path.is_file():
+        return None
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+@dataclass
+class StageFingerprint:
+    template: str
+    inputs: Dict[str, Optional[str]]
+    context: Optional[str] = None
+    outputs: Dict[str, Optional[str]] = field(default_factory=dict)
+
+
+class PromptManifest:
+    """Make-style record of what each primary prompt was last built from.
+
+    For every ``PromptSpec`` the manifest stores hashes of its template, its
+    context (e.g. the project idea), its input files (upstream deliverables)
+    and its own deliverables. A stage is stale when its template, context or
+    any input hash differs from the record; edits to its own outputs alone do
+    not trigger a rerun, they only change what downstream stages see.
+    """
+
+    VERSION = 1
+
+    def __init__(self, path: Path, workspace: Path) -> None:
+        self.path = path
+        self.workspace = workspace
+        self._lock = threading.Lock()
+        self._stages: Dict[str, dict] = self._load()
+
+    def _load(self) -> Dict[str, dict]:
+        if not self.path.exists():
+            return {}
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except json.JSONDecodeError:
+            print(f"[warn] Could not parse {self.path}, rebuilding prompt manifest.")
+            return {}
+        if not isinstance(data, dict) or data.get("version") != self.VERSION:
+            return {}
+        stages = data.get("stages")
+        return stages if isinstance(stages, dict) else {}
+
+    def _save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        tmp_path.write_text(
+            json.dumps({"version": self.VERSION, "stages": self._stages}, indent=2, sort_keys=True),
+            encoding="utf-8",
+        )
+        tmp_path.replace(self.path)
+
+    @staticmethod
+    def _key(spec: PromptSpec) -> str:
+        return f"prompt{spec.number}"
+
+    def _hash_paths(self, paths: Sequence[Path]) -> Dict[str, Optional[str]]:
+        return {str(path): hash_file(self.workspace / path) for path in paths}
+
+    def fingerprint(
+        self,
+        spec: PromptSpec,
+        *,
+        inputs: Sequence[Path],
+        context: str = "",
+    ) -> StageFingerprint:
+        return StageFingerprint(
+            template=hash_text(spec.template),
+            inputs=self._hash_paths(inputs),
+            context=hash_text(context) if context else None,
+        )
+
+    def has_record(self, spec: PromptSpec) -> bool:
+        with self._lock:
+            return self._key(spec) in self._stages
+
+    def stale_reason(self, spec: PromptSpec, fingerprint: StageFingerprint) -> Optional[str]:
+        """Return why ``spec`` must rerun, or ``None`` when its record is current."""
+        with self._lock:
+            record = self._stages.get(self._key(spec))
+        if record is None:
+            return "no manifest record"
+        if record.get("template") != fingerprint.template:
+            return "prompt template changed"
+        if record.get("context") != fingerprint.context:
+            return "prompt context changed"
+        recorded_inputs = record.get("inputs") or {}
+        changed = sorted(
+            path
+            for path in set(recorded_inputs) | set(fingerprint.inputs)
+            if recorded_inputs.get(path) != fingerprint.inputs.get(path)
+        )
+        if changed:
+            return "inputs changed: " + ", ".join(changed)
+        return None
+
+    def record(self, spec: PromptSpec, fingerprint: StageFingerprint) -> None:
+        fingerprint.outputs = self._hash_paths(spec.deliverables)
+        entry = {
+            "name": spec.name,
+            "template": fingerprint.template,
+            "context": fingerprint.context,
+            "inputs": fingerprint.inputs,
+            "outputs": fingerprint.outputs,
+            "recorded_at": datetime.now(timezone.utc).isoformat(),
+        }
+        with self._lock:
+            self._stages[self._key(spec)] = entry
+            self._save()
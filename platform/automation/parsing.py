@@ -3,7 +3,7 @@ from __future__ import annotations
 import json
 import re
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional, Tuple
 
 from .errors import InvalidAgentResponseError, WorkflowError
 
@@ -17,20 +17,139 @@ def strip_json_content(payload: str) -> str:
     return payload
 
 
+_STRUCTURAL = re.compile(r'[{}\[\]"\\\n]')
+_PAIRS = {"{": "}", "[": "]"}
+_REVERSE_PAIRS = {"}": "{", "]": "["}
+
+# (start, end, children) for a balanced bracket span; children are the
+# complete spans directly nested inside it, in document order.
+_Span = Tuple[int, int, List["_Span"]]
+
+
+def _scan_json_spans(payload: str, *, reverse: bool = False) -> List[_Span]:
+    """Return the outermost balanced ``{...}``/``[...]`` spans in one pass.
+
+    Only structural characters are visited and nothing is copied. Strings are
+    tracked inside brackets so braces in JSON strings are ignored; a raw
+    newline inside a string, or a mismatched bracket, marks the enclosing
+    brackets as noise and promotes their complete children to the top level.
+    With ``reverse`` the payload is scanned from the end, which keeps the
+    trailing object intact when malformed text precedes it.
+    """
+    openers = _REVERSE_PAIRS if reverse else _PAIRS
+    top: List[_Span] = []
+    stack: List[Tuple[str, int, List[_Span]]] = []
+    in_string = False
+    skip_until = -1
+
+    def discard_open() -> None:
+        for _, _, children in stack:
+            top.extend(children)
+        stack.clear()
+
+    matches = list(_STRUCTURAL.finditer(payload)) if reverse else _STRUCTURAL.finditer(payload)
+    for match in reversed(matches) if reverse else matches:
+        idx = match.start()
+        char = match.group()
+        if char == "\\":
+            if in_string and not reverse:
+                skip_until = idx + 2
+            continue
+        if idx < skip_until:
+            continue
+        if char == '"':
+            if reverse and _is_escaped(payload, idx):
+                continue
+            in_string = not in_string and bool(stack)
+            continue
+        if char == "\n":
+            if in_string:
+                in_string = False
+                discard_open()
+            continue
+        if in_string:
+            continue
+        if char in openers:
+            stack.append((openers[char], idx, []))
+        elif stack and stack[-1][0] == char:
+            _, opened_at, children = stack.pop()
+            span = (idx, opened_at + 1, children) if reverse else (opened_at, idx + 1, children)
+            (stack[-1][2] if stack else top).append(span)
+        elif stack:
+            discard_open()
+    discard_open()
+
+    if reverse:
+        _reverse_spans(top)
+    return top
+
+
+def _is_escaped(payload: str, idx: int) -> bool:
+    backslashes = 0
+    idx -= 1
+    while idx >= 0 and payload[idx] == "\\":
+        backslashes += 1
+        idx -= 1
+    return backslashes % 2 == 1
+
+
+def _reverse_spans(spans: List[_Span]) -> None:
+    pending = [spans]
+    while pending:
+        current = pending.pop()
+        current.reverse()
+        pending.extend(children for _, _, children in current)
+
+
 def _extract_json_object(payload: str) -> Optional[dict]:
+    """Return the last complete top-level JSON object embedded in ``payload``.
+
+    Candidate spans come from a forward scan and, if that finds nothing, a
+    backward scan, and are tried newest first. Each is decoded from its own
+    slice: a failed decode computes its line and column by counting newlines
+    before the error, which must stay bounded by the span rather than the
+    whole payload. When an outer span fails, the decode error offset splits
+    its nested spans: those that end before it are known to be valid and are
+    decoded once more for their value, the one containing it fails at the same
+    offset and is descended into without decoding it again, and those after it
+    are decoded afresh. Every character is therefore decoded (and copied) at
+    most twice, however deeply malformed input nests. A JSON array is only
+    returned when no object decodes.
+    """
     decoder = json.JSONDecoder()
-    idx = 0
-    length = len(payload)
-    while idx < length:
-        char = payload[idx]
-        if char in "{[":
-            try:
-                obj, _ = decoder.raw_decode(payload[idx:])
-                return obj
-            except json.JSONDecodeError:
-                pass
-        idx += 1
-    return None
+    fallback: List[object] = []
+
+    def decode(start: int, end: int) -> Tuple[object, Optional[int]]:
+        """Decode the span; return ``(value, None)`` or ``(None, error offset in payload)``."""
+        try:
+            obj, stop = decoder.raw_decode(payload[start:end])
+        except json.JSONDecodeError as exc:
+            return None, start + exc.pos
+        return (obj, None) if start + stop == end else (None, start + stop)
+
+    def search(spans: List[_Span], error_at: Optional[int] = None) -> Optional[dict]:
+        # ``error_at`` is where the enclosing span failed to decode, if it did.
+        for start, end, children in reversed(spans):
+            if error_at is not None and start < error_at < end:
+                failed_at: Optional[int] = error_at
+            else:
+                obj, failed_at = decode(start, end)
+                if failed_at is None:
+                    if isinstance(obj, dict):
+                        return obj
+                    if not fallback:
+                        fallback.append(obj)
+                    continue
+            found = search(children, failed_at)
+            if found is not None:
+                return found
+        return None
+
+    for reverse in (False, True):
+        found = search(_scan_json_spans(payload, reverse=reverse))
+        if found is not None:
+            return found
+    return fallback[0] if fallback else None  # type: ignore[return-value]
 
 
 def read_agent_output(path: Path, *, role: str) -> dict:
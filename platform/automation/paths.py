@@ -17,6 +17,7 @@ ERROR_CATALOG_FILE = BASE_DIR / "ARTIFACTS" / "error_catalog.json"
 UX_FLOWS_FILE = BASE_DIR / "ARTIFACTS" / "ux_flows.md"
 ROUTE_MAP_FILE = BASE_DIR / "ARTIFACTS" / "route_map.json"
 PRD_JSON_FILE = BASE_DIR / "ARTIFACTS" / "prd.json"
+RESOURCE_PLAN_FILE = BASE_DIR / "ARTIFACTS" / "resource_plan.json"
 BACKLOG_FILE = BASE_DIR / "BACKLOG" / "backlog.json"
 PROJECT_IDEA_FILE = Path("docs/project-idea.md")
 PROJECT_MANIFEST_FILE = BASE_DIR / "project.yaml"
@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import subprocess
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+WorkerKey = Tuple[Tuple[str, ...], str]
+# Keys whose lease history is kept; worktree runs use a new working directory per task.
+LEASE_HISTORY = 256
+
+
+@dataclass
+class _Worker:
+    key: WorkerKey
+    process: subprocess.Popen
+    spawned_at: float
+
+
+class CodexProcessPool:
+    """Pre-spawned ``codex exec`` processes that have booted and wait on stdin.
+
+    ``codex exec`` only reads its prompt from stdin after the CLI has started
+    and loaded its config and credentials. So a worker spawned ahead of time
+    for a given command line and working directory can take a fresh-session
+    turn without paying that start-up cost. A worker is leased whole and never
+    reused.
+
+    The command line pins the model (``-m``) and directory (``--cd``), so a
+    worker only serves its exact key. To avoid booting processes nobody uses,
+    a replacement is spawned only once a key has been leased before (every
+    stage of the primary chain shares one), never for one-off keys such as a
+    task's own worktree, and such top-ups never evict another key's idle
+    worker. :meth:`warm` is for callers that know a run is coming (the first
+    manager review of a task) and may evict the oldest idle worker. Workers
+    that exit on their own or sit idle longer than ``idle_timeout`` seconds
+    are retired, except that a key under :meth:`hold` (a flow that will need
+    it once a long agent turn ends) only loses workers that have exited.
+    """
+
+    def __init__(self, size: int, *, idle_timeout: float = 300.0) -> None:
+        self.size = max(0, size)
+        self.idle_timeout = max(1.0, idle_timeout)
+        self.hits = 0
+        self.misses = 0
+        self._idle: List[_Worker] = []
+        self._leases: "OrderedDict[WorkerKey, int]" = OrderedDict()
+        self._holds: Dict[WorkerKey, int] = {}
+        self._lock = threading.Lock()
+        self._closed = threading.Event()
+        self._reaper: Optional[threading.Thread] = None
+
+    @staticmethod
+    def _key(command: Sequence[str], cwd: Path) -> WorkerKey:
+        return tuple(command), str(cwd)
+
+    @staticmethod
+    def spawn(command: Sequence[str], cwd: Path) -> subprocess.Popen:
+        return subprocess.Popen(
+            list(command),
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            cwd=cwd,
+        )
+
+    def acquire(self, command: Sequence[str], cwd: Path) -> subprocess.Popen:
+        """Return a process running ``command`` in ``cwd`` that has not read its prompt yet."""
+        key = self._key(command, cwd)
+        worker: Optional[_Worker] = None
+        with self._lock:
+            self._reap_locked(time.monotonic())
+            for index, candidate in enumerate(self._idle):
+                if candidate.key == key:
+                    worker = self._idle.pop(index)
+                    break
+            if worker is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            recurring = self._leases.get(key, 0) > 0
+            self._leases[key] = self._leases.pop(key, 0) + 1
+            while len(self._leases) > LEASE_HISTORY:
+                self._leases.popitem(last=False)
+        process = worker.process if worker is not None else self.spawn(command, cwd)
+        if recurring:
+            self.warm(command, cwd, evict=False)
+        return process
+
+    def warm(self, command: Sequence[str], cwd: Path, *, evict: bool = True) -> None:
+        """Make sure one idle worker for ``command`` in ``cwd`` is booting or ready.
+
+        When the pool is full the oldest idle worker is retired to make room,
+        unless ``evict`` is false, in which case nothing is spawned.
+        """
+        if self.size == 0 or self._closed.is_set():
+            return
+        key = self._key(command, cwd)
+        with self._lock:
+            now = time.monotonic()
+            self._reap_locked(now)
+            if any(worker.key == key for worker in self._idle):
+                return
+            if len(self._idle) >= self.size and not evict:
+                return
+            while len(self._idle) >= self.size:
+                self._retire(self._idle.pop(self._eviction_index()))
+            try:
+                process = self.spawn(command, cwd)
+            except OSError as exc:
+                print(f"[pool] Could not pre-spawn Codex worker: {exc}")
+                return
+            self._idle.append(_Worker(key=key, process=process, spawned_at=now))
+        self._ensure_reaper()
+
+    def hold(self, command: Sequence[str], cwd: Path) -> None:
+        """Keep idle workers for ``command`` in ``cwd`` past ``idle_timeout`` until :meth:`release`."""
+        key = self._key(command, cwd)
+        with self._lock:
+            self._holds[key] = self._holds.get(key, 0) + 1
+
+    def release(self, command: Sequence[str], cwd: Path) -> None:
+        key = self._key(command, cwd)
+        with self._lock:
+            remaining = self._holds.get(key, 0) - 1
+            if remaining > 0:
+                self._holds[key] = remaining
+            else:
+                self._holds.pop(key, None)
+
+    def close(self) -> None:
+        self._closed.set()
+        with self._lock:
+            workers, self._idle = self._idle, []
+        for worker in workers:
+            self._retire(worker)
+        if self._reaper is not None:
+            self._reaper.join()
+            self._reaper = None
+        if self.hits or self.misses:
+            print(f"[pool] Codex workers: {self.hits} warm start(s), {self.misses} cold start(s).")
+
+    def _reap_locked(self, now: float) -> None:
+        alive: List[_Worker] = []
+        for worker in self._idle:
+            expired = worker.key not in self._holds and now - worker.spawned_at > self.idle_timeout
+            if worker.process.poll() is not None or expired:
+                self._retire(worker)
+            else:
+                alive.append(worker)
+        self._idle = alive
+
+    def _eviction_index(self) -> int:
+        # The oldest worker whose key nobody holds, else the oldest.
+        for index, worker in enumerate(self._idle):
+            if worker.key not in self._holds:
+                return index
+        return 0
+
+    def _ensure_reaper(self) -> None:
+        if self._reaper is not None:
+            return
+        self._reaper = threading.Thread(target=self._reap_loop, name="codex-pool-reaper", daemon=True)
+        self._reaper.start()
+
+    def _reap_loop(self) -> None:
+        interval = min(30.0, self.idle_timeout / 2)
+        while not self._closed.wait(interval):
+            with self._lock:
+                self._reap_locked(time.monotonic())
+
+    @staticmethod
+    def _retire(worker: _Worker) -> None:
+        # Kill rather than close stdin: an empty prompt would still start a turn.
+        if worker.process.poll() is None:
+            worker.process.kill()
+        worker.process.wait()
+        for stream in (worker.process.stdin, worker.process.stdout):
+            if stream is not None:
+                stream.close()
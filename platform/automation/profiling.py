@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import cProfile
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+PROFILE_MODES = ("timings", "cprofile")
+
+
+@dataclass
+class PhaseTiming:
+    name: str
+    # Milliseconds since the profiler's origin (the start of workflow.py's imports).
+    start_ms: float
+    duration_ms: float
+    depth: int
+    thread: str
+    # Still running when the profile was taken (e.g. the stage that made the first Codex call).
+    open: bool = False
+
+
+class StartupProfiler:
+    """Phase-by-phase timing of a workflow run up to its first Codex call.
+
+    Phases are opened with :meth:`phase` (nesting is tracked per thread) or
+    recorded after the fact with :meth:`record`. The profile ends at the first
+    :meth:`finish` call, normally made by the runner right before it starts
+    Codex; phases still open at that point are cut there and flagged ``open``.
+    The report goes to ``<output_dir>/startup-<timestamp>-<pid>.json``, next to
+    a ``.prof`` file with ``cProfile`` stats of the main thread when ``mode``
+    is ``cprofile``. Without an ``output_dir`` every method is a no-op.
+    """
+
+    def __init__(self, output_dir: Optional[Path], *, origin: float, mode: str = "timings") -> None:
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"Unknown startup profile mode: {mode}")
+        self.output_dir = output_dir
+        self.origin = origin
+        self.mode = mode
+        self.report_path: Optional[Path] = None
+        self._lock = threading.Lock()
+        self._phases: List[PhaseTiming] = []
+        self._open: Dict[int, List[Tuple[str, float]]] = {}
+        self._finished_at: Optional[float] = None
+        self._cprofile: Optional[cProfile.Profile] = None
+        if self.enabled and mode == "cprofile":
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+
+    @classmethod
+    def disabled(cls) -> "StartupProfiler":
+        return cls(None, origin=time.perf_counter())
+
+    @property
+    def enabled(self) -> bool:
+        return self.output_dir is not None
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        if not self.enabled or self._finished_at is not None:
+            yield
+            return
+        thread = threading.get_ident()
+        started = time.perf_counter()
+        with self._lock:
+            stack = self._open.setdefault(thread, [])
+            stack.append((name, started))
+            depth = len(stack) - 1
+        try:
+            yield
+        finally:
+            ended = time.perf_counter()
+            with self._lock:
+                stack = self._open.get(thread, [])
+                if stack and stack[-1] == (name, started):
+                    stack.pop()
+                    # Phases cut by finish() were already recorded as open.
+                    if self._finished_at is None:
+                        self._append(name, started, ended, depth, thread)
+
+    def record(self, name: str, started: float, ended: float) -> None:
+        if not self.enabled or self._finished_at is not None:
+            return
+        thread = threading.get_ident()
+        with self._lock:
+            depth = len(self._open.get(thread, []))
+            self._append(name, started, ended, depth, thread)
+
+    def finish(self, reason: str) -> None:
+        """End the profile (first call wins) and write the report."""
+        if not self.enabled:
+            return
+        with self._lock:
+            if self._finished_at is not None:
+                return
+            self._finished_at = time.perf_counter()
+            for thread, stack in self._open.items():
+                for depth, (name, started) in enumerate(stack):
+                    self._append(name, started, self._finished_at, depth, thread, still_open=True)
+        if self._cprofile is not None:
+            self._cprofile.disable()
+        try:
+            self._write(reason)
+        except OSError as exc:
+            print(f"[profile] Could not write the startup profile: {exc}")
+
+    def _append(
+        self,
+        name: str,
+        started: float,
+        ended: float,
+        depth: int,
+        thread: int,
+        *,
+        still_open: bool = False,
+    ) -> None:
+        self._phases.append(
+            PhaseTiming(
+                name=name,
+                start_ms=(started - self.origin) * 1000,
+                duration_ms=(ended - started) * 1000,
+                depth=depth,
+                thread=_thread_name(thread),
+                open=still_open,
+            )
+        )
+
+    def _write(self, reason: str) -> None:
+        assert self.output_dir is not None and self._finished_at is not None
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+        base = self.output_dir / f"startup-{stamp}-{os.getpid()}"
+        phases = sorted(self._phases, key=lambda phase: (phase.start_ms, phase.depth))
+        cprofile_path: Optional[Path] = None
+        if self._cprofile is not None:
+            cprofile_path = base.with_suffix(".prof")
+            self._cprofile.dump_stats(str(cprofile_path))
+        report = {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "pid": os.getpid(),
+            "python": sys.version.split()[0],
+            "argv": sys.argv[1:],
+            "until": reason,
+            # Wall-clock time of the origin, so callers can add the interpreter start-up before it.
+            "origin_unix": time.time() - (time.perf_counter() - self.origin),
+            "total_ms": (self._finished_at - self.origin) * 1000,
+            "phases": [asdict(phase) for phase in phases],
+            "cprofile": cprofile_path.name if cprofile_path else None,
+        }
+        self.report_path = base.with_suffix(".json")
+        self.report_path.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"[profile] Startup took {report['total_ms']:.1f} ms until {reason}:")
+        for phase in phases:
+            indent = "  " * phase.depth
+            suffix = " (still running)" if phase.open else ""
+            print(f"[profile]   {indent}{phase.name:<{32 - len(indent)}} {phase.duration_ms:9.1f} ms{suffix}")
+        print(f"[profile] Report written to {self.report_path}")
+        if cprofile_path is not None:
+            print(f"[profile] cProfile stats written to {cprofile_path} (python -m pstats {cprofile_path})")
+
+
+def _thread_name(ident: int) -> str:
+    for thread in threading.enumerate():
+        if thread.ident == ident:
+            return thread.name
+    return str(ident)
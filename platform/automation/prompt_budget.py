@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import List, Optional
+
+# Headings used by the PROMPTS templates ("Role: Module Developer", "Output (JSON):")
+# and by the task prompt suffix. Only these open a section, so free text inside
+# the inputs (a project idea, a task payload) is never split apart.
+SECTION_HEADING = re.compile(
+    r"^(Role|Goal|Inputs|Output(?: \([^)]*\))?|Deliverables|Rules|Repository resources):(?:\s|$)"
+)
+# Lower numbers are kept longer; sections at REQUIRED_PRIORITY are never trimmed.
+REQUIRED_PRIORITY = 0
+SECTION_PRIORITIES = {
+    "role": REQUIRED_PRIORITY,
+    "goal": REQUIRED_PRIORITY,
+    "inputs": REQUIRED_PRIORITY,
+    "output": 1,
+    "deliverables": 1,
+    "repository resources": 1,
+    "rules": 2,
+}
+# Text before the first heading is the shared guardrails (the safety preamble),
+# so it is never trimmed either.
+PREAMBLE_PRIORITY = REQUIRED_PRIORITY
+TRUNCATION_MARKER = "[... {count} bytes omitted to fit the prompt budget]"
+
+
+def byte_size(text: str) -> int:
+    return len(text.encode("utf-8"))
+
+
+@dataclass
+class PromptSection:
+    title: str
+    text: str
+    priority: int
+
+
+@dataclass
+class AssembledPrompt:
+    text: str
+    full_bytes: int
+    resumed: bool
+
+    @property
+    def sent_bytes(self) -> int:
+        return byte_size(self.text)
+
+    @property
+    def saved_bytes(self) -> int:
+        return max(0, self.full_bytes - self.sent_bytes)
+
+
+def split_sections(prompt: str) -> List[PromptSection]:
+    sections: List[PromptSection] = []
+    title = ""
+    lines: List[str] = []
+    previous_blank = True
+    for line in prompt.splitlines(keepends=True):
+        match = SECTION_HEADING.match(line) if previous_blank else None
+        if match and lines:
+            sections.append(_section(title, "".join(lines)))
+            lines = []
+        if match:
+            title = match.group(1)
+        lines.append(line)
+        previous_blank = not line.strip()
+    if lines:
+        sections.append(_section(title, "".join(lines)))
+    return sections
+
+
+def _section(title: str, text: str) -> PromptSection:
+    if not title:
+        return PromptSection(title="", text=text, priority=PREAMBLE_PRIORITY)
+    key = title.split(" (", 1)[0].lower()
+    return PromptSection(title=title, text=text, priority=SECTION_PRIORITIES[key])
+
+
+def fit_to_budget(prompt: str, max_bytes: int) -> str:
+    """Trim ``prompt`` to at most ``max_bytes`` by shortening low-priority sections.
+
+    Sections are trimmed lowest priority first and, within a priority, from the
+    end of the prompt backwards. A trimmed section keeps its heading and as many
+    leading lines as fit, followed by a marker line. Required sections (the
+    guardrails preamble, role, goal, inputs) are never touched, so the result
+    can still exceed the budget.
+    """
+    if max_bytes <= 0 or byte_size(prompt) <= max_bytes:
+        return prompt
+    sections = split_sections(prompt)
+    excess = byte_size(prompt) - max_bytes
+    order = sorted(
+        (index for index, section in enumerate(sections) if section.priority > REQUIRED_PRIORITY),
+        key=lambda index: (-sections[index].priority, -index),
+    )
+    for index in order:
+        if excess <= 0:
+            break
+        section = sections[index]
+        trimmed = _trim_section(section.text, byte_size(section.text) - excess)
+        excess -= byte_size(section.text) - byte_size(trimmed)
+        section.text = trimmed
+    return "".join(section.text for section in sections)
+
+
+def _trim_section(text: str, target_bytes: int) -> str:
+    lines = text.splitlines(keepends=True)
+    original = byte_size(text)
+    # The heading line always stays so the agent can tell a section was cut.
+    kept = lines[:1]
+    for line in lines[1:]:
+        candidate = "".join(kept + [line])
+        marker = TRUNCATION_MARKER.format(count=original - byte_size(candidate)) + "\n\n"
+        if byte_size(candidate) + byte_size(marker) > target_bytes:
+            break
+        kept.append(line)
+    if len(kept) == len(lines):
+        return text
+    head = "".join(kept)
+    if head and not head.endswith("\n"):
+        head += "\n"
+    marker = TRUNCATION_MARKER.format(count=original - byte_size(head)) + "\n\n"
+    trimmed = head + marker
+    return trimmed if byte_size(trimmed) < original else text
+
+
+class PromptAssembler:
+    """Builds follow-up prompts (retries, missing deliverables) for agent turns.
+
+    A follow-up that resumes the agent's Codex session only carries the new
+    information (``delta``): the original instructions are already part of
+    that conversation. A follow-up that has to start a fresh session repeats
+    the original instructions, trimmed to ``max_bytes`` with
+    :func:`fit_to_budget` (``0`` disables the budget).
+    """
+
+    def __init__(self, max_bytes: int = 0) -> None:
+        self.max_bytes = max(0, max_bytes)
+
+    def followup(self, delta: str, original_prompt: str, *, resume_session: Optional[str]) -> AssembledPrompt:
+        full_text = self._fresh_text(delta, original_prompt)
+        if resume_session:
+            text = (
+                f"{delta}\n\n"
+                "The original instructions are earlier in this session and still apply unchanged."
+            )
+            return AssembledPrompt(text=text, full_bytes=byte_size(full_text), resumed=True)
+        fitted = original_prompt
+        if self.max_bytes:
+            # The delta is never trimmed; the original instructions get what is left.
+            budget = max(1, self.max_bytes - byte_size(self._fresh_text(delta, "")))
+            fitted = fit_to_budget(original_prompt, budget)
+        return AssembledPrompt(
+            text=self._fresh_text(delta, fitted),
+            full_bytes=byte_size(full_text),
+            resumed=False,
+        )
+
+    @staticmethod
+    def _fresh_text(delta: str, original_prompt: str) -> str:
+        return f"{delta}\n\nOriginal instructions:\n{original_prompt}"
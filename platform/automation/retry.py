@@ -0,0 +1,328 @@
+from __future__ import annotations
+
+import random
+import re
+import subprocess
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+# Failure causes, also used as the ``cause`` label of workflow_retries_total.
+RATE_LIMITED = "rate_limited"
+AUTH = "auth"
+NETWORK = "network"
+CONTEXT_LENGTH = "context_length"
+TIMEOUT = "timeout"
+KILLED = "killed"
+EXECUTION_ERROR = "execution_error"
+
+# Checked in order against the CLI's own error lines (see CLI_ERROR_LINE); first match wins.
+TRANSCRIPT_SIGNATURES: Sequence[Tuple[str, "re.Pattern[str]"]] = (
+    (
+        AUTH,
+        re.compile(
+            r"not logged in|invalid api key|401 unauthori[sz]ed|authentication failed|please (?:re-?)?log ?in",
+            re.I,
+        ),
+    ),
+    (RATE_LIMITED, re.compile(r"\b429\b|rate.?limit|too many requests|quota|usage limit", re.I)),
+    (CONTEXT_LENGTH, re.compile(r"context (?:length|window)|maximum context|too many tokens", re.I)),
+    (
+        NETWORK,
+        re.compile(
+            r"\b50[234]\b|connection (?:reset|refused|closed)|stream (?:error|disconnected)|timed out|"
+            r"temporar(?:y|ily) unavailable|overloaded|server error|network error|dns",
+            re.I,
+        ),
+    ),
+)
+TAIL_LINES = 15
+# The CLI reports failures on lines such as "ERROR: stream disconnected" or
+# "[2025-01-01T00:00:00] ERROR: exceeded retry limit, last status: 429". Only
+# those are classified: the agent's answer (the ``codex`` block) may well
+# mention "quota", "429" or "please log in" without anything having failed.
+CLI_ERROR_LINE = re.compile(r"^\s*(?:\[[^\]]*\]\s*)?(?:error|fatal)\b", re.I)
+
+
+@dataclass(frozen=True)
+class FailureClass:
+    retryable: bool = True
+    # Multiplies the backoff delay; 0 retries immediately.
+    backoff: float = 1.0
+    # Whether the failure points at Codex itself being unhealthy.
+    trips_breaker: bool = True
+
+
+FAILURE_CLASSES: Dict[str, FailureClass] = {
+    RATE_LIMITED: FailureClass(backoff=4.0),
+    AUTH: FailureClass(retryable=False),
+    NETWORK: FailureClass(),
+    # A resumed conversation that outgrew the context window; the retry starts a fresh session.
+    CONTEXT_LENGTH: FailureClass(backoff=0.0, trips_breaker=False),
+    TIMEOUT: FailureClass(),
+    KILLED: FailureClass(backoff=0.0, trips_breaker=False),
+    EXECUTION_ERROR: FailureClass(),
+}
+
+
+def cli_error_lines(transcript: str) -> List[str]:
+    """Return the CLI error lines of ``transcript``, skipping the agent's ``codex`` blocks."""
+    errors: List[str] = []
+    in_block = False
+    for line in transcript.splitlines():
+        stripped = line.strip()
+        if stripped == "codex":
+            in_block = True
+        elif in_block:
+            in_block = stripped.lower() != "tokens used"
+        elif CLI_ERROR_LINE.match(line):
+            errors.append(stripped)
+    return errors
+
+
+def classify(return_code: Optional[int], cli_errors: str = "") -> str:
+    """Name the cause of a failed Codex run from its exit code and the CLI's error lines."""
+    tail = "\n".join(cli_error_lines(cli_errors)[-TAIL_LINES:])
+    for cause, pattern in TRANSCRIPT_SIGNATURES:
+        if pattern.search(tail):
+            return cause
+    if return_code is not None and return_code < 0:
+        return KILLED
+    return EXECUTION_ERROR
+
+
+def classify_exception(exc: BaseException) -> str:
+    if isinstance(exc, subprocess.TimeoutExpired):
+        return TIMEOUT
+    if isinstance(exc, subprocess.CalledProcessError):
+        # The runner puts the CLI error lines it saw in ``stderr`` (Codex's stderr is merged into the
+        # transcript); otherwise fall back to filtering the output.
+        errors = exc.stderr if isinstance(exc.stderr, str) else exc.output
+        return classify(exc.returncode, errors if isinstance(errors, str) else "")
+    return EXECUTION_ERROR
+
+
+class Backoff:
+    """Capped exponential backoff with jitter.
+
+    The n-th failure waits between half and all of ``min(cap, base * multiplier * 2**(n-1))``
+    seconds; the random half keeps parallel tasks from retrying in lockstep.
+    """
+
+    def __init__(self, base: float = 2.0, cap: float = 120.0, *, rng: Optional[random.Random] = None) -> None:
+        self.base = max(0.0, base)
+        self.cap = max(self.base, cap)
+        self._rng = rng or random.Random()
+
+    def delay(self, failures: int, multiplier: float = 1.0) -> float:
+        if multiplier <= 0 or self.base <= 0:
+            return 0.0
+        ceiling = min(self.cap, self.base * multiplier * (2 ** max(0, failures - 1)))
+        return ceiling / 2 + self._rng.uniform(0, ceiling / 2)
+
+
+class CircuitBreaker:
+    """Pauses every Codex call after ``threshold`` consecutive unhealthy runs.
+
+    While open, callers of :meth:`before_call` block until ``cooldown``
+    seconds have passed. Then a single probe run is let through (half-open):
+    success closes the breaker, failure opens it again with the cooldown
+    doubled, up to ``max_cooldown``. A probe that ends without an answer
+    (the caller raised before Codex exited) must be handed back with
+    :meth:`release_probe`; one that reports nothing for ``probe_timeout``
+    seconds is given up on, so a lost probe never blocks callers for good.
+    A ``threshold`` of zero disables it.
+    """
+
+    def __init__(
+        self,
+        threshold: int = 5,
+        cooldown: float = 60.0,
+        *,
+        max_cooldown: float = 900.0,
+        probe_timeout: float = 1800.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.threshold = max(0, threshold)
+        self.base_cooldown = max(0.0, cooldown)
+        self.max_cooldown = max(self.base_cooldown, max_cooldown)
+        self.probe_timeout = max(0.0, probe_timeout)
+        self.trips = 0
+        self._clock = clock
+        self._condition = threading.Condition()
+        self._failures = 0
+        self._cooldown = self.base_cooldown
+        self._open_until: Optional[float] = None
+        self._probing = False
+        self._probe_started = 0.0
+
+    @property
+    def enabled(self) -> bool:
+        return self.threshold > 0
+
+    @property
+    def is_open(self) -> bool:
+        with self._condition:
+            return self._open_until is not None
+
+    def before_call(self) -> bool:
+        """Block while the circuit is open; return True when the caller is the half-open probe."""
+        if not self.enabled:
+            return False
+        with self._condition:
+            announced = False
+            while True:
+                if self._open_until is None:
+                    return False
+                now = self._clock()
+                if self._probing and now - self._probe_started >= self.probe_timeout:
+                    print(f"[retry] Codex probe gave no answer within {self.probe_timeout:.0f}s; allowing a new probe.")
+                    self._probing = False
+                remaining = self._open_until - now
+                if remaining <= 0 and not self._probing:
+                    self._probing = True
+                    self._probe_started = now
+                    print("[retry] Circuit half-open; sending one probe run to Codex.")
+                    return True
+                if not announced and remaining > 0:
+                    print(f"[retry] Circuit open; waiting {remaining:.1f}s before calling Codex again.")
+                    announced = True
+                # Wakes early on notify; the timeout re-checks the cooldown and the probe deadline.
+                self._condition.wait(timeout=min(max(0.05, remaining), 1.0) if remaining > 0 else 1.0)
+
+    def release_probe(self) -> None:
+        """Hand back a probe that ended without a Codex exit; the next caller probes instead."""
+        if not self.enabled:
+            return
+        with self._condition:
+            if self._probing:
+                self._probing = False
+                self._condition.notify_all()
+
+    def record_success(self) -> None:
+        if not self.enabled:
+            return
+        with self._condition:
+            if self._open_until is not None:
+                print("[retry] Codex probe succeeded; circuit closed.")
+            self._failures = 0
+            self._cooldown = self.base_cooldown
+            self._open_until = None
+            self._probing = False
+            self._condition.notify_all()
+
+    def record_failure(self) -> None:
+        if not self.enabled:
+            return
+        with self._condition:
+            self._failures += 1
+            if self._probing:
+                self._cooldown = min(self.max_cooldown, self._cooldown * 2)
+            elif self._open_until is not None or self._failures < self.threshold:
+                return
+            self._probing = False
+            self._open_until = self._clock() + self._cooldown
+            self.trips += 1
+            print(
+                f"[retry] Circuit open after {self._failures} consecutive Codex failure(s); "
+                f"pausing Codex calls for {self._cooldown:.1f}s."
+            )
+            self._condition.notify_all()
+
+    def record_exit(self, return_code: int, cli_errors: str = "") -> None:
+        if return_code == 0:
+            self.record_success()
+        elif FAILURE_CLASSES[classify(return_code, cli_errors)].trips_breaker:
+            self.record_failure()
+        else:
+            # The run still reached Codex, so a pending probe has its answer.
+            self.record_success()
+
+
+@dataclass
+class RetryDecision:
+    cause: str
+    retry: bool
+    delay: float = 0.0
+    reason: str = ""
+
+
+class RetryBudget:
+    """Retry bookkeeping for one retry loop (an agent turn, a manager or QA review)."""
+
+    def __init__(self, policy: "RetryPolicy", role: str, wait_budget: float) -> None:
+        self.policy = policy
+        self.role = role
+        self.wait_budget = wait_budget
+        self.failures = 0
+        self.waited = 0.0
+
+    def on_failure(self, exc: BaseException) -> RetryDecision:
+        cause = self.policy.classifier(exc)
+        failure_class = self.policy.failure_classes.get(cause, FAILURE_CLASSES[EXECUTION_ERROR])
+        self.failures += 1
+        if not failure_class.retryable:
+            return RetryDecision(cause=cause, retry=False, reason=f"{cause} errors are not retried")
+        delay = self.policy.backoff.delay(self.failures, failure_class.backoff)
+        if self.wait_budget > 0:
+            remaining = self.wait_budget - self.waited
+            if remaining <= 0 and delay > 0:
+                return RetryDecision(
+                    cause=cause,
+                    retry=False,
+                    reason=f"{self.role} retry wait budget of {self.wait_budget:.0f}s exhausted",
+                )
+            delay = min(delay, max(0.0, remaining))
+        return RetryDecision(cause=cause, retry=True, delay=delay)
+
+    def wait(self, decision: RetryDecision) -> None:
+        if decision.delay > 0:
+            self.waited += decision.delay
+            self.policy.sleep(decision.delay)
+
+
+class RetryPolicy:
+    """How the workflow retries failed Codex runs.
+
+    Failures are classified (``classifier``) and each cause maps to a
+    :class:`FailureClass`: non-retryable causes stop the loop at once, the rest
+    wait ``backoff`` scaled by the class multiplier. Each retry loop gets a
+    :class:`RetryBudget` that caps the total time it may spend waiting, per
+    role (``wait_budgets``; 0 means no cap). The shared ``breaker`` is fed by
+    the runner, not here, so it sees every Codex run.
+    """
+
+    def __init__(
+        self,
+        *,
+        backoff: Optional[Backoff] = None,
+        breaker: Optional[CircuitBreaker] = None,
+        wait_budgets: Optional[Mapping[str, float]] = None,
+        classifier: Callable[[BaseException], str] = classify_exception,
+        failure_classes: Optional[Mapping[str, FailureClass]] = None,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.backoff = backoff or Backoff()
+        self.breaker = breaker or CircuitBreaker(threshold=0)
+        self.wait_budgets = dict(wait_budgets or {})
+        self.classifier = classifier
+        self.failure_classes = {**FAILURE_CLASSES, **(failure_classes or {})}
+        self.sleep = sleep
+
+    def budget(self, role: str) -> RetryBudget:
+        return RetryBudget(self, role, self.wait_budgets.get(role, 0.0))
+
+
+DEFAULT_WAIT_BUDGETS = {"agent": 1800.0, "manager": 600.0, "qa": 600.0}
+
+
+def parse_wait_budgets(entries: Optional[Sequence[str]]) -> Dict[str, float]:
+    """Parse ``ROLE=SECONDS`` entries on top of :data:`DEFAULT_WAIT_BUDGETS`."""
+    budgets = dict(DEFAULT_WAIT_BUDGETS)
+    for entry in entries or []:
+        role, separator, value = entry.partition("=")
+        if not separator or not role.strip():
+            raise ValueError(f"Expected ROLE=SECONDS, got {entry!r}")
+        budgets[role.strip().lower()] = max(0.0, float(value))
+    return budgets
@@ -4,11 +4,17 @@ import itertools
 import shutil
 import subprocess
 import sys
+from collections import deque
 from dataclasses import dataclass
 from pathlib import Path
-from typing import List, Optional
+from typing import Deque, List, Optional
 
+from automation.blob_store import BlobStore
 from automation.paths import ARTIFACTS_DIR
+from automation.pool import CodexProcessPool
+from automation.profiling import StartupProfiler
+from automation.retry import CLI_ERROR_LINE, TAIL_LINES, CircuitBreaker
+from automation.telemetry import Span, Telemetry
 
 
 @dataclass
@@ -19,6 +25,70 @@ class CodexRunResult:
     session_id: Optional[str]
 
 
+class TranscriptScanner:
+    """Extract the session id and final Codex message from transcript lines as they stream in.
+
+    Only a bounded tail of the transcript and of the current ``codex`` block
+    are held in memory; the complete text lives in the on-disk ``.log`` file.
+    A block longer than ``block_chars`` (say, one never closed by a
+    ``tokens used`` line) keeps its last lines.
+    """
+
+    def __init__(self, tail_chars: int = 256 * 1024, block_chars: int = 4 * 1024 * 1024) -> None:
+        self.tail_chars = tail_chars
+        self.block_chars = block_chars
+        self.session_id: Optional[str] = None
+        self.total_bytes = 0
+        self._tail: Deque[str] = deque()
+        self._tail_size = 0
+        self._block: Optional[Deque[str]] = None
+        self._block_size = 0
+        self._block_open = False
+        # The CLI's own error lines, outside any ``codex`` block, for failure classification.
+        self._errors: Deque[str] = deque(maxlen=TAIL_LINES)
+
+    def feed(self, line: str) -> None:
+        self.total_bytes += len(line.encode("utf-8"))
+        self._tail.append(line)
+        self._tail_size += len(line)
+        while self._tail_size > self.tail_chars and len(self._tail) > 1:
+            self._tail_size -= len(self._tail.popleft())
+
+        stripped = line.strip()
+        lowered = stripped.lower()
+        if self.session_id is None:
+            if lowered.startswith("session id:") or lowered.startswith("thread id:"):
+                self.session_id = stripped.split(":", 1)[1].strip()
+
+        if stripped == "codex":
+            self._block = deque()
+            self._block_size = 0
+            self._block_open = True
+        elif self._block_open:
+            if lowered == "tokens used":
+                self._block_open = False
+            else:
+                assert self._block is not None
+                text = line.rstrip("\r\n")
+                self._block.append(text)
+                self._block_size += len(text) + 1
+                while self._block_size > self.block_chars and len(self._block) > 1:
+                    self._block_size -= len(self._block.popleft()) + 1
+        elif CLI_ERROR_LINE.match(line):
+            self._errors.append(stripped)
+
+    def tail(self) -> str:
+        return "".join(self._tail)
+
+    def cli_errors(self) -> str:
+        return "\n".join(self._errors)
+
+    def last_message(self) -> str:
+        if self._block is None:
+            return self.tail().strip()
+        return "\n".join(self._block).strip()
+
+
 class CodexRunner:
     """Utility wrapper around the Codex CLI."""
 
@@ -31,6 +101,11 @@ class CodexRunner:
         include_plan: bool,
         model: Optional[str],
         reasoning_effort: str,
+        pool: Optional[CodexProcessPool] = None,
+        telemetry: Optional[Telemetry] = None,
+        breaker: Optional[CircuitBreaker] = None,
+        profiler: Optional[StartupProfiler] = None,
+        transcripts: Optional[BlobStore] = None,
     ) -> None:
         self.workspace = workspace
         self.artifacts_dir = artifacts_dir
@@ -39,6 +114,11 @@ class CodexRunner:
         self.include_plan = include_plan
         self.model = model
         self.reasoning_effort = reasoning_effort
+        self.pool = pool
+        self.telemetry = telemetry or Telemetry()
+        self.breaker = breaker
+        self.profiler = profiler
+        self.transcripts = transcripts
 
     def run(
         self,
@@ -47,14 +127,174 @@ class CodexRunner:
         label: str,
         model_override: Optional[str] = None,
         resume_session: Optional[str] = None,
+        workdir: Optional[Path] = None,
     ) -> CodexRunResult:
-        self.artifacts_dir.mkdir(parents=True, exist_ok=True)
+        cwd = workdir or self.workspace
+        transcript_path, last_message_path = self._prepare_paths(label)
+        command = self._build_command(
+            cwd=cwd,
+            model_override=model_override,
+            resume_session=resume_session,
+        )
+
+        if self.profiler is not None:
+            self.profiler.finish(f"the first Codex call ({label})")
+        probe = self.breaker.before_call() if self.breaker is not None else False
+        exit_recorded = False
+        try:
+            print(f"\n[Codex] Running '{label}'...")
+            self._reconcile_artifacts_root(cwd)
+            pooled = self.pool is not None and not resume_session
+            with self._exec_span(label, model_override, resume_session, pooled=pooled) as span:
+                # Resumed sessions name their session id on the command line, so only
+                # fresh sessions can be served by a pre-spawned worker.
+                if pooled:
+                    assert self.pool is not None
+                    process = self.pool.acquire(command, cwd)
+                else:
+                    process = CodexProcessPool.spawn(command, cwd)
+
+                scanner = TranscriptScanner()
+                try:
+                    self._send_prompt(process, prompt_text)
+                except BrokenPipeError:
+                    if not pooled:
+                        raise
+                    # The pooled worker died after the pool last checked on it.
+                    print(f"[pool] Pre-spawned Codex worker for '{label}' exited early; starting a fresh one.")
+                    process.kill()
+                    process.wait()
+                    process = CodexProcessPool.spawn(command, cwd)
+                    self._send_prompt(process, prompt_text)
+
+                assert process.stdout is not None
+                with transcript_path.open("w", encoding="utf-8") as log_handle:
+                    for line in process.stdout:
+                        scanner.feed(line)
+                        log_handle.write(line)
+                        log_handle.flush()
+                        sys.stdout.write(line)
+                        sys.stdout.flush()
+
+                return_code = process.wait()
+                self._archive_transcript(transcript_path)
+                self._record_exit(span, return_code, scanner)
+                exit_recorded = True
+                return self._complete_run(
+                    label=label,
+                    command=command,
+                    return_code=return_code,
+                    scanner=scanner,
+                    transcript_path=transcript_path,
+                    last_message_path=last_message_path,
+                    resume_session=resume_session,
+                    cwd=cwd,
+                )
+        except BaseException:
+            # Spawn errors, a broken stdin pipe or cancellation end the run before
+            # Codex exits; a half-open probe must not stay claimed forever.
+            if probe and not exit_recorded:
+                assert self.breaker is not None
+                self.breaker.release_probe()
+            raise
+
+    @staticmethod
+    def _send_prompt(process: subprocess.Popen, prompt_text: str) -> None:
+        assert process.stdin is not None
+        process.stdin.write(prompt_text)
+        process.stdin.close()
+
+    def _exec_span(
+        self,
+        label: str,
+        model_override: Optional[str],
+        resume_session: Optional[str],
+        *,
+        pooled: bool = False,
+    ):
+        return self.telemetry.span(
+            "codex.exec",
+            label=label,
+            model=model_override or self.model,
+            resumed=bool(resume_session),
+            pooled=pooled,
+        )
+
+    def _record_exit(self, span: Span, return_code: int, scanner: TranscriptScanner) -> None:
+        span.set(exit_code=return_code, transcript_bytes=scanner.total_bytes, session_id=scanner.session_id)
+        if self.breaker is not None:
+            self.breaker.record_exit(return_code, scanner.cli_errors() if return_code else "")
+        role = span.attributes.get("role", "")
+        self.telemetry.count(
+            "codex_exits_total",
+            help="Codex CLI runs by exit code.",
+            role=role,
+            exit_code=return_code,
+        )
+        self.telemetry.count(
+            "codex_transcript_bytes_total",
+            scanner.total_bytes,
+            help="Bytes of Codex transcript output.",
+            role=role,
+        )
+
+    def prewarm(self, *, model_override: Optional[str] = None, workdir: Optional[Path] = None) -> None:
+        """Boot a pooled worker for an upcoming fresh-session run; no-op without a pool.
+
+        The worker is held until :meth:`release_prewarm` with the same arguments,
+        so the pool's idle reaper leaves it alone however long the caller's
+        preceding turn takes.
+        """
+        if self.pool is None:
+            return
+        cwd = workdir or self.workspace
+        command = self._build_command(cwd=cwd, model_override=model_override, resume_session=None)
+        self.pool.hold(command, cwd)
+        self.pool.warm(command, cwd)
 
+    def release_prewarm(self, *, model_override: Optional[str] = None, workdir: Optional[Path] = None) -> None:
+        if self.pool is None:
+            return
+        cwd = workdir or self.workspace
+        command = self._build_command(cwd=cwd, model_override=model_override, resume_session=None)
+        self.pool.release(command, cwd)
+
+    def _prepare_paths(self, label: str) -> tuple[Path, Path]:
+        self.artifacts_dir.mkdir(parents=True, exist_ok=True)
         transcript_path = self.artifacts_dir / f"{label}.log"
         last_message_path = self.artifacts_dir / f"{label}.txt"
         transcript_path.parent.mkdir(parents=True, exist_ok=True)
         last_message_path.parent.mkdir(parents=True, exist_ok=True)
+        return transcript_path, last_message_path
+
+    def _archive_transcript(self, transcript_path: Path) -> None:
+        """Move a finished transcript into the blob store; it stays a plain file if that fails."""
+        if self.transcripts is None or not transcript_path.exists():
+            return
+        label = transcript_path.relative_to(self.artifacts_dir).as_posix()
+        try:
+            record = self.transcripts.archive(transcript_path, label)
+        except OSError as exc:
+            print(f"[Codex] Could not archive transcript {transcript_path}: {exc}")
+            return
+        self.telemetry.count(
+            "workflow_transcript_bytes_total",
+            record.size,
+            help="Bytes of Codex transcripts archived, before compression.",
+        )
+        self.telemetry.count(
+            "workflow_transcript_stored_bytes_total",
+            record.stored_size,
+            help="Bytes the archived transcripts take in the blob store (0 for deduplicated ones).",
+        )
 
+    def _build_command(
+        self,
+        *,
+        cwd: Path,
+        model_override: Optional[str],
+        resume_session: Optional[str],
+    ) -> List[str]:
         command: List[str] = [
             "codex",
             "--dangerously-bypass-approvals-and-sandbox",
@@ -66,7 +306,7 @@ class CodexRunner:
             [
                 "--skip-git-repo-check",
                 "--cd",
-                str(self.workspace),
+                str(cwd),
             ]
         )
 
@@ -79,51 +319,38 @@ class CodexRunner:
             command.append("--include-plan-tool")
         if resume_session:
             command.extend(["resume", resume_session])
+        return command
 
-        print(f"\n[Codex] Running '{label}'...")
-        self._reconcile_artifacts_root()
-        process = subprocess.Popen(
-            command,
-            stdin=subprocess.PIPE,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.STDOUT,
-            text=True,
-            cwd=self.workspace,
-        )
-
-        raw_lines: List[str] = []
-        assert process.stdin is not None
-        process.stdin.write(prompt_text)
-        process.stdin.close()
-
-        assert process.stdout is not None
-        with transcript_path.open("w", encoding="utf-8") as log_handle:
-            for line in process.stdout:
-                raw_lines.append(line)
-                log_handle.write(line)
-                log_handle.flush()
-                sys.stdout.write(line)
-                sys.stdout.flush()
-
-        return_code = process.wait()
-        raw_output = "".join(raw_lines)
-
+    def _complete_run(
+        self,
+        *,
+        label: str,
+        command: List[str],
+        return_code: int,
+        scanner: TranscriptScanner,
+        transcript_path: Path,
+        last_message_path: Path,
+        resume_session: Optional[str],
+        cwd: Path,
+    ) -> CodexRunResult:
         if return_code != 0:
             raise subprocess.CalledProcessError(
                 returncode=return_code,
                 cmd=command,
-                output=raw_output,
+                output=scanner.tail(),
+                stderr=scanner.cli_errors(),
             )
 
-        last_message = self._extract_last_message(raw_output)
+        last_message = scanner.last_message()
         last_message_path.write_text(last_message + "\n", encoding="utf-8")
 
-        session_id = self._extract_session_id(raw_output) or resume_session
+        session_id = scanner.session_id or resume_session
 
         if session_id:
             print(f"[Codex] Session: {session_id}")
-        print(f"[Codex] '{label}' completed. Transcript saved to {transcript_path}")
-        self._reconcile_artifacts_root()
+        where = f"saved to {transcript_path}" if transcript_path.exists() else "archived in the transcript store"
+        print(f"[Codex] '{label}' completed. Transcript {where}")
+        self._reconcile_artifacts_root(cwd)
         return CodexRunResult(
             label=label,
             last_message_path=last_message_path,
@@ -131,9 +358,10 @@ class CodexRunner:
             session_id=session_id,
         )
 
-    def _reconcile_artifacts_root(self) -> None:
-        stray_root = self.workspace / "ARTIFACTS"
-        target_root = self.workspace / ARTIFACTS_DIR
+    def _reconcile_artifacts_root(self, root: Optional[Path] = None) -> None:
+        root = root or self.workspace
+        stray_root = root / "ARTIFACTS"
+        target_root = root / ARTIFACTS_DIR
         if stray_root == target_root:
             return
         if not stray_root.exists() or not stray_root.is_dir():
@@ -191,30 +419,3 @@ class CodexRunner:
             candidate = directory / f"{stem}.{next(counter)}{suffix}"
             if not candidate.exists():
                 return candidate
-
-    @staticmethod
-    def _extract_session_id(raw_output: str) -> Optional[str]:
-        for line in raw_output.splitlines():
-            line = line.strip()
-            if line.lower().startswith("session id:"):
-                return line.split(":", 1)[1].strip()
-            if line.lower().startswith("thread id:"):
-                return line.split(":", 1)[1].strip()
-        return None
-
-    @staticmethod
-    def _extract_last_message(raw_output: str) -> str:
-        lines = raw_output.splitlines()
-        last_codex_index = None
-        for idx, line in enumerate(lines):
-            if line.strip() == "codex":
-                last_codex_index = idx
-        if last_codex_index is None:
-            return raw_output.strip()
-
-        message_lines: List[str] = []
-        for line in lines[last_codex_index + 1 :]:
-            if line.strip().lower() == "tokens used":
-                break
-            message_lines.append(line)
-        return "\n".join(message_lines).strip()
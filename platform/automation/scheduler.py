@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import heapq
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, Dict, List, Mapping, Optional, Sequence, Set, Tuple
+
+SCHEDULE_POLICIES = ("id", "critical-path", "fanout")
+
+
+def priority_keys(
+    dependencies: Mapping[str, Sequence[str]],
+    weights: Mapping[str, int],
+    policy: str,
+) -> Dict[str, Tuple]:
+    """Return a sort key per node; smaller keys should be scheduled first.
+
+    ``critical-path`` favours the node with the longest remaining weighted path
+    to the end of the graph, ``fanout`` the node that transitively unblocks the
+    most other nodes, and ``id`` keeps plain lexicographic order. Every policy
+    falls back to the node id so the result is deterministic.
+    """
+    if policy not in SCHEDULE_POLICIES:
+        raise ValueError(f"Unknown schedule policy: {policy}")
+    node_ids = sorted(dependencies)
+    if policy == "id":
+        return {node_id: (node_id,) for node_id in node_ids}
+
+    dependents: Dict[str, List[str]] = {node_id: [] for node_id in node_ids}
+    indegree: Dict[str, int] = {node_id: 0 for node_id in node_ids}
+    for node_id in node_ids:
+        for dep in dependencies[node_id]:
+            if dep in dependents:
+                dependents[dep].append(node_id)
+                indegree[node_id] += 1
+
+    queue = [node_id for node_id in node_ids if indegree[node_id] == 0]
+    ordered: List[str] = []
+    while queue:
+        current = queue.pop()
+        ordered.append(current)
+        for child in dependents[current]:
+            indegree[child] -= 1
+            if indegree[child] == 0:
+                queue.append(child)
+
+    bit = {node_id: 1 << position for position, node_id in enumerate(node_ids)}
+    remaining: Dict[str, int] = {node_id: 0 for node_id in node_ids}
+    descendants: Dict[str, int] = {node_id: 0 for node_id in node_ids}
+    for node_id in reversed(ordered):
+        children = dependents[node_id]
+        remaining[node_id] = max(1, weights.get(node_id, 1)) + max(
+            (remaining[child] for child in children), default=0
+        )
+        mask = 0
+        for child in children:
+            mask |= bit[child] | descendants[child]
+        descendants[node_id] = mask
+
+    if policy == "critical-path":
+        return {node_id: (-remaining[node_id], node_id) for node_id in node_ids}
+    return {
+        node_id: (-descendants[node_id].bit_count(), -remaining[node_id], node_id)
+        for node_id in node_ids
+    }
+
+
+class DagExecutor:
+    """Run dependency-ordered work items, launching each one as soon as its deps settle."""
+
+    def __init__(self, max_workers: int = 1) -> None:
+        self.max_workers = max(1, max_workers)
+
+    def run(
+        self,
+        order: Sequence[str],
+        dependencies: Mapping[str, Sequence[str]],
+        execute: Callable[[str], None],
+        *,
+        can_start: Optional[Callable[[], bool]] = None,
+        priority: Optional[Mapping[str, Tuple]] = None,
+    ) -> List[str]:
+        """Execute every id in ``order`` and return the ids that completed.
+
+        When several items are ready at once, the one with the smallest
+        ``priority`` key is launched first; without priorities (or on ties) the
+        item that appears first in ``order`` wins. Dependencies that
+        are not part of ``order`` are treated as already satisfied. The first
+        exception raised by ``execute`` stops further launches; in-flight items
+        are allowed to finish before the exception is re-raised.
+        """
+        rank = {node_id: position for position, node_id in enumerate(order)}
+        priority = priority or {}
+
+        def ready_key(node_id: str) -> Tuple:
+            return (priority.get(node_id, ()), rank[node_id])
+        waiting_on: Dict[str, Set[str]] = {}
+        dependents: Dict[str, List[str]] = {node_id: [] for node_id in order}
+        for node_id in order:
+            pending = {dep for dep in dependencies.get(node_id, ()) if dep in rank}
+            waiting_on[node_id] = pending
+            for dep in pending:
+                dependents[dep].append(node_id)
+
+        ready = [ready_key(node_id) for node_id, pending in waiting_on.items() if not pending]
+        heapq.heapify(ready)
+        completed: List[str] = []
+
+        def release(node_id: str) -> None:
+            completed.append(node_id)
+            for dependent in dependents[node_id]:
+                pending = waiting_on[dependent]
+                pending.discard(node_id)
+                if not pending:
+                    heapq.heappush(ready, ready_key(dependent))
+
+        def may_launch() -> bool:
+            return can_start is None or can_start()
+
+        if self.max_workers == 1:
+            while ready and may_launch():
+                node_id = order[heapq.heappop(ready)[1]]
+                execute(node_id)
+                release(node_id)
+            return completed
+
+        running: Dict[Future, str] = {}
+        failure: Optional[BaseException] = None
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            while True:
+                while failure is None and ready and len(running) < self.max_workers and may_launch():
+                    node_id = order[heapq.heappop(ready)[1]]
+                    running[pool.submit(execute, node_id)] = node_id
+                if not running:
+                    break
+                done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for future in done:
+                    node_id = running.pop(future)
+                    exc = future.exception()
+                    if exc is not None:
+                        if failure is None:
+                            failure = exc
+                        continue
+                    release(node_id)
+        if failure is not None:
+            raise failure
+        return completed
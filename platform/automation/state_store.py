@@ -0,0 +1,359 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from .paths import BUGS_DIR, FEEDBACK_DIR, SESSIONS_DIR
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS tasks (
+    task_id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    timestamp TEXT NOT NULL,
+    role TEXT NOT NULL,
+    prompt_number INTEGER,
+    agent_label TEXT NOT NULL,
+    attempt INTEGER,
+    session_id TEXT,
+    task_id TEXT,
+    transcript_path TEXT,
+    last_message_path TEXT,
+    cached INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS runs_label ON runs (agent_label, role, id);
+CREATE INDEX IF NOT EXISTS runs_prompt ON runs (prompt_number, id);
+CREATE INDEX IF NOT EXISTS runs_task ON runs (task_id, id);
+CREATE TABLE IF NOT EXISTS sessions (
+    prompt_number INTEGER PRIMARY KEY,
+    session_id TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS items (
+    kind TEXT NOT NULL,
+    item_id TEXT NOT NULL,
+    pending_stage TEXT,
+    awaiting_human INTEGER NOT NULL DEFAULT 0,
+    updated_at TEXT,
+    state TEXT NOT NULL,
+    PRIMARY KEY (kind, item_id)
+);
+CREATE INDEX IF NOT EXISTS items_stage ON items (kind, pending_stage);
+"""
+
+RUN_FIELDS = (
+    "timestamp",
+    "role",
+    "prompt_number",
+    "agent_label",
+    "attempt",
+    "session_id",
+    "task_id",
+    "transcript_path",
+    "last_message_path",
+    "cached",
+)
+
+
+# Task lifecycle recorded in the ``tasks`` table.
+TASK_WAITING = "waiting"
+TASK_STARTED = "started"
+TASK_COMPLETED = "completed"
+TASK_FAILED = "failed"
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds") + "Z"
+
+
+def _run_values(entry: Dict[str, Any]) -> tuple:
+    return tuple(int(bool(entry.get(field))) if field == "cached" else entry.get(field) for field in RUN_FIELDS)
+
+
+class StateStore:
+    """WAL-mode SQLite store of the workflow state kept under automation_artifacts.
+
+    The workflow writes every state change here in its own transaction and the
+    Telegram bot answers status queries from the indexes instead of rescanning
+    ``conversations.jsonl`` and the per-item ``state.json`` files. Task status
+    lives only here; ``processed_tasks.json`` is an export written at the end
+    of each task loop. The other legacy files are still written so older
+    tooling keeps working. The first time a database is created they are all
+    imported once.
+    """
+
+    FILENAME = "state.db"
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._migrate()
+
+    def _migrate(self) -> None:
+        columns = {row["name"] for row in self._conn.execute("PRAGMA table_info(runs)")}
+        if "cached" not in columns:
+            try:
+                self._conn.execute("ALTER TABLE runs ADD COLUMN cached INTEGER NOT NULL DEFAULT 0")
+            except sqlite3.OperationalError:
+                # Another process opening the same database added it first.
+                pass
+
+    @classmethod
+    def open(cls, artifacts_dir: Path, *, workspace: Optional[Path] = None) -> "StateStore":
+        """Open ``artifacts_dir/state.db``, importing the legacy files on first use."""
+        store = cls(artifacts_dir / cls.FILENAME)
+        if store.get_meta("legacy_import") is None:
+            store.import_legacy(artifacts_dir, workspace=workspace)
+        return store
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _write(self, statements: Iterable[tuple]) -> None:
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                for sql, params in statements:
+                    self._conn.execute(sql, params)
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def _query(self, sql: str, params: tuple = ()) -> List[sqlite3.Row]:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    # meta
+
+    def get_meta(self, key: str) -> Optional[str]:
+        rows = self._query("SELECT value FROM meta WHERE key = ?", (key,))
+        return rows[0]["value"] if rows else None
+
+    def set_meta(self, key: str, value: str) -> None:
+        self._write([("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))])
+
+    # tasks
+
+    def set_task_status(self, task_id: str, status: str) -> None:
+        self._write(
+            [
+                (
+                    "INSERT OR REPLACE INTO tasks (task_id, status, updated_at) VALUES (?, ?, ?)",
+                    (task_id, status, _now()),
+                )
+            ]
+        )
+
+    def set_task_statuses(self, task_ids: Iterable[str], status: str) -> None:
+        """Set the status of several tasks in one transaction."""
+        now = _now()
+        self._write(
+            [
+                ("INSERT OR REPLACE INTO tasks (task_id, status, updated_at) VALUES (?, ?, ?)", (task_id, status, now))
+                for task_id in task_ids
+            ]
+        )
+
+    def task_statuses(self) -> Dict[str, str]:
+        rows = self._query("SELECT task_id, status FROM tasks ORDER BY task_id")
+        return {row["task_id"]: row["status"] for row in rows}
+
+    def export_completed_tasks(self, path: Path) -> None:
+        """Write the completed task ids to ``path`` (the legacy processed_tasks.json format)."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(path.suffix + ".tmp")
+        tmp_path.write_text(json.dumps(self.task_ids_with_status(TASK_COMPLETED), indent=2), encoding="utf-8")
+        tmp_path.replace(path)
+
+    def task_ids_with_status(self, status: str) -> List[str]:
+        rows = self._query("SELECT task_id FROM tasks WHERE status = ? ORDER BY task_id", (status,))
+        return [row["task_id"] for row in rows]
+
+    # runs and sessions
+
+    def record_run(self, entry: Dict[str, Any]) -> None:
+        """Append a conversation entry (same shape as a conversations.jsonl line).
+
+        ``cached`` marks a review answered from the validation cache, with no Codex run.
+        """
+        values = _run_values(entry)
+        statements = [
+            (
+                f"INSERT INTO runs ({', '.join(RUN_FIELDS)}) VALUES ({', '.join('?' for _ in RUN_FIELDS)})",
+                values,
+            )
+        ]
+        if entry.get("role") == "agent" and entry.get("session_id") and entry.get("prompt_number") is not None:
+            statements.append(
+                (
+                    "INSERT OR REPLACE INTO sessions (prompt_number, session_id, updated_at) VALUES (?, ?, ?)",
+                    (entry["prompt_number"], entry["session_id"], entry.get("timestamp") or _now()),
+                )
+            )
+        self._write(statements)
+
+    def latest_session(self, *, label_prefix: str, role: str = "agent") -> Optional[str]:
+        rows = self._query(
+            "SELECT session_id FROM runs WHERE agent_label >= ? AND agent_label < ? AND role = ? "
+            "AND session_id IS NOT NULL ORDER BY id DESC LIMIT 1",
+            (label_prefix, label_prefix + "\uffff", role),
+        )
+        return rows[0]["session_id"] if rows else None
+
+    def latest_run(self, *, prompt_numbers: Iterable[int]) -> Optional[Dict[str, Any]]:
+        numbers = sorted(set(prompt_numbers))
+        if not numbers:
+            return None
+        placeholders = ", ".join("?" for _ in numbers)
+        rows = self._query(
+            f"SELECT * FROM runs WHERE prompt_number IN ({placeholders}) ORDER BY id DESC LIMIT 1",
+            tuple(numbers),
+        )
+        return dict(rows[0]) if rows else None
+
+    def last_run_id(self) -> int:
+        rows = self._query("SELECT MAX(id) AS id FROM runs")
+        return rows[0]["id"] or 0
+
+    def runs_since(self, run_id: int, *, limit: int = 10000) -> List[Dict[str, Any]]:
+        rows = self._query(
+            "SELECT id, agent_label, task_id, last_message_path FROM runs WHERE id > ? ORDER BY id LIMIT ?",
+            (run_id, limit),
+        )
+        return [dict(row) for row in rows]
+
+    def prompt_session(self, prompt_number: int) -> Optional[str]:
+        rows = self._query("SELECT session_id FROM sessions WHERE prompt_number = ?", (prompt_number,))
+        return rows[0]["session_id"] if rows else None
+
+    # bug and feedback items
+
+    def save_item(self, kind: str, item_id: str, state: Dict[str, Any]) -> None:
+        self._write([self._item_statement(kind, item_id, state)])
+
+    @staticmethod
+    def _item_statement(kind: str, item_id: str, state: Dict[str, Any]) -> tuple:
+        return (
+            "INSERT OR REPLACE INTO items (kind, item_id, pending_stage, awaiting_human, updated_at, state) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                kind,
+                item_id,
+                state.get("pending_stage"),
+                1 if state.get("awaiting_human") else 0,
+                state.get("updated_at"),
+                json.dumps(state),
+            ),
+        )
+
+    def item_state(self, kind: str, item_id: str) -> Optional[Dict[str, Any]]:
+        rows = self._query("SELECT state FROM items WHERE kind = ? AND item_id = ?", (kind, item_id))
+        return json.loads(rows[0]["state"]) if rows else None
+
+    def item_states(self, kind: str) -> Dict[str, Dict[str, Any]]:
+        rows = self._query("SELECT item_id, state FROM items WHERE kind = ? ORDER BY item_id", (kind,))
+        return {row["item_id"]: json.loads(row["state"]) for row in rows}
+
+    # legacy import
+
+    def import_legacy(self, artifacts_dir: Path, *, workspace: Optional[Path] = None) -> None:
+        """Load processed_tasks.json, conversations.jsonl and bug/feedback state.json files once."""
+        now = _now()
+        # Claiming the meta key in the same transaction makes concurrent first
+        # opens (workflow and bot) import exactly once.
+        statements: List[tuple] = [("INSERT INTO meta (key, value) VALUES (?, ?)", ("legacy_import", now))]
+
+        tasks_path = artifacts_dir / "processed_tasks.json"
+        if tasks_path.exists():
+            try:
+                task_ids = json.loads(tasks_path.read_text(encoding="utf-8"))
+            except json.JSONDecodeError:
+                task_ids = []
+            for task_id in task_ids if isinstance(task_ids, list) else []:
+                statements.append(
+                    (
+                        "INSERT OR IGNORE INTO tasks (task_id, status, updated_at) VALUES (?, ?, ?)",
+                        (str(task_id), TASK_COMPLETED, now),
+                    )
+                )
+
+        log_path = artifacts_dir / "conversations.jsonl"
+        if log_path.exists():
+            with log_path.open("r", encoding="utf-8") as handle:
+                for line in handle:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    if not isinstance(entry, dict) or not entry.get("agent_label"):
+                        continue
+                    # Older lines may lack NOT NULL columns; a constraint error here
+                    # would read as "already imported" and silently skip everything.
+                    entry = {**entry, "timestamp": entry.get("timestamp") or now, "role": entry.get("role") or ""}
+                    statements.append(
+                        (
+                            f"INSERT INTO runs ({', '.join(RUN_FIELDS)}) "
+                            f"VALUES ({', '.join('?' for _ in RUN_FIELDS)})",
+                            _run_values(entry),
+                        )
+                    )
+
+        base = workspace if workspace is not None else artifacts_dir.parents[1]
+        sessions_dir = base / SESSIONS_DIR
+        if sessions_dir.exists():
+            for session_path in sessions_dir.glob("prompt*.session"):
+                try:
+                    prompt_number = int(session_path.stem[len("prompt"):])
+                except ValueError:
+                    continue
+                session_id = session_path.read_text(encoding="utf-8").strip()
+                if session_id:
+                    statements.append(
+                        (
+                            "INSERT OR REPLACE INTO sessions (prompt_number, session_id, updated_at) "
+                            "VALUES (?, ?, ?)",
+                            (prompt_number, session_id, now),
+                        )
+                    )
+
+        for kind, root in (("bug", base / BUGS_DIR), ("feedback", base / FEEDBACK_DIR)):
+            if not root.exists():
+                continue
+            for item_dir in sorted(path for path in root.iterdir() if path.is_dir()):
+                state_path = item_dir / "state.json"
+                state: Dict[str, Any] = {}
+                if state_path.exists():
+                    try:
+                        state = json.loads(state_path.read_text(encoding="utf-8"))
+                    except json.JSONDecodeError:
+                        state = {}
+                state.setdefault(f"{kind}_id", item_dir.name)
+                state.setdefault("pending_stage", "intake")
+                statements.append(self._item_statement(kind, item_dir.name, state))
+
+        try:
+            self._write(statements)
+        except sqlite3.IntegrityError:
+            return
+        imported = len(statements) - 1
+        if imported:
+            print(f"[state] Imported {imported} legacy record(s) into {self.path}.")
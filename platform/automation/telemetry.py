@@ -0,0 +1,276 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+SERVICE_NAME = "codex-workflow"
+# Child spans copy these from their parent unless set explicitly, so a
+# ``codex.exec`` span knows which role and prompt it ran for.
+INHERITED_ATTRIBUTES = ("role", "prompt_number", "task_id")
+# Span attributes that become Prometheus labels; everything else stays in the trace only.
+METRIC_LABELS = ("role", "prompt_number")
+DURATION_BUCKETS = (1, 5, 15, 30, 60, 120, 300, 600, 1200, 1800, 3600)
+
+LabelSet = Tuple[Tuple[str, str], ...]
+
+
+class Span:
+    def __init__(
+        self,
+        name: str,
+        *,
+        trace_id: str,
+        parent: Optional["Span"],
+        attributes: Dict[str, Any],
+    ) -> None:
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent.span_id if parent is not None else None
+        self.attributes = attributes
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.error: Optional[str] = None
+
+    def set(self, **attributes: Any) -> None:
+        self.attributes.update({key: value for key, value in attributes.items() if value is not None})
+
+    def fail(self, message: str) -> None:
+        self.error = message
+
+    @property
+    def duration(self) -> float:
+        end_ns = self.end_ns if self.end_ns is not None else time.time_ns()
+        return (end_ns - self.start_ns) / 1e9
+
+    def to_otlp(self) -> dict:
+        span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": 1,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns or self.start_ns),
+            "attributes": [_otlp_attribute(key, value) for key, value in sorted(self.attributes.items())],
+            "status": {"code": 2, "message": self.error} if self.error else {"code": 1},
+        }
+        if self.parent_id:
+            span["parentSpanId"] = self.parent_id
+        return span
+
+
+def _otlp_attribute(key: str, value: Any) -> dict:
+    if isinstance(value, bool):
+        return {"key": key, "value": {"boolValue": value}}
+    if isinstance(value, int):
+        return {"key": key, "value": {"intValue": str(value)}}
+    if isinstance(value, float):
+        return {"key": key, "value": {"doubleValue": value}}
+    return {"key": key, "value": {"stringValue": str(value)}}
+
+
+class _Histogram:
+    def __init__(self, buckets: Tuple[float, ...]) -> None:
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.total = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.total += 1
+        self.sum += value
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[index] += 1
+
+
+class Telemetry:
+    """Spans and metrics for the workflow, the Codex runner and its retries.
+
+    Finished spans are appended to ``trace_path`` as OTLP/JSON lines (one
+    ``resourceSpans`` export per line, the format the OpenTelemetry
+    collector's file exporter writes and its file receiver reads). Every span
+    also feeds the ``workflow_span_duration_seconds`` histogram and the
+    ``workflow_spans_total`` counter. ``serve`` exposes all metrics in the
+    Prometheus text format on ``127.0.0.1``. With no ``trace_path`` the spans
+    are only used for metrics.
+    """
+
+    def __init__(self, trace_path: Optional[Path] = None) -> None:
+        self.trace_path = trace_path
+        self.trace_id = os.urandom(16).hex()
+        # Context-local (not thread-local) so asyncio tasks sharing a thread
+        # each keep their own stack of open spans.
+        self._current: ContextVar[Optional[Span]] = ContextVar(f"telemetry_span_{id(self)}", default=None)
+        self._root: Optional[Span] = None
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[LabelSet, float]] = {}
+        self._histograms: Dict[str, Dict[LabelSet, _Histogram]] = {}
+        self._help: Dict[str, str] = {}
+        self._server: Optional[ThreadingHTTPServer] = None
+
+    # spans
+
+    def current(self) -> Optional[Span]:
+        return self._current.get() or self._root
+
+    @contextmanager
+    def span(self, name: str, **attributes: Any) -> Iterator[Span]:
+        # Worker threads (parallel stages and tasks) start from an empty
+        # context; their spans hang off the root span of the run.
+        parent = self.current()
+        inherited = {
+            key: parent.attributes[key]
+            for key in INHERITED_ATTRIBUTES
+            if parent is not None and key in parent.attributes
+        }
+        span = Span(
+            name,
+            trace_id=self.trace_id,
+            parent=parent,
+            attributes={**inherited, **{key: value for key, value in attributes.items() if value is not None}},
+        )
+        is_root = parent is None
+        if is_root:
+            self._root = span
+        token = self._current.set(span)
+        try:
+            yield span
+        except BaseException as exc:
+            if span.error is None:
+                span.fail(f"{type(exc).__name__}: {exc}")
+            raise
+        finally:
+            self._current.reset(token)
+            if is_root:
+                self._root = None
+            span.end_ns = time.time_ns()
+            self._finish(span)
+
+    def _finish(self, span: Span) -> None:
+        labels = {"span": span.name}
+        labels.update({key: span.attributes.get(key, "") for key in METRIC_LABELS})
+        self.observe(
+            "workflow_span_duration_seconds",
+            span.duration,
+            help="Wall-clock duration of workflow spans.",
+            **labels,
+        )
+        self.count(
+            "workflow_spans_total",
+            help="Finished workflow spans by outcome.",
+            status="error" if span.error else "ok",
+            **labels,
+        )
+        if self.trace_path is None:
+            return
+        record = {
+            "resourceSpans": [
+                {
+                    "resource": {"attributes": [_otlp_attribute("service.name", SERVICE_NAME)]},
+                    "scopeSpans": [{"scope": {"name": "automation"}, "spans": [span.to_otlp()]}],
+                }
+            ]
+        }
+        line = json.dumps(record) + "\n"
+        with self._lock:
+            self.trace_path.parent.mkdir(parents=True, exist_ok=True)
+            with self.trace_path.open("a", encoding="utf-8") as handle:
+                handle.write(line)
+
+    # metrics
+
+    @staticmethod
+    def _labels(labels: Dict[str, Any]) -> LabelSet:
+        return tuple(sorted((key, "" if value is None else str(value)) for key, value in labels.items()))
+
+    def count(self, name: str, value: float = 1, *, help: str = "", **labels: Any) -> None:
+        with self._lock:
+            if help:
+                self._help.setdefault(name, help)
+            series = self._counters.setdefault(name, {})
+            key = self._labels(labels)
+            series[key] = series.get(key, 0) + value
+
+    def observe(self, name: str, value: float, *, help: str = "", **labels: Any) -> None:
+        with self._lock:
+            if help:
+                self._help.setdefault(name, help)
+            series = self._histograms.setdefault(name, {})
+            key = self._labels(labels)
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = _Histogram(DURATION_BUCKETS)
+            histogram.observe(value)
+
+    def render_prometheus(self) -> str:
+        lines: List[str] = []
+        with self._lock:
+            for name, series in sorted(self._counters.items()):
+                lines.append(f"# HELP {name} {self._help.get(name, name)}")
+                lines.append(f"# TYPE {name} counter")
+                for labels, value in sorted(series.items()):
+                    lines.append(f"{name}{_format_labels(labels)} {_format_number(value)}")
+            for name, series in sorted(self._histograms.items()):
+                lines.append(f"# HELP {name} {self._help.get(name, name)}")
+                lines.append(f"# TYPE {name} histogram")
+                for labels, histogram in sorted(series.items()):
+                    for bound, count in zip(histogram.buckets, histogram.counts):
+                        bucket_labels = labels + (("le", _format_number(bound)),)
+                        lines.append(f"{name}_bucket{_format_labels(bucket_labels)} {count}")
+                    inf_labels = labels + (("le", "+Inf"),)
+                    lines.append(f"{name}_bucket{_format_labels(inf_labels)} {histogram.total}")
+                    lines.append(f"{name}_sum{_format_labels(labels)} {_format_number(histogram.sum)}")
+                    lines.append(f"{name}_count{_format_labels(labels)} {histogram.total}")
+        return "\n".join(lines) + "\n"
+
+    def serve(self, port: int) -> None:
+        telemetry = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:  # noqa: N802 - http.server API
+                if self.path.split("?", 1)[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = telemetry.render_prometheus().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                return
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+        self._server.daemon_threads = True
+        thread = threading.Thread(target=self._server.serve_forever, name="metrics-server", daemon=True)
+        thread.start()
+        print(f"[metrics] Serving Prometheus metrics on http://127.0.0.1:{self._server.server_address[1]}/metrics")
+
+    def close(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+
+def _format_labels(labels: LabelSet) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape_label(value)}"' for key, value in labels) + "}"
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
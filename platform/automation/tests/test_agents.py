@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+import sys
+import unittest
+from pathlib import Path
+
+if __package__ is None or __package__ == "":
+    sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from automation.agents import PRIMARY_PROMPTS
+from automation.paths import BASE_DIR
+
+# Paths in automation.paths are relative to the repository root.
+REPO_ROOT = Path(__file__).resolve().parents[3]
+
+
+class PrimaryInputsTest(unittest.TestCase):
+    def test_inputs_cover_files_the_templates_read(self) -> None:
+        # The manifest only reruns a stage when a declared input changes, so every
+        # workspace file a primary template tells the agent to read must be listed.
+        for spec in PRIMARY_PROMPTS:
+            template = (REPO_ROOT / spec.template_path).read_text(encoding="utf-8")
+            for path in spec.inputs:
+                self.assertTrue(path.is_relative_to(BASE_DIR), f"{spec.name}: {path}")
+            declared = {path.relative_to(BASE_DIR).as_posix() for path in spec.inputs}
+            if "project.yaml" in template:
+                self.assertIn("project.yaml", declared, spec.name)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+if __package__ is None or __package__ == "":
+    sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from automation.conversation_log import BLOCK_SIZE, ConversationLog
+
+
+class LatestSessionTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.log = ConversationLog(Path(self.tmp.name) / "conversations.jsonl")
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def test_retry_labels_match_by_prefix(self) -> None:
+        self.log.append({"role": "agent", "agent_label": "tasks/t-001/agent", "session_id": "first"})
+        # Push the older entry into an earlier block than the newest one.
+        filler = {"role": "manager", "agent_label": "tasks/t-001/manager", "note": "x" * 200}
+        for _ in range(BLOCK_SIZE // 200 + 10):
+            self.log.append(filler)
+        self.log.append({"role": "agent", "agent_label": "tasks/t-001/agent-retry1", "session_id": "retry"})
+        self.log.append({"role": "agent", "agent_label": "tasks/t-002/agent", "session_id": "other"})
+
+        self.assertEqual(self.log.latest_session(label_prefix="tasks/t-001/agent"), "retry")
+        self.assertIsNone(self.log.latest_session(label_prefix="tasks/t-003/agent"))
+
+    def test_missing_log(self) -> None:
+        self.assertIsNone(self.log.latest_session(label_prefix="tasks/t-001/agent"))
+        self.assertIsNone(self.log.latest(prompt_numbers=[1]))
+
+
+if __name__ == "__main__":
+    unittest.main()
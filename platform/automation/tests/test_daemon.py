@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import sys
+import threading
+import time
+import unittest
+from pathlib import Path
+from typing import List, Set
+
+if __package__ is None or __package__ == "":
+    sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from automation.daemon import _LaneWorker
+from automation.retry import Backoff
+
+
+class FixedBackoff(Backoff):
+    def delay(self, failures: int, multiplier: float = 1.0) -> float:
+        return 0.05 * failures
+
+
+class LaneRetryTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.stop = threading.Event()
+        self.batches: List[Set[str]] = []
+        self.failing = {"BUG-1"}
+
+    def tearDown(self) -> None:
+        self.stop.set()
+        self.lane.join()
+
+    def handler(self, keys: Set[str]) -> Set[str]:
+        self.batches.append(set(keys))
+        return keys & self.failing
+
+    def wait_for(self, predicate, timeout: float = 3.0) -> None:
+        deadline = time.monotonic() + timeout
+        while not predicate():
+            if time.monotonic() > deadline:
+                self.fail(f"timed out; batches so far: {self.batches}")
+            time.sleep(0.01)
+
+    def test_unfinished_items_are_retried_until_they_finish(self) -> None:
+        self.lane = _LaneWorker("bugs", self.handler, self.stop, backoff=FixedBackoff())
+        self.lane.start()
+        self.lane.submit(["BUG-1", "BUG-2"])
+        self.wait_for(lambda: self.lane.retrying().get("BUG-1", {}).get("failures") == 2)
+        self.assertEqual(self.batches[:2], [{"BUG-1", "BUG-2"}, {"BUG-1"}])
+        self.assertNotIn("BUG-2", self.lane.retrying())
+
+        self.failing.clear()
+        self.wait_for(lambda: not self.lane.retrying())
+        self.assertEqual(self.batches[-1], {"BUG-1"})
+
+    def test_handler_errors_retry_the_whole_batch(self) -> None:
+        def broken(keys: Set[str]) -> Set[str]:
+            self.batches.append(set(keys))
+            if len(self.batches) == 1:
+                raise RuntimeError("codex outage")
+            return set()
+
+        self.lane = _LaneWorker("tasks", broken, self.stop, backoff=FixedBackoff())
+        self.lane.start()
+        self.lane.submit(["backlog"])
+        self.wait_for(lambda: len(self.batches) >= 2 and not self.lane.retrying())
+        self.assertEqual(self.batches, [{"backlog"}, {"backlog"}])
+
+
+if __name__ == "__main__":
+    unittest.main()
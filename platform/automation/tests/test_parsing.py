@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import sys
+import time
+import unittest
+from pathlib import Path
+
+if __package__ is None or __package__ == "":
+    sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from automation.benchmarks.parsing_bench import build_nested_payload, build_payload
+from automation.parsing import _extract_json_object
+
+
+class ExtractJsonObjectTest(unittest.TestCase):
+    def test_newest_valid_object_wins(self) -> None:
+        self.assertEqual(_extract_json_object('noise {"a": 1} more {"b": 2} tail'), {"b": 2})
+
+    def test_nested_object_of_a_malformed_span(self) -> None:
+        self.assertEqual(_extract_json_object('{"a": {"b": tru}, "c": {"d": 2}}'), {"d": 2})
+        self.assertEqual(_extract_json_object('{"outer": [{"in": 1}, tru]}'), {"in": 1})
+
+    def test_braces_inside_strings_are_ignored(self) -> None:
+        self.assertEqual(_extract_json_object('x {"a": "}"} y'), {"a": "}"})
+
+    def test_array_only_without_objects(self) -> None:
+        self.assertEqual(_extract_json_object("result: [1, 2] done"), [1, 2])
+        self.assertIsNone(_extract_json_object("no json { here"))
+
+    def test_linear_on_large_noisy_payloads(self) -> None:
+        # A failed decode at an absolute offset costs time proportional to that
+        # offset; 1 MiB of noise used to take seconds that way.
+        payload = build_payload(1024 * 1024, seed=7)
+        started = time.perf_counter()
+        result = _extract_json_object(payload)
+        elapsed = time.perf_counter() - started
+        self.assertEqual(result["status"], "pass")
+        self.assertLess(elapsed, 1.0)
+
+    def test_deeply_nested_malformed_objects(self) -> None:
+        payload = build_nested_payload(50, 200)
+        self.assertEqual(_extract_json_object(payload)["status"], "pass")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import sys
+import time
+import unittest
+from pathlib import Path
+from typing import List, Sequence
+
+if __package__ is None or __package__ == "":
+    sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from automation.pool import CodexProcessPool
+
+
+class FakeProcess:
+    def __init__(self, command: Sequence[str]) -> None:
+        self.command = list(command)
+        self.stdin = None
+        self.stdout = None
+        self.returncode = None
+
+    def poll(self):
+        return self.returncode
+
+    def kill(self) -> None:
+        self.returncode = -9
+
+    def wait(self):
+        return self.returncode
+
+
+class RecordingPool(CodexProcessPool):
+    def __init__(self, size: int, *, idle_timeout: float = 300.0) -> None:
+        super().__init__(size, idle_timeout=idle_timeout)
+        self.spawned: List[List[str]] = []
+
+    def spawn(self, command: Sequence[str], cwd: Path) -> FakeProcess:  # type: ignore[override]
+        self.spawned.append(list(command))
+        return FakeProcess(command)
+
+
+AGENT = ["codex", "exec", "-m", "agent-model"]
+MANAGER = ["codex", "exec", "-m", "manager-model"]
+
+
+class PoolTopUpTest(unittest.TestCase):
+    def tearDown(self) -> None:
+        self.pool.close()
+
+    def test_one_off_keys_are_not_topped_up(self) -> None:
+        self.pool = RecordingPool(size=2)
+        for task in range(3):
+            self.pool.acquire(AGENT, Path(f"/worktrees/t-{task}"))
+        self.assertEqual(len(self.pool.spawned), 3)
+        self.assertEqual(self.pool.misses, 3)
+
+    def test_recurring_keys_top_up_without_evicting_other_keys(self) -> None:
+        self.pool = RecordingPool(size=1)
+        cwd = Path("/workspace")
+        for _ in range(3):
+            self.pool.warm(MANAGER, cwd)
+            self.pool.acquire(AGENT, cwd)
+            self.pool.acquire(MANAGER, cwd)
+        # The manager stays warm; the agent's top-ups never evict its worker.
+        self.assertEqual(self.pool.hits, 3)
+        self.assertEqual(self.pool.spawned.count(AGENT), 3)
+        self.assertEqual(self.pool.spawned.count(MANAGER), 4)
+
+
+class PoolHoldTest(unittest.TestCase):
+    def tearDown(self) -> None:
+        self.pool.close()
+
+    def _age_idle_workers(self, seconds: float) -> None:
+        for worker in self.pool._idle:
+            worker.spawned_at -= seconds
+
+    def test_held_key_outlives_idle_timeout(self) -> None:
+        self.pool = RecordingPool(size=2, idle_timeout=60.0)
+        cwd = Path("/workspace")
+        self.pool.hold(MANAGER, cwd)
+        self.pool.warm(MANAGER, cwd)
+        # A long agent turn: the manager worker is older than the idle timeout.
+        self.pool.acquire(AGENT, cwd)
+        self._age_idle_workers(600.0)
+        self.pool._reap_locked(time.monotonic())
+        self.pool.acquire(MANAGER, cwd)
+        self.assertEqual(self.pool.hits, 1)
+        self.assertEqual(self.pool.spawned.count(MANAGER), 1)
+
+    def test_released_key_is_reaped(self) -> None:
+        self.pool = RecordingPool(size=2, idle_timeout=60.0)
+        cwd = Path("/workspace")
+        self.pool.hold(MANAGER, cwd)
+        self.pool.warm(MANAGER, cwd)
+        self.pool.release(MANAGER, cwd)
+        self._age_idle_workers(600.0)
+        self.pool._reap_locked(time.monotonic())
+        self.assertEqual(self.pool._idle, [])
+
+    def test_eviction_spares_held_keys(self) -> None:
+        self.pool = RecordingPool(size=2)
+        self.pool.hold(MANAGER, Path("/worktrees/t-1"))
+        self.pool.warm(MANAGER, Path("/worktrees/t-1"))
+        self.pool.warm(AGENT, Path("/workspace"))
+        self.pool.warm(MANAGER, Path("/worktrees/t-2"))
+        # The held manager worker is the oldest, but the agent's is evicted.
+        self.assertEqual(
+            [worker.key[1] for worker in self.pool._idle],
+            ["/worktrees/t-1", "/worktrees/t-2"],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import sys
+import unittest
+from pathlib import Path
+
+if __package__ is None or __package__ == "":
+    sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from automation.prompt_budget import PromptAssembler, byte_size, fit_to_budget
+
+GUARDRAILS = "Never push to main.\nNever print secrets.\n\n"
+PROMPT = (
+    GUARDRAILS
+    + "Role: Module Developer\n\n"
+    + "Goal: implement the task.\n\n"
+    + "Inputs:\n- task.json\n\n"
+    + "Output (JSON):\n"
+    + "".join(f"- output field {index}\n" for index in range(40))
+    + "\n"
+    + "Rules:\n"
+    + "".join(f"- rule number {index}\n" for index in range(40))
+)
+
+
+class FitToBudgetTest(unittest.TestCase):
+    def test_prompt_within_budget_is_unchanged(self) -> None:
+        self.assertEqual(fit_to_budget(PROMPT, byte_size(PROMPT)), PROMPT)
+        self.assertEqual(fit_to_budget(PROMPT, 0), PROMPT)
+
+    def test_rules_are_trimmed_before_output(self) -> None:
+        budget = byte_size(PROMPT) - 200
+        fitted = fit_to_budget(PROMPT, budget)
+        self.assertLessEqual(byte_size(fitted), budget)
+        self.assertIn("- output field 39\n", fitted)
+        self.assertNotIn("- rule number 39\n", fitted)
+        self.assertIn("Rules:\n", fitted)
+        self.assertIn("bytes omitted to fit the prompt budget", fitted)
+
+    def test_guardrails_and_required_sections_are_never_trimmed(self) -> None:
+        fitted = fit_to_budget(PROMPT, 10)
+        self.assertTrue(fitted.startswith(GUARDRAILS))
+        for required in ("Role: Module Developer\n", "Goal: implement the task.\n", "- task.json\n"):
+            self.assertIn(required, fitted)
+        self.assertNotIn("- output field 39\n", fitted)
+
+    def test_assembler_without_budget_keeps_full_instructions(self) -> None:
+        prompt = PromptAssembler().followup("Fix the failing test.", PROMPT, resume_session=None)
+        self.assertIn(PROMPT, prompt.text)
+        self.assertEqual(prompt.saved_bytes, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import sys
+import threading
+import unittest
+from pathlib import Path
+
+if __package__ is None or __package__ == "":
+    sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from automation.retry import AUTH, EXECUTION_ERROR, RATE_LIMITED, CircuitBreaker, classify
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def tripped_breaker(clock: FakeClock, **kwargs) -> CircuitBreaker:
+    breaker = CircuitBreaker(threshold=2, cooldown=10.0, clock=clock, **kwargs)
+    breaker.record_failure()
+    breaker.record_failure()
+    clock.now += 10.0
+    return breaker
+
+
+def call_in_thread(breaker: CircuitBreaker, timeout: float = 3.0):
+    """Run before_call() in a thread; return its result, or None if it is still blocked."""
+    result = []
+    thread = threading.Thread(target=lambda: result.append(breaker.before_call()), daemon=True)
+    thread.start()
+    thread.join(timeout)
+    return result[0] if result else None
+
+
+class CircuitBreakerHalfOpenTest(unittest.TestCase):
+    def test_only_one_probe_after_cooldown(self) -> None:
+        clock = FakeClock()
+        breaker = tripped_breaker(clock)
+        self.assertTrue(breaker.before_call())
+        self.assertIsNone(call_in_thread(breaker, timeout=1.5))
+        breaker.record_success()
+        self.assertFalse(breaker.is_open)
+        self.assertFalse(breaker.before_call())
+
+    def test_failed_probe_reopens_with_doubled_cooldown(self) -> None:
+        clock = FakeClock()
+        breaker = tripped_breaker(clock)
+        self.assertTrue(breaker.before_call())
+        breaker.record_failure()
+        self.assertTrue(breaker.is_open)
+        clock.now += 10.0
+        self.assertIsNone(call_in_thread(breaker, timeout=1.5))
+        clock.now += 10.0
+        self.assertTrue(call_in_thread(breaker))
+
+    def test_released_probe_lets_next_caller_probe(self) -> None:
+        clock = FakeClock()
+        breaker = tripped_breaker(clock)
+        self.assertTrue(breaker.before_call())
+        # The probe's caller raised (e.g. BrokenPipeError) before Codex exited.
+        breaker.release_probe()
+        self.assertTrue(call_in_thread(breaker))
+
+    def test_lost_probe_expires_after_probe_timeout(self) -> None:
+        clock = FakeClock()
+        breaker = tripped_breaker(clock, probe_timeout=60.0)
+        self.assertTrue(breaker.before_call())
+        self.assertIsNone(call_in_thread(breaker, timeout=1.5))
+        clock.now += 60.0
+        self.assertTrue(call_in_thread(breaker))
+
+
+class ClassifyTest(unittest.TestCase):
+    def test_agent_answer_is_not_classified(self) -> None:
+        transcript = (
+            "session id: abc\n"
+            "codex\n"
+            "The quota check returned 429; please log in again if the DNS lookup timed out.\n"
+            "tokens used\n"
+        )
+        self.assertEqual(classify(1, transcript), EXECUTION_ERROR)
+
+    def test_cli_error_lines_are_classified(self) -> None:
+        self.assertEqual(classify(1, "[2025-01-01T00:00:00] ERROR: exceeded retry limit, last status: 429"), RATE_LIMITED)
+        self.assertEqual(classify(1, "codex\nall good\ntokens used\nError: Not logged in"), AUTH)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import sys
+import unittest
+from pathlib import Path
+
+if __package__ is None or __package__ == "":
+    sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from automation.runner import TranscriptScanner
+
+
+class TranscriptScannerTest(unittest.TestCase):
+    def test_last_closed_block_is_the_message(self) -> None:
+        scanner = TranscriptScanner()
+        for line in ("session id: abc\n", "codex\n", "first\n", "codex\n", '{"status": "pass"}\n', "tokens used\n", "1234\n"):
+            scanner.feed(line)
+        self.assertEqual(scanner.session_id, "abc")
+        self.assertEqual(scanner.last_message(), '{"status": "pass"}')
+
+    def test_unclosed_block_is_bounded(self) -> None:
+        scanner = TranscriptScanner(tail_chars=1024, block_chars=1024)
+        scanner.feed("codex\n")
+        for index in range(10_000):
+            scanner.feed(f"line {index:05d}\n")
+        self.assertLessEqual(scanner._block_size, 1024)
+        message = scanner.last_message()
+        self.assertTrue(message.endswith("line 09999"))
+        self.assertNotIn("line 00000", message)
+
+    def test_block_longer_than_the_cap_keeps_its_last_line(self) -> None:
+        scanner = TranscriptScanner(block_chars=16)
+        for line in ("codex\n", "x" * 100 + "\n", "tokens used\n"):
+            scanner.feed(line)
+        self.assertEqual(scanner.last_message(), "x" * 100)
+
+
+if __name__ == "__main__":
+    unittest.main()
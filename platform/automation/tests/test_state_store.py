@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+import sys
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from typing import List
+
+if __package__ is None or __package__ == "":
+    sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from automation.state_store import TASK_COMPLETED, TASK_FAILED, StateStore
+
+
+class StateStoreTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.workspace = Path(self.tmp.name)
+        self.artifacts = self.workspace / "platform" / "automation_artifacts"
+        self.artifacts.mkdir(parents=True)
+        (self.artifacts / "processed_tasks.json").write_text(json.dumps(["T-001", "T-002"]), encoding="utf-8")
+        runs = [
+            {"role": "agent", "agent_label": "tasks/t-001/agent", "session_id": "s-1", "prompt_number": 20},
+            {"role": "agent", "agent_label": "tasks/t-001/agent-retry1", "session_id": "s-2", "prompt_number": 20},
+            {"role": "manager", "agent_label": "tasks/t-001/manager", "prompt_number": 20},
+        ]
+        (self.artifacts / "conversations.jsonl").write_text(
+            "".join(json.dumps(run) + "\n" for run in runs) + "not json\n", encoding="utf-8"
+        )
+        bug_dir = self.workspace / "platform" / "automation_artifacts" / "bugs" / "BUG-1"
+        bug_dir.mkdir(parents=True)
+        (bug_dir / "state.json").write_text(json.dumps({"pending_stage": "triage"}), encoding="utf-8")
+        self.stores: List[StateStore] = []
+
+    def tearDown(self) -> None:
+        for store in self.stores:
+            store.close()
+        self.tmp.cleanup()
+
+    def open(self) -> StateStore:
+        store = StateStore.open(self.artifacts, workspace=self.workspace)
+        self.stores.append(store)
+        return store
+
+    def test_legacy_files_are_imported_once(self) -> None:
+        store = self.open()
+        self.assertEqual(store.task_ids_with_status(TASK_COMPLETED), ["T-001", "T-002"])
+        self.assertEqual(store.last_run_id(), 3)
+        self.assertEqual(store.latest_session(label_prefix="tasks/t-001/agent"), "s-2")
+
+        self.open()
+        self.assertEqual(store.last_run_id(), 3)
+
+    def test_concurrent_first_opens_import_once(self) -> None:
+        errors: List[BaseException] = []
+        barrier = threading.Barrier(6)
+
+        def open_store() -> None:
+            try:
+                barrier.wait()
+                self.open()
+            except BaseException as exc:  # noqa: BLE001 - reported by the assertion below
+                errors.append(exc)
+
+        threads = [threading.Thread(target=open_store) for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+        self.assertEqual(self.stores[0].last_run_id(), 3)
+        self.assertEqual(self.stores[0].task_ids_with_status(TASK_COMPLETED), ["T-001", "T-002"])
+
+    def test_task_lifecycle_and_export(self) -> None:
+        store = self.open()
+        store.set_task_statuses(["T-003", "T-004"], "waiting")
+        store.set_task_status("T-003", TASK_COMPLETED)
+        store.set_task_status("T-004", TASK_FAILED)
+        self.assertEqual(store.task_statuses()["T-004"], TASK_FAILED)
+
+        export = self.artifacts / "processed_tasks.json"
+        store.export_completed_tasks(export)
+        self.assertEqual(json.loads(export.read_text(encoding="utf-8")), ["T-001", "T-002", "T-003"])
+
+    def test_cached_reviews_are_recorded_as_runs(self) -> None:
+        store = self.open()
+        store.record_run({"timestamp": "t", "role": "manager", "agent_label": "tasks/t-005/manager", "cached": True})
+        store.record_run({"timestamp": "t", "role": "manager", "agent_label": "tasks/t-006/manager"})
+        rows = store._query("SELECT agent_label, cached FROM runs WHERE id > 3 ORDER BY id")
+        self.assertEqual([(row["agent_label"], row["cached"]) for row in rows], [
+            ("tasks/t-005/manager", 1),
+            ("tasks/t-006/manager", 0),
+        ])
+
+    def test_runs_table_without_cached_column_is_migrated(self) -> None:
+        path = self.artifacts / StateStore.FILENAME
+        conn = sqlite3.connect(str(path))
+        conn.execute(
+            "CREATE TABLE runs (id INTEGER PRIMARY KEY AUTOINCREMENT, timestamp TEXT NOT NULL, role TEXT NOT NULL, "
+            "prompt_number INTEGER, agent_label TEXT NOT NULL, attempt INTEGER, session_id TEXT, task_id TEXT, "
+            "transcript_path TEXT, last_message_path TEXT)"
+        )
+        conn.execute("INSERT INTO runs (timestamp, role, agent_label) VALUES ('t', 'agent', 'prompts/prompt1/agent')")
+        conn.commit()
+        conn.close()
+
+        store = self.open()
+        store.record_run({"timestamp": "t", "role": "manager", "agent_label": "prompts/prompt1/manager", "cached": True})
+        rows = store._query("SELECT cached FROM runs ORDER BY id")
+        self.assertEqual([row["cached"] for row in rows][:1], [0])
+        self.assertEqual(rows[-1]["cached"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+if __package__ is None or __package__ == "":
+    sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from automation.worktrees import WorktreeManager
+
+
+def git(cwd: Path, *args: str) -> str:
+    return subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True, text=True).stdout
+
+
+@unittest.skipIf(shutil.which("git") is None, "git is not installed")
+class WorktreeRunsTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.workspace = Path(self.tmp.name)
+        git(self.workspace, "init", "-q")
+        git(self.workspace, "config", "user.email", "ci@example.com")
+        git(self.workspace, "config", "user.name", "CI")
+        (self.workspace / "README.md").write_text("base\n", encoding="utf-8")
+        git(self.workspace, "add", "README.md")
+        git(self.workspace, "commit", "-qm", "init")
+        self.artifacts = self.workspace / "platform" / "automation_artifacts"
+        self.artifacts.mkdir(parents=True)
+        # Generated by the primary chain and never committed.
+        (self.workspace / "BACKLOG").mkdir()
+        (self.workspace / "BACKLOG" / "backlog.json").write_text("{}\n", encoding="utf-8")
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def manager(self) -> WorktreeManager:
+        return WorktreeManager(self.workspace, self.artifacts / "worktrees", exclude=[self.artifacts])
+
+    def test_later_runs_keep_tasks_merged_earlier(self) -> None:
+        first = self.manager()
+        worktree = first.create("T-001")
+        self.assertTrue((worktree / "BACKLOG" / "backlog.json").exists())
+        self.assertFalse((worktree / "platform").exists())
+        (worktree / "feature.py").write_text("VALUE = 1\n", encoding="utf-8")
+        first.merge("T-001", message="T-001: feature")
+
+        # Second run: T-001 is already processed; the workspace moved on meanwhile.
+        (self.workspace / "notes.md").write_text("new\n", encoding="utf-8")
+        second = self.manager()
+        worktree = second.create("T-002")
+        self.assertEqual((worktree / "feature.py").read_text(encoding="utf-8"), "VALUE = 1\n")
+        self.assertTrue((worktree / "notes.md").exists())
+        second.merge("T-002", message="T-002: nothing")
+
+        self.assertEqual(git(self.workspace, "status", "--porcelain", "--untracked-files=no"), "")
+        self.assertIn(WorktreeManager.INTEGRATION_BRANCH, git(self.workspace, "branch", "--list", "automation/*"))
+
+
+if __name__ == "__main__":
+    unittest.main()
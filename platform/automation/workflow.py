@@ -25,23 +25,46 @@ import json
 import re
 import subprocess
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, List, Optional, Sequence
+from typing import Collection, Dict, List, Optional, Sequence
 
 if __package__ is None or __package__ == "":
     sys.path.append(str(Path(__file__).resolve().parent.parent))
 
+# Taken before the automation imports so --profile-startup can report their cost.
+_IMPORTS_STARTED = time.perf_counter()
+
 from automation.agents import get_supporting_prompt, load_primary_prompt_specs
 from automation.agents.base import PromptSpec
 from automation.agents.manager import agent as manager_agent
 from automation.agents.qa import agent as qa_agent
+from automation.blob_store import BLOBS_DIR_NAME, BlobStore
+from automation.cache import ValidationCache
 from automation.config import ensure_workspace_paths, parse_args, read_project_idea
+from automation.conversation_log import ConversationLog
+from automation.daemon import SOCKET_NAME, WorkflowDaemon
 from automation.errors import InvalidAgentResponseError, WorkflowError
+from automation.lanes import LaneItem, fair_order
+from automation.liveness import PIDFILE_NAME, Heartbeat
+from automation.manifest import PromptManifest, hash_file
 from automation.parsing import read_agent_output
 from automation.paths import PROJECT_IDEA_FILE, SESSIONS_DIR, BACKLOG_FILE, BUGS_DIR, FEEDBACK_DIR
+from automation.pool import CodexProcessPool
+from automation.profiling import StartupProfiler
+from automation.prompt_budget import PromptAssembler
+from automation.retry import Backoff, CircuitBreaker, RetryPolicy, parse_wait_budgets
 from automation.runner import CodexRunResult, CodexRunner
+from automation.scheduler import DagExecutor, priority_keys
+from automation.state_store import TASK_COMPLETED, TASK_FAILED, TASK_STARTED, TASK_WAITING, StateStore
+from automation.telemetry import Telemetry
 from automation.tasks import TaskEntry
+from automation.worktrees import WorktreeManager
+
+_IMPORTS_FINISHED = time.perf_counter()
 
 
 class Workflow:
@@ -100,11 +123,34 @@ class Workflow:
         "feedbackreview": "feedback_review",
         "feedbackplan": "feedback_plan",
     }
-    def __init__(self, args: argparse.Namespace) -> None:
+    DOC_CHAIN = frozenset(
+        {
+            "Intake PM",
+            "Researcher",
+            "Solution Architect",
+            "API Designer",
+            "UX Designer",
+        }
+    )
+    BUG_STAGE_PROMPTS: Dict[str, str] = {
+        "intake": "bug_intake",
+        "triage": "bug_triage",
+        "repro": "bug_repro",
+    }
+    FEEDBACK_STAGE_PROMPTS: Dict[str, str] = {
+        "intake": "feedback_intake",
+        "review": "feedback_review",
+        "plan": "feedback_plan",
+    }
+
+    def __init__(self, args: argparse.Namespace, *, profiler: Optional[StartupProfiler] = None) -> None:
+        self.profiler = profiler or StartupProfiler.disabled()
         self.workspace = Path(args.workspace).resolve()
-        ensure_workspace_paths(self.workspace)
+        with self.profiler.phase("ensure_workspace_paths"):
+            ensure_workspace_paths(self.workspace)
 
-        self.prompts = list(load_primary_prompt_specs())
+        with self.profiler.phase("prompt_specs"):
+            self.prompts = list(load_primary_prompt_specs())
         if not self.prompts:
             raise WorkflowError("No primary prompt specifications were registered.")
         idea_path = self.workspace / PROJECT_IDEA_FILE
@@ -113,7 +159,8 @@ class Workflow:
             self.project_idea = ""
         else:
             try:
-                self.project_idea = read_project_idea(args, default_path=idea_path)
+                with self.profiler.phase("project_idea"):
+                    self.project_idea = read_project_idea(args, default_path=idea_path)
             except WorkflowError:
                 if args.skip_docs:
                     self.project_idea = ""
@@ -130,14 +177,42 @@ class Workflow:
                 "High reasoning effort is mandatory unless --allow-model-override is provided."
             )
 
+        artifacts_dir = self.workspace / args.artifacts_dir
+        with self.profiler.phase("telemetry"):
+            self.telemetry = Telemetry(
+                None if getattr(args, "no_trace", False) else artifacts_dir / "traces" / "spans.jsonl"
+            )
+        self.metrics_port = getattr(args, "metrics_port", 0) or 0
+        try:
+            wait_budgets = parse_wait_budgets(getattr(args, "retry_wait_budget", None))
+        except ValueError as exc:
+            raise WorkflowError(f"Invalid --retry-wait-budget: {exc}") from exc
+        self.retry_policy = RetryPolicy(
+            backoff=Backoff(
+                base=getattr(args, "retry_backoff_base", 2.0),
+                cap=getattr(args, "retry_backoff_max", 120.0),
+            ),
+            breaker=CircuitBreaker(
+                threshold=getattr(args, "circuit_breaker_threshold", 5),
+                cooldown=getattr(args, "circuit_breaker_cooldown", 60.0),
+            ),
+            wait_budgets=wait_budgets,
+        )
+        with self.profiler.phase("codex_pool"):
+            pool = self._build_codex_pool(args)
         self.runner = CodexRunner(
             workspace=self.workspace,
-            artifacts_dir=(self.workspace / args.artifacts_dir),
+            artifacts_dir=artifacts_dir,
             sandbox=args.sandbox,
             approval_policy=args.approval_policy,
             include_plan=args.include_plan,
             model=selected_model,
             reasoning_effort=args.reasoning_effort,
+            pool=pool,
+            telemetry=self.telemetry,
+            breaker=self.retry_policy.breaker,
+            profiler=self.profiler,
+            transcripts=None if getattr(args, "plain_transcripts", False) else BlobStore(artifacts_dir / BLOBS_DIR_NAME),
         )
         self.manager_model = args.manager_model
         self.skip_devops = getattr(args, "skip_devops", False)
@@ -146,11 +221,26 @@ class Workflow:
         self.skip_backlog = args.skip_backlog
         self.skip_tasks = args.skip_tasks
         self.max_tasks = args.max_tasks
+        self.max_parallel_tasks = max(1, getattr(args, "max_parallel_tasks", 1) or 1)
+        self.schedule_policy = getattr(args, "schedule_policy", "id") or "id"
+        self.max_parallel_stages = max(1, getattr(args, "max_parallel_stages", 1) or 1)
+        self.bug_concurrency = max(1, getattr(args, "bug_concurrency", 1) or 1)
+        self.feedback_concurrency = max(1, getattr(args, "feedback_concurrency", 1) or 1)
+        self.lane_fairness = getattr(args, "lane_fairness", "round-robin") or "round-robin"
+        self.worktrees: Optional[WorktreeManager] = None
+        if getattr(args, "task_isolation", "shared") == "worktree":
+            self.worktrees = WorktreeManager(
+                workspace=self.workspace,
+                root=self.runner.artifacts_dir / "worktrees",
+                exclude=[self.runner.artifacts_dir],
+            )
         self.reprocess_tasks = args.reprocess_tasks
         self.agent_retry_limit = max(0, args.agent_retries)
         self.manager_retry_limit = max(0, getattr(args, "manager_retries", 0))
         self.qa_retry_limit = max(0, getattr(args, "qa_retries", 0))
         self.smoke_test = args.smoke_test
+        self.daemon = getattr(args, "daemon", False)
+        self.daemon_poll_interval = getattr(args, "daemon_poll_interval", 2.0)
         self.smoke_path = Path(args.smoke_path)
         self.force_devops = getattr(args, "force_devops", False)
         self.force_docs = args.force_docs
@@ -158,76 +248,192 @@ class Workflow:
         self.force_backlog = args.force_backlog
         self.mvp_mode = args.mvp_mode
 
-        self.tasks_state_path = self.runner.artifacts_dir / "processed_tasks.json"
-        self.processed_tasks = self._load_processed_tasks()
+        self._state_lock = threading.Lock()
+        with self.profiler.phase("caches"):
+            self.prompt_manifest = PromptManifest(
+                self.runner.artifacts_dir / "cache" / "prompt_manifest.json",
+                workspace=self.workspace,
+            )
+            self.prompt_assembler = PromptAssembler(max_bytes=getattr(args, "retry_prompt_max_bytes", 0) or 0)
+            self.validation_cache = ValidationCache(
+                self.runner.artifacts_dir / "cache" / "manager_validation.json",
+                ttl_seconds=getattr(args, "validation_cache_ttl_hours", 168.0) * 3600,
+                max_entries=getattr(args, "validation_cache_max_entries", 500),
+            )
+        with self.profiler.phase("state_store"):
+            self.state_store = StateStore.open(self.runner.artifacts_dir, workspace=self.workspace)
+            # The store is the source of truth; processed_tasks.json is only exported for older tooling.
+            self.tasks_state_path = self.runner.artifacts_dir / "processed_tasks.json"
+            self.processed_tasks = set(self.state_store.task_ids_with_status(TASK_COMPLETED))
         self._bootstrap_processed_tasks()
         self.conversation_log_path = self.runner.artifacts_dir / "conversations.jsonl"
+        self.conversation_log = ConversationLog(self.conversation_log_path)
+        self.heartbeat = Heartbeat(self.runner.artifacts_dir / PIDFILE_NAME)
         self.bugs_dir = self.workspace / BUGS_DIR
         self.feedback_dir = self.workspace / FEEDBACK_DIR
 
-    def _load_processed_tasks(self) -> set[str]:
-        if self.tasks_state_path.exists():
-            try:
-                data = json.loads(self.tasks_state_path.read_text(encoding="utf-8"))
-                return set(data)
-            except json.JSONDecodeError:
-                print(f"[warn] Could not parse {self.tasks_state_path}, starting fresh.")
-        return set()
-
-    def _save_processed_tasks(self) -> None:
-        self.tasks_state_path.parent.mkdir(parents=True, exist_ok=True)
-        with self.tasks_state_path.open("w", encoding="utf-8") as handle:
-            json.dump(sorted(self.processed_tasks), handle, indent=2)
-
     def _bootstrap_processed_tasks(self) -> None:
         # No-op bootstrap; processed tasks persist via automation_artifacts.
         return
 
+    @staticmethod
+    def _build_codex_pool(args: argparse.Namespace) -> Optional[CodexProcessPool]:
+        size = max(0, getattr(args, "codex_pool_size", 0) or 0)
+        if size == 0:
+            return None
+        return CodexProcessPool(size, idle_timeout=getattr(args, "codex_pool_idle_timeout", 300.0))
+
     def run(self) -> None:
+        if self.metrics_port:
+            self.telemetry.serve(self.metrics_port)
         try:
-            if self.smoke_test:
-                self._run_smoke_test()
-                return
-            self._run_primary_chain()
-            self._run_bug_pipeline()
-            self._run_feedback_pipeline()
-            if not self.skip_tasks:
-                self._run_task_loop()
+            with self.heartbeat, self.telemetry.span("workflow.run"):
+                if self.smoke_test:
+                    self._run_smoke_test()
+                    return
+                with self.profiler.phase("primary_chain"):
+                    self._run_primary_chain()
+                if self.daemon:
+                    self.profiler.finish("the daemon started watching for changes")
+                    WorkflowDaemon(
+                        self,
+                        socket_path=self.runner.artifacts_dir / SOCKET_NAME,
+                        poll_interval=self.daemon_poll_interval,
+                    ).serve_forever()
+                else:
+                    self._run_lanes()
         except subprocess.CalledProcessError as exc:
             raise WorkflowError(f"Codex command failed with exit code {exc.returncode}") from exc
+        finally:
+            self.profiler.finish("the end of the run (no Codex call was made)")
+            if self.worktrees is not None:
+                self.worktrees.report()
+            if self.runner.pool is not None:
+                self.runner.pool.close()
+            self.telemetry.close()
+
+    def _run_lanes(self) -> None:
+        # Bugs, feedback and backlog tasks are independent queues; running them
+        # side by side keeps a burst of reports from holding up feature work.
+        lanes = {"bugs": self._run_bug_pipeline, "feedback": self._run_feedback_pipeline}
+        if not self.skip_tasks:
+            lanes["tasks"] = self._run_task_loop
+
+        def run_lane(name: str) -> None:
+            with self.telemetry.span("lane", lane=name), self.profiler.phase(f"lane.{name}"):
+                lanes[name]()
+
+        failure: Optional[BaseException] = None
+        with ThreadPoolExecutor(max_workers=len(lanes), thread_name_prefix="lane") as pool:
+            futures = {pool.submit(run_lane, name): name for name in lanes}
+            for future in as_completed(futures):
+                exc = future.exception()
+                if exc is not None:
+                    print(f"[lanes] The {futures[future]} lane stopped with an error: {exc}")
+                    if failure is None:
+                        failure = exc
+        if failure is not None:
+            raise failure
+
+    def _lane_item(self, item_dir: Path) -> LaneItem:
+        submission = self._read_json(item_dir / "submission.json") or {}
+        state = self._read_json(item_dir / "state.json") or {}
+        reporter = submission.get("reporter") if isinstance(submission.get("reporter"), dict) else {}
+        group = reporter.get("id") or submission.get("chat_id") or ""
+        submitted_at = state.get("last_submission_at") or submission.get("submitted_at") or ""
+        return LaneItem(key=item_dir.name, group=str(group), submitted_at=str(submitted_at))
+
+    def _annotate_span(self, **attributes) -> None:
+        span = self.telemetry.current()
+        if span is not None:
+            span.set(**attributes)
+
+    def _count_retry(self, role: str, cause: str) -> None:
+        span = self.telemetry.current()
+        prompt_number = span.attributes.get("prompt_number", "") if span is not None else ""
+        self.telemetry.count(
+            "workflow_retries_total",
+            help="Retries by the role that is rerun and the reason.",
+            role=role,
+            cause=cause,
+            prompt_number=prompt_number,
+        )
+        if span is not None:
+            causes = span.attributes.get("retry_causes")
+            span.set(retry_causes=f"{causes},{cause}" if causes else cause)
 
     def _run_primary_chain(self) -> None:
-        DOC_CHAIN = {
-            "Intake PM",
-            "Researcher",
-            "Solution Architect",
-            "API Designer",
-            "UX Designer",
-        }
+        # Stages start as soon as the stages they read from have settled; with
+        # --max-parallel-stages > 1 independent stages and their validations overlap.
+        producers = {path: spec.number for spec in self.prompts for path in spec.deliverables}
         for spec in self.prompts:
-            if spec.name in DOC_CHAIN and self.skip_docs:
-                continue
-            if spec.name == "Planner" and (self.skip_backlog or self.skip_roadmap):
-                continue
-            if spec.name == "Scaffolder" and self.skip_devops:
-                continue
+            undeclared = sorted(
+                {producers[path] for path in spec.inputs if path in producers} - set(spec.depends_on)
+            )
+            if undeclared:
+                raise WorkflowError(
+                    f"{spec.name} reads deliverables of prompts {undeclared} without depending on them."
+                )
+        specs = {str(spec.number): spec for spec in self.prompts}
+        dependencies = {
+            key: [str(dep) for dep in spec.depends_on] for key, spec in specs.items()
+        }
+        executor = DagExecutor(self.max_parallel_stages)
+        executor.run(
+            list(specs),
+            dependencies,
+            lambda key: self._run_traced_stage(specs[key]),
+        )
+
+    def _run_traced_stage(self, spec: PromptSpec) -> None:
+        with self.telemetry.span("stage", prompt_number=spec.number, stage=spec.name):
+            self._run_primary_stage(spec)
 
-            force = False
-            if spec.name in DOC_CHAIN:
-                force = self.force_docs
-            elif spec.name == "Planner":
-                force = self.force_backlog or self.force_roadmap
-            elif spec.name == "Scaffolder":
-                force = self.force_devops
+    def _run_primary_stage(self, spec: PromptSpec) -> None:
+        if spec.name in self.DOC_CHAIN and self.skip_docs:
+            self._annotate_span(outcome="skipped")
+            return
+        if spec.name == "Planner" and (self.skip_backlog or self.skip_roadmap):
+            self._annotate_span(outcome="skipped")
+            return
+        if spec.name == "Scaffolder" and self.skip_devops:
+            self._annotate_span(outcome="skipped")
+            return
 
-            if not force and self._deliverables_have_content(spec.deliverables):
+        force = False
+        if spec.name in self.DOC_CHAIN:
+            force = self.force_docs
+        elif spec.name == "Planner":
+            force = self.force_backlog or self.force_roadmap
+        elif spec.name == "Scaffolder":
+            force = self.force_devops
+
+        context = self._build_context_for_spec(spec)
+        fingerprint = self.prompt_manifest.fingerprint(
+            spec,
+            inputs=spec.inputs,
+            context=context,
+        )
+        if not force and self._deliverables_have_content(spec.deliverables):
+            if not self.prompt_manifest.has_record(spec):
+                # Deliverables predate the manifest: adopt them as the baseline.
+                self.prompt_manifest.record(spec, fingerprint)
+                print(f"[skip] {spec.name} deliverables already populated; recorded manifest baseline.")
+                self._annotate_span(outcome="adopted")
+                return
+            reason = self.prompt_manifest.stale_reason(spec, fingerprint)
+            if reason is None:
                 print(
-                    f"[skip] {spec.name} deliverables already populated; use force flag to regenerate."
+                    f"[skip] {spec.name} is up to date with its inputs; use force flag to regenerate."
                 )
-                continue
+                self._annotate_span(outcome="up_to_date")
+                return
+            print(f"[rebuild] {spec.name} is stale ({reason}).")
+            self._annotate_span(stale_reason=reason)
 
-            context = self._build_context_for_spec(spec)
-            self._run_prompt(spec=spec, context=context)
+        self._annotate_span(outcome="ran")
+        self._run_prompt(spec=spec, context=context)
+        self.prompt_manifest.record(spec, fingerprint)
 
     def _run_prompt(self, *, spec: PromptSpec, context: str = "") -> None:
         prompt_text = self._get_prompt_text(spec=spec, context=context)
@@ -257,6 +463,7 @@ class Workflow:
         resume_session: Optional[str] = None,
         qa_review: Optional[dict] = None,
         qa_report_path: Optional[Path] = None,
+        workdir: Optional[Path] = None,
     ) -> tuple[dict, CodexRunResult]:
         label = (
             label_base
@@ -278,14 +485,48 @@ class Workflow:
             task_source=task_source,
             qa_review=qa_review,
             qa_report_path=qa_report_path,
-            workspace=self.workspace,
+            workspace=workdir or self.workspace,
         )
 
+        cache_key = self._validation_cache_key(spec, manager_prompt, workdir=workdir)
+        if cache_key:
+            cached_review = self.validation_cache.get(cache_key)
+            if cached_review is not None:
+                print(
+                    f"[manager] Reusing cached passing review for {label}; deliverables are unchanged."
+                )
+                self._annotate_span(cache_hit=True)
+                last_message_path = self.runner.artifacts_dir / f"{label}.txt"
+                last_message_path.parent.mkdir(parents=True, exist_ok=True)
+                last_message_path.write_text(json.dumps(cached_review, indent=2), encoding="utf-8")
+                cached_result = CodexRunResult(
+                    label=label,
+                    last_message_path=last_message_path,
+                    transcript_path=self.runner.artifacts_dir / f"{label}.log",
+                    session_id=None,
+                )
+                self._record_conversation(
+                    result=cached_result,
+                    role="manager",
+                    spec=spec,
+                    attempt=attempt,
+                    agent_label=label_base,
+                    task_id=task_id,
+                    cached=True,
+                )
+                self.telemetry.count(
+                    "workflow_validation_cache_hits_total",
+                    help="Manager reviews answered from the validation cache instead of a Codex run.",
+                    prompt_number=spec.number,
+                )
+                return cached_review, cached_result
+
         manager_result = self.runner.run(
             manager_prompt,
             label=label,
             model_override=self.manager_model,
             resume_session=resume_session,
+            workdir=workdir,
         )
         self._record_conversation(
             result=manager_result,
@@ -301,8 +542,35 @@ class Workflow:
         except InvalidAgentResponseError as exc:
             exc.result = manager_result
             raise
+        if cache_key and (review.get("status") or "").lower() == "pass":
+            self.validation_cache.put(cache_key, review, spec=spec.name)
         return review, manager_result
 
+    def _validation_cache_key(
+        self,
+        spec: PromptSpec,
+        manager_prompt: str,
+        *,
+        workdir: Optional[Path] = None,
+    ) -> Optional[str]:
+        # Reviews of specs without deliverables depend on the whole tree, so only
+        # specs whose output is fully described by their deliverables are cached.
+        if not spec.deliverables or not self.validation_cache.enabled:
+            return None
+        root = workdir or self.workspace
+        hashes: Dict[str, str] = {}
+        for path in spec.deliverables:
+            digest = hash_file(root / path)
+            if digest is None:
+                return None
+            hashes[str(path)] = digest
+        return ValidationCache.make_key(
+            spec=spec.name,
+            prompt=manager_prompt,
+            model=self.manager_model or self.runner.model,
+            deliverables=hashes,
+        )
+
     def _run_qa_review(
         self,
         *,
@@ -315,6 +583,7 @@ class Workflow:
         task_dir: Path,
         resume_session: Optional[str],
         context_notes: Optional[str],
+        workdir: Optional[Path] = None,
     ) -> tuple[dict, CodexRunResult]:
         label = (
             label_base if attempt == 1 else f"{label_base}-retry{attempt-1}"
@@ -327,7 +596,7 @@ class Workflow:
             tracker_path=task_source,
             report_path=report_path,
             task_dir=task_dir,
-            workspace=self.workspace,
+            workspace=workdir or self.workspace,
             agent_prompt=agent_prompt,
             context_notes=context_notes,
         )
@@ -337,6 +606,7 @@ class Workflow:
             label=label,
             model_override=self.manager_model,
             resume_session=resume_session,
+            workdir=workdir,
         )
         self._record_conversation(
             result=qa_result,
@@ -366,32 +636,42 @@ class Workflow:
         resume_session: Optional[str],
         qa_review: Optional[dict],
         qa_report_path: Optional[Path],
+        workdir: Optional[Path] = None,
     ) -> tuple[dict, CodexRunResult]:
         session = resume_session
         max_attempts = self.manager_retry_limit + 1
+        retry_budget = self.retry_policy.budget("manager")
         for retry_index in range(max_attempts):
             try:
-                review, result = self._run_manager_validation(
-                    spec=spec,
-                    original_prompt=original_prompt,
-                    attempt=attempt,
-                    label_base=label_base,
-                    task_id=task_id,
-                    task_source=task_source,
-                    resume_session=session,
-                    qa_review=qa_review,
-                    qa_report_path=qa_report_path,
-                )
+                with self.telemetry.span("manager.review", role="manager", attempt=attempt, retry=retry_index):
+                    review, result = self._run_manager_validation(
+                        spec=spec,
+                        original_prompt=original_prompt,
+                        attempt=attempt,
+                        label_base=label_base,
+                        task_id=task_id,
+                        task_source=task_source,
+                        resume_session=session,
+                        qa_review=qa_review,
+                        qa_report_path=qa_report_path,
+                        workdir=workdir,
+                    )
+                    self._annotate_span(status=(review.get("status") or "").lower())
                 return review, result
             except subprocess.CalledProcessError as exc:
                 attempt_count = retry_index + 1
-                if attempt_count >= max_attempts:
+                decision = retry_budget.on_failure(exc)
+                if attempt_count >= max_attempts or not decision.retry:
+                    reason = f" ({decision.reason})" if decision.reason else ""
                     raise WorkflowError(
-                        f"Manager validation failed for {label_base} on attempt {attempt} after {attempt_count} execution error(s)."
+                        f"Manager validation failed for {label_base} on attempt {attempt} after {attempt_count} execution error(s){reason}."
                     ) from exc
                 print(
-                    f"[manager] Execution error for {label_base} (attempt {attempt}, retry {attempt_count}/{max_attempts}). Retrying."
+                    f"[manager] Execution error ({decision.cause}) for {label_base} (attempt {attempt}, "
+                    f"retry {attempt_count}/{max_attempts}). Retrying in {decision.delay:.1f}s."
                 )
+                self._count_retry("manager", decision.cause)
+                retry_budget.wait(decision)
                 session = None
             except InvalidAgentResponseError as exc:
                 attempt_count = retry_index + 1
@@ -406,6 +686,7 @@ class Workflow:
                     f"[manager] Non-JSON response for {label_base} (attempt {attempt}). Raw output saved at {display_path}. "
                     f"Retry {attempt_count}/{max_attempts}."
                 )
+                self._count_retry("manager", "invalid_json")
                 session = exc.result.session_id if getattr(exc, "result", None) else None
         # Should not reach here
         raise WorkflowError(f"Manager validation exhausted retries for {label_base} (attempt {attempt}).")
@@ -422,33 +703,43 @@ class Workflow:
         task_dir: Path,
         resume_session: Optional[str],
         context_notes: Optional[str],
+        workdir: Optional[Path] = None,
     ) -> tuple[dict, CodexRunResult, int]:
         session = resume_session
         max_attempts = self.qa_retry_limit + 1
+        retry_budget = self.retry_policy.budget("qa")
         for retry_index in range(max_attempts):
             current_attempt = attempt if retry_index == 0 else attempt + retry_index
             try:
-                review, result = self._run_qa_review(
-                    spec=spec,
-                    task_id=task_id,
-                    task_source=task_source,
-                    agent_prompt=agent_prompt,
-                    label_base=label_base,
-                    attempt=current_attempt,
-                    task_dir=task_dir,
-                    resume_session=session,
-                    context_notes=context_notes,
-                )
+                with self.telemetry.span("qa.review", role="qa", attempt=current_attempt, retry=retry_index):
+                    review, result = self._run_qa_review(
+                        spec=spec,
+                        task_id=task_id,
+                        task_source=task_source,
+                        agent_prompt=agent_prompt,
+                        label_base=label_base,
+                        attempt=current_attempt,
+                        task_dir=task_dir,
+                        resume_session=session,
+                        context_notes=context_notes,
+                        workdir=workdir,
+                    )
+                    self._annotate_span(status=(review.get("status") or "").lower())
                 return review, result, current_attempt
             except subprocess.CalledProcessError as exc:
                 attempt_count = retry_index + 1
-                if attempt_count >= max_attempts:
+                decision = retry_budget.on_failure(exc)
+                if attempt_count >= max_attempts or not decision.retry:
+                    reason = f" ({decision.reason})" if decision.reason else ""
                     raise WorkflowError(
-                        f"QA validation failed for {label_base} on attempt {current_attempt} after {attempt_count} execution error(s)."
+                        f"QA validation failed for {label_base} on attempt {current_attempt} after {attempt_count} execution error(s){reason}."
                     ) from exc
                 print(
-                    f"[qa] Execution error for {label_base} (attempt {current_attempt}, retry {attempt_count}/{max_attempts}). Retrying."
+                    f"[qa] Execution error ({decision.cause}) for {label_base} (attempt {current_attempt}, "
+                    f"retry {attempt_count}/{max_attempts}). Retrying in {decision.delay:.1f}s."
                 )
+                self._count_retry("qa", decision.cause)
+                retry_budget.wait(decision)
                 session = None
             except InvalidAgentResponseError as exc:
                 attempt_count = retry_index + 1
@@ -463,6 +754,7 @@ class Workflow:
                     f"[qa] Non-JSON response for {label_base} (attempt {current_attempt}). Raw output saved at {display_path}. "
                     f"Retry {attempt_count}/{max_attempts}."
                 )
+                self._count_retry("qa", "invalid_json")
                 session = exc.result.session_id if getattr(exc, "result", None) else None
         raise WorkflowError(f"QA validation exhausted retries for {label_base} (attempt {attempt}).")
 
@@ -478,9 +770,10 @@ class Workflow:
         if missing:
             raise WorkflowError(f"Expected deliverables were not created: {missing}")
 
-    def _deliverables_have_content(self, deliverables: Sequence[Path]) -> bool:
+    def _deliverables_have_content(self, deliverables: Sequence[Path], *, root: Optional[Path] = None) -> bool:
+        # ``root`` is the task's worktree in worktree mode; deliverables are checked where the agent wrote them.
         for rel_path in deliverables:
-            path = self.workspace / rel_path
+            path = (root or self.workspace) / rel_path
             if not path.exists():
                 return False
             if not path.read_text(encoding="utf-8").strip():
@@ -514,20 +807,68 @@ class Workflow:
         task_dir: Optional[Path] = None,
         enable_qa: bool = False,
         qa_label: Optional[str] = None,
+        workdir: Optional[Path] = None,
     ) -> None:
-        prompt_text = initial_prompt
+        # The first manager (and QA) review starts a fresh session once the
+        # agent turn finishes; boot its Codex process while the agent works and
+        # keep it from the idle reaper until the flow is over.
+        self.runner.prewarm(model_override=self.manager_model, workdir=workdir)
+        try:
+            self._run_agent_turns(
+                spec=spec,
+                initial_prompt=initial_prompt,
+                agent_label=agent_label,
+                manager_label=manager_label,
+                task_id=task_id,
+                task_source=task_source,
+                task_dir=task_dir,
+                enable_qa=enable_qa,
+                qa_label=qa_label,
+                workdir=workdir,
+            )
+        finally:
+            self.runner.release_prewarm(model_override=self.manager_model, workdir=workdir)
+
+    def _run_agent_turns(
+        self,
+        *,
+        spec: PromptSpec,
+        initial_prompt: str,
+        agent_label: str,
+        manager_label: str,
+        task_id: Optional[str],
+        task_source: Optional[Path],
+        task_dir: Optional[Path],
+        enable_qa: bool,
+        qa_label: Optional[str],
+        workdir: Optional[Path],
+    ) -> None:
+        # Follow-up instructions for the next turn; the prompt is composed right
+        # before the run so a failed resume falls back to the full instructions.
+        followup: Optional[str] = None
         agent_session: Optional[str] = None
         report_path = task_dir / "agent-report.md" if task_dir else None
 
         max_agent_attempts = self.agent_retry_limit + 1
+        retry_budget = self.retry_policy.budget("agent")
         for attempt in range(1, max_agent_attempts + 1):
             suffix = "" if attempt == 1 else f"-retry{attempt-1}"
-            try:
-                agent_result = self.runner.run(
-                    prompt_text,
-                    label=f"{agent_label}{suffix}",
+            prompt_text = initial_prompt
+            if followup is not None:
+                prompt_text = self._compose_followup_prompt(
+                    followup,
+                    original_prompt=initial_prompt,
                     resume_session=agent_session,
+                    label=f"{agent_label}{suffix}",
                 )
+            try:
+                with self.telemetry.span("agent.turn", role="agent", attempt=attempt, label=agent_label):
+                    agent_result = self.runner.run(
+                        prompt_text,
+                        label=f"{agent_label}{suffix}",
+                        resume_session=agent_session,
+                        workdir=workdir,
+                    )
                 self._record_conversation(
                     result=agent_result,
                     role="agent",
@@ -537,18 +878,23 @@ class Workflow:
                     task_id=task_id,
                 )
             except subprocess.CalledProcessError as exc:
-                if attempt == max_agent_attempts:
+                decision = retry_budget.on_failure(exc)
+                if attempt == max_agent_attempts or not decision.retry:
+                    reason = f" ({decision.reason})" if decision.reason else ""
                     raise WorkflowError(
-                        f"Agent execution failed for {agent_label} after {attempt} attempt(s)."
+                        f"Agent execution failed for {agent_label} after {attempt} attempt(s){reason}."
                     ) from exc
                 print(
-                    f"[agent] Execution error for {agent_label} (attempt {attempt}/{max_agent_attempts}). Retrying."
+                    f"[agent] Execution error ({decision.cause}) for {agent_label} "
+                    f"(attempt {attempt}/{max_agent_attempts}). Retrying in {decision.delay:.1f}s."
                 )
+                self._count_retry("agent", decision.cause)
+                retry_budget.wait(decision)
                 agent_session = None
                 continue
             agent_session = agent_result.session_id
 
-            missing_deliverables = self._missing_deliverables(spec.deliverables)
+            missing_deliverables = self._missing_deliverables(spec.deliverables, root=workdir)
             if missing_deliverables:
                 deliverable_text = ", ".join(str(path) for path in missing_deliverables)
                 print(
@@ -559,10 +905,8 @@ class Workflow:
                     print(
                         "[warn] Agent session id unavailable; follow-up prompt will start a new session."
                     )
-                prompt_text = self._build_missing_deliverables_prompt(
-                    original_prompt=initial_prompt,
-                    missing=missing_deliverables,
-                )
+                followup = self._build_missing_deliverables_prompt(missing=missing_deliverables)
+                self._count_retry("agent", "missing_deliverables")
                 continue
 
             qa_review: Optional[dict] = None
@@ -579,6 +923,7 @@ class Workflow:
                     task_dir=task_dir,
                     resume_session=None,
                     context_notes=None,
+                    workdir=workdir,
                 )
                 qa_session = qa_result.session_id
                 qa_status = (qa_review.get("status") or "").lower()
@@ -587,15 +932,13 @@ class Workflow:
                     print(
                         f"[qa] Validation failed for {qa_label}. Issues: {issues}"
                     )
+                    self._count_retry("agent", "qa_rejected")
                     agent_session = agent_result.session_id
                     if not agent_session:
                         print(
                             "[warn] Agent session id unavailable; retry will start a new conversation."
                         )
-                    prompt_text = self._build_retry_prompt(
-                        original_prompt=initial_prompt,
-                        issues=issues,
-                    )
+                    followup = self._build_retry_prompt(issues=issues)
                     continue
 
             manager_attempt = 1
@@ -614,6 +957,7 @@ class Workflow:
                     resume_session=manager_session,
                     qa_review=current_qa_review,
                     qa_report_path=report_path if report_path and report_path.exists() else None,
+                    workdir=workdir,
                 )
                 manager_session = manager_result.session_id
 
@@ -634,10 +978,8 @@ class Workflow:
                                 print(
                                     "[warn] Agent session id unavailable; retry will start a new conversation."
                                 )
-                            prompt_text = self._build_retry_prompt(
-                                original_prompt=initial_prompt,
-                                issues=planner_violations,
-                            )
+                            followup = self._build_retry_prompt(issues=planner_violations)
+                            self._count_retry("agent", "planner_constraints")
                             break
 
                     print(
@@ -659,6 +1001,7 @@ class Workflow:
                 )
 
                 if next_actor == "qa" and enable_qa and task_id and task_source and qa_label and task_dir:
+                    self._count_retry("qa", "manager_requested_qa")
                     qa_follow_counter += 1
                     qa_review, qa_result, qa_follow_counter = self._perform_qa_review_with_retries(
                         spec=spec,
@@ -670,6 +1013,7 @@ class Workflow:
                         task_dir=task_dir,
                         resume_session=qa_session,
                         context_notes=manager_agent.format_issue_list(issues),
+                        workdir=workdir,
                     )
                     qa_session = qa_result.session_id
                     qa_status = (qa_review.get("status") or "").lower()
@@ -680,10 +1024,8 @@ class Workflow:
                             print(
                                 "[warn] Agent session id unavailable; retry will start a new conversation."
                             )
-                        prompt_text = self._build_retry_prompt(
-                            original_prompt=initial_prompt,
-                            issues=issues,
-                        )
+                        followup = self._build_retry_prompt(issues=issues)
+                        self._count_retry("agent", "qa_rejected")
                         break
                     current_qa_review = qa_review
                     manager_attempt += 1
@@ -694,28 +1036,43 @@ class Workflow:
                     print(
                         "[warn] Agent session id unavailable; retry will start a new conversation."
                     )
-                prompt_text = self._build_retry_prompt(
-                    original_prompt=initial_prompt,
-                    issues=issues,
-                )
+                followup = self._build_retry_prompt(issues=issues)
+                self._count_retry("agent", "manager_rejected")
                 break
 
     @staticmethod
-    def _build_retry_prompt(
-        *,
-        original_prompt: str,
-        issues: Sequence[str],
-    ) -> str:
+    def _build_retry_prompt(*, issues: Sequence[str]) -> str:
         issue_lines = "\n".join(f"- {issue}" for issue in issues) or "- No details provided."
         return (
             "The quality assurance manager reported the following issues:\n"
             f"{issue_lines}\n\n"
-            "Please correct the deliverables so they fully satisfy the original instructions below. "
-            "Regenerate the complete content rather than incremental edits.\n\n"
-            "Original instructions:\n"
-            f"{original_prompt}"
+            "Please correct the deliverables so they fully satisfy the original instructions. "
+            "Regenerate the complete content rather than incremental edits."
         )
 
+    def _compose_followup_prompt(
+        self,
+        delta: str,
+        *,
+        original_prompt: str,
+        resume_session: Optional[str],
+        label: str,
+    ) -> str:
+        prompt = self.prompt_assembler.followup(delta, original_prompt, resume_session=resume_session)
+        if prompt.saved_bytes:
+            reason = "session resumed" if prompt.resumed else "prompt budget"
+            print(
+                f"[prompt] {label}: sending {prompt.sent_bytes} bytes instead of {prompt.full_bytes} "
+                f"({prompt.saved_bytes} saved, {reason})."
+            )
+            self.telemetry.count(
+                "workflow_prompt_bytes_saved_total",
+                prompt.saved_bytes,
+                help="Follow-up prompt bytes not sent thanks to session resumes and the prompt budget.",
+                reason="resumed" if prompt.resumed else "budget",
+            )
+        return prompt.text
+
     def _run_smoke_test(self) -> None:
         target_relative = self.smoke_path
         target_path = (self.workspace / target_relative).resolve()
@@ -726,7 +1083,7 @@ class Workflow:
         spec = PromptSpec(
             number=0,
             name="Smoke Test",
-            template="",
+            template_path=None,
             deliverables=[target_relative],
         )
         instruction = (
@@ -746,7 +1103,6 @@ class Workflow:
             agent_label="smoke-test-agent",
         )
         session = result.session_id
-        prompt_text = instruction
 
         for retry in range(1, self.agent_retry_limit + 1):
             pending = self._missing_deliverables(spec.deliverables)
@@ -756,11 +1112,13 @@ class Workflow:
                 print(
                     "[warn] Smoke test agent session unavailable; follow-up will start a new session."
                 )
-            prompt_text = self._build_missing_deliverables_prompt(
+            suffix = f"-retry{retry}"
+            prompt_text = self._compose_followup_prompt(
+                self._build_missing_deliverables_prompt(missing=pending),
                 original_prompt=instruction,
-                missing=pending,
+                resume_session=session,
+                label=f"smoke-test-agent{suffix}",
             )
-            suffix = f"-retry{retry}"
             result = self.runner.run(
                 prompt_text,
                 label=f"smoke-test-agent{suffix}",
@@ -839,7 +1197,8 @@ class Workflow:
                     "Backlog tasks are not in chronological order. "
                     f"Expected sequential ids [{formatted_expected}] but found [{formatted_found}]."
                 )
-        return self._topologically_sort(entries)
+        with self.profiler.phase("topo_sort"):
+            return self._topologically_sort(entries)
 
     def _topologically_sort(self, tasks: List[TaskEntry]) -> List[TaskEntry]:
         index = {task.task_id: task for task in tasks}
@@ -855,16 +1214,21 @@ class Workflow:
                 indegree[task.task_id] += 1
                 adjacency[dep].append(task.task_id)
 
-        ready = [task_id for task_id, degree in indegree.items() if degree == 0]
+        priority = priority_keys(
+            {task.task_id: task.deps for task in tasks},
+            {task.task_id: task.estimate_points for task in tasks},
+            self.schedule_policy,
+        )
+        ready = [(priority[task_id], task_id) for task_id, degree in indegree.items() if degree == 0]
         heapq.heapify(ready)
         ordered_ids: List[str] = []
         while ready:
-            current = heapq.heappop(ready)
+            _, current = heapq.heappop(ready)
             ordered_ids.append(current)
             for neighbor in adjacency[current]:
                 indegree[neighbor] -= 1
                 if indegree[neighbor] == 0:
-                    heapq.heappush(ready, neighbor)
+                    heapq.heappush(ready, (priority[neighbor], neighbor))
 
         if len(ordered_ids) != len(tasks):
             unresolved = [task_id for task_id, degree in indegree.items() if degree > 0]
@@ -908,7 +1272,7 @@ class Workflow:
         # Resource planner support removed; keep hook for future validation logic.
         return []
 
-    def _run_bug_pipeline(self) -> None:
+    def _run_bug_pipeline(self, only: Optional[Collection[str]] = None) -> None:
         bugs_dir = self.bugs_dir
         if not bugs_dir.exists():
             return
@@ -916,58 +1280,75 @@ class Workflow:
         backlog_path = self.workspace / BACKLOG_FILE
         backlog_data = self._read_json(backlog_path) if backlog_path.exists() else None
 
-        stage_to_prompt = {
-            "intake": "bug_intake",
-            "triage": "bug_triage",
-            "repro": "bug_repro",
+        item_dirs = {
+            path.name: path
+            for path in bugs_dir.iterdir()
+            if path.is_dir() and (only is None or path.name in only)
         }
+        order = fair_order(
+            [self._lane_item(path) for _, path in sorted(item_dirs.items())],
+            self.lane_fairness,
+        )
+        # Items run side by side up to the lane limit; each one walks its own
+        # stages in order on a single worker.
+        DagExecutor(self.bug_concurrency).run(
+            order,
+            {},
+            lambda name: self._advance_bug(item_dirs[name], backlog_data),
+        )
 
-        for bug_dir in sorted(p for p in bugs_dir.iterdir() if p.is_dir()):
-            state = self._load_bug_state(bug_dir)
-            bug_id = state.get("bug_id") or bug_dir.name
-            state["bug_id"] = bug_id
+    def _advance_bug(self, bug_dir: Path, backlog_data: Optional[dict]) -> None:
+        while self._run_bug_stage(bug_dir, backlog_data):
+            pass
 
-            state_path = bug_dir / "state.json"
-            if not state_path.exists():
-                self._save_bug_state(bug_dir, state)
+    def _run_bug_stage(self, bug_dir: Path, backlog_data: Optional[dict]) -> bool:
+        """Run the pending stage of one bug item; return True when it moved to another stage."""
+        state = self._load_bug_state(bug_dir)
+        bug_id = state.get("bug_id") or bug_dir.name
+        state["bug_id"] = bug_id
 
-            pending_stage = state.get("pending_stage") or "intake"
-            if pending_stage == "done":
-                continue
-            if state.get("awaiting_human"):
-                continue
+        state_path = bug_dir / "state.json"
+        if not state_path.exists():
+            self._save_bug_state(bug_dir, state)
 
-            prompt_key = stage_to_prompt.get(pending_stage)
-            if not prompt_key:
-                print(f"[bugs] Unknown pending stage '{pending_stage}' for bug {bug_id}; skipping.")
-                continue
+        pending_stage = state.get("pending_stage") or "intake"
+        if pending_stage == "done":
+            return False
+        if state.get("awaiting_human"):
+            return False
 
-            try:
-                spec = get_supporting_prompt(prompt_key)
-            except KeyError:
-                print(f"[bugs] Prompt '{prompt_key}' is not registered; skipping bug {bug_id}.")
-                continue
+        prompt_key = self.BUG_STAGE_PROMPTS.get(pending_stage)
+        if not prompt_key:
+            print(f"[bugs] Unknown pending stage '{pending_stage}' for bug {bug_id}; skipping.")
+            return False
 
-            context_payload = self._build_bug_context(
-                stage=pending_stage,
-                bug_dir=bug_dir,
-                backlog_data=backlog_data,
-                state=state,
-            )
-            if context_payload is None:
-                continue
-
-            prompt_text = self._get_prompt_text(spec=spec, context=context_payload)
-            prompt_text += (
-                "\n\nBug artifacts:\n"
-                f"- Bug directory: {self._rel_path(bug_dir)}\n"
-                f"- State file: {self._rel_path(state_path)}\n"
-            )
+        try:
+            spec = get_supporting_prompt(prompt_key)
+        except KeyError:
+            print(f"[bugs] Prompt '{prompt_key}' is not registered; skipping bug {bug_id}.")
+            return False
+
+        context_payload = self._build_bug_context(
+            stage=pending_stage,
+            bug_dir=bug_dir,
+            backlog_data=backlog_data,
+            state=state,
+        )
+        if context_payload is None:
+            return False
+
+        prompt_text = self._get_prompt_text(spec=spec, context=context_payload)
+        prompt_text += (
+            "\n\nBug artifacts:\n"
+            f"- Bug directory: {self._rel_path(bug_dir)}\n"
+            f"- State file: {self._rel_path(state_path)}\n"
+        )
 
-            agent_label = f"bugs/{bug_id}/{pending_stage}/agent"
-            manager_label = f"bugs/{bug_id}/{pending_stage}/manager"
+        agent_label = f"bugs/{bug_id}/{pending_stage}/agent"
+        manager_label = f"bugs/{bug_id}/{pending_stage}/manager"
 
-            try:
+        try:
+            with self.telemetry.span("bug.stage", task_id=bug_id, stage=pending_stage, prompt_number=spec.number):
                 self._execute_agent_flow(
                     spec=spec,
                     initial_prompt=prompt_text,
@@ -978,23 +1359,24 @@ class Workflow:
                     task_dir=bug_dir,
                     enable_qa=False,
                 )
-            except WorkflowError as exc:
-                print(f"[bugs] Stage '{pending_stage}' failed for bug {bug_id}: {exc}")
-                continue
+        except WorkflowError as exc:
+            print(f"[bugs] Stage '{pending_stage}' failed for bug {bug_id}: {exc}")
+            return False
 
-            try:
-                state = self._update_bug_state_after_stage(
-                    stage=pending_stage,
-                    bug_dir=bug_dir,
-                    state=state,
-                )
-            except WorkflowError as exc:
-                print(f"[bugs] Could not update state for bug {bug_id}: {exc}")
-                continue
+        try:
+            state = self._update_bug_state_after_stage(
+                stage=pending_stage,
+                bug_dir=bug_dir,
+                state=state,
+            )
+        except WorkflowError as exc:
+            print(f"[bugs] Could not update state for bug {bug_id}: {exc}")
+            return False
 
-            self._save_bug_state(bug_dir, state)
+        self._save_bug_state(bug_dir, state)
+        return state.get("pending_stage") != pending_stage
 
-    def _run_feedback_pipeline(self) -> None:
+    def _run_feedback_pipeline(self, only: Optional[Collection[str]] = None) -> None:
         feedback_dir = self.feedback_dir
         if not feedback_dir.exists():
             return
@@ -1002,58 +1384,77 @@ class Workflow:
         backlog_path = self.workspace / BACKLOG_FILE
         backlog_data = self._read_json(backlog_path) if backlog_path.exists() else None
 
-        stage_to_prompt = {
-            "intake": "feedback_intake",
-            "review": "feedback_review",
-            "plan": "feedback_plan",
+        item_dirs = {
+            path.name: path
+            for path in feedback_dir.iterdir()
+            if path.is_dir() and (only is None or path.name in only)
         }
+        order = fair_order(
+            [self._lane_item(path) for _, path in sorted(item_dirs.items())],
+            self.lane_fairness,
+        )
+        # Items run side by side up to the lane limit; each one walks its own
+        # stages in order on a single worker.
+        DagExecutor(self.feedback_concurrency).run(
+            order,
+            {},
+            lambda name: self._advance_feedback(item_dirs[name], backlog_data),
+        )
 
-        for fb_dir in sorted(p for p in feedback_dir.iterdir() if p.is_dir()):
-            state = self._load_feedback_state(fb_dir)
-            feedback_id = state.get("feedback_id") or fb_dir.name
-            state["feedback_id"] = feedback_id
+    def _advance_feedback(self, fb_dir: Path, backlog_data: Optional[dict]) -> None:
+        while self._run_feedback_stage(fb_dir, backlog_data):
+            pass
 
-            state_path = fb_dir / "state.json"
-            if not state_path.exists():
-                self._save_feedback_state(fb_dir, state)
+    def _run_feedback_stage(self, fb_dir: Path, backlog_data: Optional[dict]) -> bool:
+        """Run the pending stage of one feedback item; return True when it moved to another stage."""
+        state = self._load_feedback_state(fb_dir)
+        feedback_id = state.get("feedback_id") or fb_dir.name
+        state["feedback_id"] = feedback_id
 
-            pending_stage = state.get("pending_stage") or "intake"
-            if pending_stage == "done":
-                continue
-            if state.get("awaiting_human"):
-                continue
+        state_path = fb_dir / "state.json"
+        if not state_path.exists():
+            self._save_feedback_state(fb_dir, state)
 
-            prompt_key = stage_to_prompt.get(pending_stage)
-            if not prompt_key:
-                print(f"[feedback] Unknown stage '{pending_stage}' for feedback {feedback_id}; skipping.")
-                continue
+        pending_stage = state.get("pending_stage") or "intake"
+        if pending_stage == "done":
+            return False
+        if state.get("awaiting_human"):
+            return False
 
-            try:
-                spec = get_supporting_prompt(prompt_key)
-            except KeyError:
-                print(f"[feedback] Prompt '{prompt_key}' is not registered; skipping {feedback_id}.")
-                continue
+        prompt_key = self.FEEDBACK_STAGE_PROMPTS.get(pending_stage)
+        if not prompt_key:
+            print(f"[feedback] Unknown stage '{pending_stage}' for feedback {feedback_id}; skipping.")
+            return False
 
-            context_payload = self._build_feedback_context(
-                stage=pending_stage,
-                feedback_dir=fb_dir,
-                backlog_data=backlog_data,
-                state=state,
-            )
-            if context_payload is None:
-                continue
-
-            prompt_text = self._get_prompt_text(spec=spec, context=context_payload)
-            prompt_text += (
-                "\n\nFeedback artifacts:\n"
-                f"- Feedback directory: {self._rel_path(fb_dir)}\n"
-                f"- State file: {self._rel_path(state_path)}\n"
-            )
+        try:
+            spec = get_supporting_prompt(prompt_key)
+        except KeyError:
+            print(f"[feedback] Prompt '{prompt_key}' is not registered; skipping {feedback_id}.")
+            return False
+
+        context_payload = self._build_feedback_context(
+            stage=pending_stage,
+            feedback_dir=fb_dir,
+            backlog_data=backlog_data,
+            state=state,
+        )
+        if context_payload is None:
+            return False
+
+        prompt_text = self._get_prompt_text(spec=spec, context=context_payload)
+        prompt_text += (
+            "\n\nFeedback artifacts:\n"
+            f"- Feedback directory: {self._rel_path(fb_dir)}\n"
+            f"- State file: {self._rel_path(state_path)}\n"
+        )
 
-            agent_label = f"feedback/{feedback_id}/{pending_stage}/agent"
-            manager_label = f"feedback/{feedback_id}/{pending_stage}/manager"
+        agent_label = f"feedback/{feedback_id}/{pending_stage}/agent"
+        manager_label = f"feedback/{feedback_id}/{pending_stage}/manager"
 
-            try:
+        try:
+            with self.telemetry.span(
+                "feedback.stage", task_id=feedback_id, stage=pending_stage, prompt_number=spec.number
+            ):
                 self._execute_agent_flow(
                     spec=spec,
                     initial_prompt=prompt_text,
@@ -1064,53 +1465,114 @@ class Workflow:
                     task_dir=fb_dir,
                     enable_qa=False,
                 )
-            except WorkflowError as exc:
-                print(f"[feedback] Stage '{pending_stage}' failed for {feedback_id}: {exc}")
-                continue
+        except WorkflowError as exc:
+            print(f"[feedback] Stage '{pending_stage}' failed for {feedback_id}: {exc}")
+            return False
 
-            try:
-                state = self._update_feedback_state_after_stage(
-                    stage=pending_stage,
-                    feedback_dir=fb_dir,
-                    state=state,
-                )
-            except WorkflowError as exc:
-                print(f"[feedback] Could not update state for {feedback_id}: {exc}")
-                continue
+        try:
+            state = self._update_feedback_state_after_stage(
+                stage=pending_stage,
+                feedback_dir=fb_dir,
+                state=state,
+            )
+        except WorkflowError as exc:
+            print(f"[feedback] Could not update state for {feedback_id}: {exc}")
+            return False
 
-            self._save_feedback_state(fb_dir, state)
+        self._save_feedback_state(fb_dir, state)
+        return state.get("pending_stage") != pending_stage
 
     def _run_task_loop(self) -> None:
-        tasks = self._collect_tasks()
+        with self.profiler.phase("backlog"):
+            tasks = self._collect_tasks()
         self._validate_backlog_resource_constraints(tasks)
         if not tasks:
             print("[tasks] No tasks found in BACKLOG/backlog.json. Skipping execution loop.")
             return
 
-        backlog_path = self.workspace / BACKLOG_FILE
-        count = 0
+        runnable: Dict[str, tuple[TaskEntry, PromptSpec]] = {}
+        order: List[str] = []
         for task in tasks:
             if not self.reprocess_tasks and task.task_id in self.processed_tasks:
                 print(f"[tasks] Skipping {task.task_id} (already processed).")
                 continue
-
-            if self.max_tasks is not None and count >= self.max_tasks:
-                print("[tasks] Reached max task limit, stopping.")
-                break
-
             spec = self._select_prompt_for_task(task)
             if spec is None:
                 print(f"[tasks] No automation prompt mapped for owner '{task.owner}' (task {task.task_id}); skipping.")
                 continue
+            runnable[task.task_id] = (task, spec)
+            order.append(task.task_id)
+        self.state_store.set_task_statuses(order, TASK_WAITING)
+
+        launched = 0
+        limit_reported = False
+
+        def can_start() -> bool:
+            nonlocal launched, limit_reported
+            if self.max_tasks is not None and launched >= self.max_tasks:
+                if not limit_reported:
+                    print("[tasks] Reached max task limit, stopping.")
+                    limit_reported = True
+                return False
+            launched += 1
+            return True
+
+        def execute(task_id: str) -> None:
+            task, spec = runnable[task_id]
+            self.state_store.set_task_status(task_id, TASK_STARTED)
+            try:
+                with self.telemetry.span("task", task_id=task_id, prompt_number=spec.number, owner=task.owner):
+                    self._run_task(task, spec)
+            except BaseException:
+                self.state_store.set_task_status(task_id, TASK_FAILED)
+                raise
+
+        if self.max_parallel_tasks > 1:
+            print(f"[tasks] Running up to {self.max_parallel_tasks} ready tasks concurrently.")
+        dependencies = {task_id: entry[0].deps for task_id, entry in runnable.items()}
+        executor = DagExecutor(max_workers=self.max_parallel_tasks)
+        try:
+            completed = executor.run(
+                order,
+                dependencies,
+                execute,
+                can_start=can_start,
+                priority=priority_keys(
+                    dependencies,
+                    {task_id: entry[0].estimate_points for task_id, entry in runnable.items()},
+                    self.schedule_policy,
+                ),
+            )
+        finally:
+            self.state_store.export_completed_tasks(self.tasks_state_path)
+
+        if not completed:
+            print("[tasks] No new tasks executed.")
 
-            task_payload = json.dumps(task.raw, indent=2)
-            prompt_text = self._get_prompt_text(spec=spec, context=task_payload)
+    def _run_task(self, task: TaskEntry, spec: PromptSpec) -> None:
+        backlog_path = self.workspace / BACKLOG_FILE
+        task_payload = json.dumps(task.raw, indent=2)
+        prompt_text = self._get_prompt_text(spec=spec, context=task_payload)
 
-            task_slug = task.task_id.lower()
-            task_dir = self.runner.artifacts_dir / "tasks" / task_slug
-            task_dir.mkdir(parents=True, exist_ok=True)
-            report_path = task_dir / "agent-report.md"
+        task_slug = task.task_id.lower()
+        task_dir = self.runner.artifacts_dir / "tasks" / task_slug
+        task_dir.mkdir(parents=True, exist_ok=True)
+        report_path = task_dir / "agent-report.md"
 
+        workdir: Optional[Path] = None
+        if self.worktrees is not None:
+            workdir = self.worktrees.create(task.task_id)
+            # Artifacts and the backlog the workflow reads stay in the main workspace,
+            # so point the agent at them absolutely.
+            prompt_text += (
+                "\n\nRepository resources:\n"
+                f"- Isolated worktree for this task: {workdir}\n"
+                f"- Task artifact directory: {task_dir}\n"
+                f"- Agent report path: {report_path}\n"
+                f"- Source backlog: {backlog_path}\n"
+                "- QA will inspect the updated worktree and record findings."
+            )
+        else:
             prompt_text += (
                 "\n\nRepository resources:\n"
                 f"- Task artifact directory: {self._rel_path(task_dir)}\n"
@@ -1119,35 +1581,36 @@ class Workflow:
                 "- QA will inspect the updated repository and record findings."
             )
 
-            agent_label = f"tasks/{task_slug}/agent"
-            manager_label = f"tasks/{task_slug}/manager"
-            qa_label = f"tasks/{task_slug}/qa"
+        agent_label = f"tasks/{task_slug}/agent"
+        manager_label = f"tasks/{task_slug}/manager"
+        qa_label = f"tasks/{task_slug}/qa"
 
-            enable_qa = spec.name == "Module Developer"
+        enable_qa = spec.name == "Module Developer"
 
-            self._execute_agent_flow(
-                spec=spec,
-                initial_prompt=prompt_text,
-                agent_label=agent_label,
-                manager_label=manager_label,
-                task_id=task.task_id,
-                task_source=backlog_path,
-                task_dir=task_dir,
-                enable_qa=enable_qa,
-                qa_label=qa_label,
-            )
+        self._execute_agent_flow(
+            spec=spec,
+            initial_prompt=prompt_text,
+            agent_label=agent_label,
+            manager_label=manager_label,
+            task_id=task.task_id,
+            task_source=backlog_path,
+            task_dir=task_dir,
+            enable_qa=enable_qa,
+            qa_label=qa_label,
+            workdir=workdir,
+        )
 
-            self.processed_tasks.add(task.task_id)
-            self._save_processed_tasks()
-            count += 1
+        if self.worktrees is not None:
+            self.worktrees.merge(task.task_id, message=f"{task.task_id}: {task.title}".strip())
 
-        if count == 0:
-            print("[tasks] No new tasks executed.")
+        with self._state_lock:
+            self.processed_tasks.add(task.task_id)
+            self.state_store.set_task_status(task.task_id, TASK_COMPLETED)
 
-    def _missing_deliverables(self, deliverables: Sequence[Path]) -> List[Path]:
+    def _missing_deliverables(self, deliverables: Sequence[Path], *, root: Optional[Path] = None) -> List[Path]:
         missing: List[Path] = []
         for rel_path in deliverables:
-            path = self.workspace / rel_path
+            path = (root or self.workspace) / rel_path
             if not path.exists():
                 missing.append(rel_path)
                 continue
@@ -1164,6 +1627,7 @@ class Workflow:
         attempt: int,
         agent_label: str,
         task_id: Optional[str] = None,
+        cached: bool = False,
     ) -> None:
         entry = {
             "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds") + "Z",
@@ -1177,31 +1641,26 @@ class Workflow:
         }
         if spec.number == 4 and task_id:
             entry["task_id"] = task_id
-        self.conversation_log_path.parent.mkdir(parents=True, exist_ok=True)
-        with self.conversation_log_path.open("a", encoding="utf-8") as handle:
-            json.dump(entry, handle)
-            handle.write("\n")
-
-        if role == "agent" and result.session_id:
-            sessions_dir = self.workspace / SESSIONS_DIR
-            sessions_dir.mkdir(parents=True, exist_ok=True)
-            session_path = sessions_dir / f"prompt{spec.number}.session"
-            session_path.write_text(result.session_id, encoding="utf-8")
-
-    def _build_missing_deliverables_prompt(
-        self,
-        *,
-        original_prompt: str,
-        missing: Sequence[Path],
-    ) -> str:
+        if cached:
+            entry["cached"] = True
+        with self._state_lock:
+            self.conversation_log.append(entry)
+            self.state_store.record_run({**entry, "task_id": task_id})
+
+            if role == "agent" and result.session_id:
+                sessions_dir = self.workspace / SESSIONS_DIR
+                sessions_dir.mkdir(parents=True, exist_ok=True)
+                session_path = sessions_dir / f"prompt{spec.number}.session"
+                session_path.write_text(result.session_id, encoding="utf-8")
+
+    @staticmethod
+    def _build_missing_deliverables_prompt(*, missing: Sequence[Path]) -> str:
         lines = "\n".join(f"- {path}" for path in missing)
         return (
             "You did not write the required deliverables to the repository.\n"
             f"The following files are missing or empty:\n{lines}\n\n"
             "Resume the work and update each file directly in the repo so it matches the original instructions.\n"
-            "Do not return the content inline; write the files exactly as required and confirm completion.\n\n"
-            "Original instructions:\n"
-            f"{original_prompt}"
+            "Do not return the content inline; write the files exactly as required and confirm completion."
         )
 
     def _load_bug_state(self, bug_dir: Path) -> dict:
@@ -1223,6 +1682,7 @@ class Workflow:
         state_path.parent.mkdir(parents=True, exist_ok=True)
         state["updated_at"] = datetime.now(timezone.utc).isoformat(timespec="seconds") + "Z"
         state_path.write_text(json.dumps(state, indent=2), encoding="utf-8")
+        self.state_store.save_item("bug", bug_dir.name, state)
 
     def _load_feedback_state(self, feedback_dir: Path) -> dict:
         state_path = feedback_dir / "state.json"
@@ -1245,6 +1705,7 @@ class Workflow:
         state_path.parent.mkdir(parents=True, exist_ok=True)
         state["updated_at"] = datetime.now(timezone.utc).isoformat(timespec="seconds") + "Z"
         state_path.write_text(json.dumps(state, indent=2), encoding="utf-8")
+        self.state_store.save_item("feedback", feedback_dir.name, state)
 
     def _build_bug_context(
         self,
@@ -1459,8 +1920,19 @@ class Workflow:
 
 
 def main() -> None:
+    args_started = time.perf_counter()
     args = parse_args()
-    workflow = Workflow(args)
+    profiler = StartupProfiler.disabled()
+    if args.profile_startup:
+        profiler = StartupProfiler(
+            Path(args.workspace).resolve() / args.artifacts_dir / "profiles",
+            origin=_IMPORTS_STARTED,
+            mode=args.profile_startup,
+        )
+        profiler.record("imports", _IMPORTS_STARTED, _IMPORTS_FINISHED)
+        profiler.record("parse_args", args_started, time.perf_counter())
+    with profiler.phase("workflow_init"):
+        workflow = Workflow(args, profiler=profiler)
     try:
         workflow.run()
     except WorkflowError as exc:
@@ -0,0 +1,225 @@
+from __future__ import annotations
+
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+from .errors import WorkflowError
+
+
+class WorktreeManager:
+    """Give each concurrently running task its own git worktree and merge passing ones into an integration branch.
+
+    Most of what the primary chain generates (the backlog, ARTIFACTS, devops
+    scripts) is not committed, so worktrees do not start from ``HEAD``. On
+    first use the workspace as it is on disk is committed to
+    ``INTEGRATION_BRANCH`` through a temporary index, leaving the user's
+    index, HEAD and checkout untouched; ``exclude`` keeps paths such as the
+    automation artifacts out of it. Later runs merge their snapshot into the
+    existing branch, so tasks merged earlier stay available to their
+    dependents. Task branches start from the integration branch and merge back
+    into it inside its own worktree, never into the branch the user has checked
+    out, which the bug and feedback lanes may be editing at the same time.
+    Merging the integration branch is left to the user; :meth:`report` says so.
+    """
+
+    BRANCH_PREFIX = "automation/"
+    INTEGRATION_BRANCH = "automation/integration"
+
+    def __init__(self, workspace: Path, root: Path, *, exclude: Sequence[Path] = ()) -> None:
+        self.workspace = workspace
+        self.root = root
+        self.exclude = tuple(exclude)
+        self._lock = threading.Lock()
+        self._excluded = False
+        self._integration_path: Optional[Path] = None
+        # Task ids merged into the integration branch by this process.
+        self.merged: List[str] = []
+
+    def path_for(self, task_id: str) -> Path:
+        return self.root / task_id.lower()
+
+    def branch_for(self, task_id: str) -> str:
+        return f"{self.BRANCH_PREFIX}{task_id.lower()}"
+
+    def create(self, task_id: str) -> Path:
+        path = self.path_for(task_id)
+        branch = self.branch_for(task_id)
+        with self._lock:
+            self._exclude_root()
+            if path.exists():
+                self._discard(path)
+            self.root.mkdir(parents=True, exist_ok=True)
+            self._ensure_integration()
+            self._git(["worktree", "add", "-B", branch, str(path), self.INTEGRATION_BRANCH], cwd=self.workspace)
+        print(f"[worktree] {task_id} running in {path} on branch {branch}.")
+        return path
+
+    def merge(self, task_id: str, *, message: str) -> None:
+        path = self.path_for(task_id)
+        branch = self.branch_for(task_id)
+        self._git(["add", "-A"], cwd=path)
+        if self._git(["status", "--porcelain"], cwd=path).strip():
+            self._git(["commit", "-m", message], cwd=path)
+        else:
+            print(f"[worktree] {task_id} produced no file changes.")
+
+        # Merges are serialized so branches land one at a time; a task only
+        # starts after its deps merged, so completion order respects the DAG.
+        with self._lock:
+            integration = self._ensure_integration()
+            try:
+                self._git(["merge", "--no-ff", "--no-edit", branch], cwd=integration)
+            except WorkflowError as exc:
+                subprocess.run(
+                    ["git", "merge", "--abort"],
+                    cwd=integration,
+                    capture_output=True,
+                    text=True,
+                )
+                raise WorkflowError(
+                    f"Could not merge worktree branch {branch} for {task_id}; resolve manually. {exc}"
+                ) from exc
+            self._discard(path)
+            self._git(["branch", "-D", branch], cwd=self.workspace)
+            self.merged.append(task_id)
+        print(
+            f"[worktree] Merged {branch} into {self.INTEGRATION_BRANCH}; "
+            "merge that branch into your own when you are ready."
+        )
+
+    def _ensure_integration(self) -> Path:
+        """Create or carry forward the integration branch and its worktree (caller holds the lock).
+
+        A fresh branch starts at a snapshot of the workspace. An existing one
+        still holds tasks merged by earlier runs (already in processed_tasks,
+        so they will not run again) unless the user merged it; the new
+        snapshot is merged into it, keeping the tasks' side of any conflict.
+        """
+        if self._integration_path is not None:
+            return self._integration_path
+        path = self.root / "integration"
+        if path.exists():
+            self._discard(path)
+        branch_ref = f"refs/heads/{self.INTEGRATION_BRANCH}"
+        snapshot = self._snapshot()
+        carried = self._git_ok(["rev-parse", "--verify", "-q", branch_ref]) and not self._git_ok(
+            ["merge-base", "--is-ancestor", self.INTEGRATION_BRANCH, "HEAD"]
+        )
+        if carried:
+            self._git(["worktree", "add", str(path), self.INTEGRATION_BRANCH], cwd=self.workspace)
+            try:
+                self._git(
+                    ["merge", "--no-ff", "-X", "ours", "-m", "automation: refresh from the workspace", snapshot],
+                    cwd=path,
+                )
+            except WorkflowError as exc:
+                subprocess.run(["git", "merge", "--abort"], cwd=path, capture_output=True, text=True)
+                raise WorkflowError(
+                    f"Could not bring the workspace into {self.INTEGRATION_BRANCH}; merge it into your branch "
+                    f"or delete it, then rerun. {exc}"
+                ) from exc
+            print(f"[worktree] Continuing {self.INTEGRATION_BRANCH} from an earlier run ({path}).")
+        else:
+            self._git(["worktree", "add", "-B", self.INTEGRATION_BRANCH, str(path), snapshot], cwd=self.workspace)
+            print(f"[worktree] Task branches merge into {self.INTEGRATION_BRANCH} ({path}).")
+        self._integration_path = path
+        return path
+
+    def report(self) -> None:
+        """Tell the user what is waiting on the integration branch; call once the lanes finish."""
+        if not self._git_ok(["rev-parse", "--verify", "-q", f"refs/heads/{self.INTEGRATION_BRANCH}"]):
+            return
+        try:
+            ahead = int(self._git(["rev-list", "--count", f"HEAD..{self.INTEGRATION_BRANCH}"], cwd=self.workspace))
+        except (WorkflowError, ValueError):
+            return
+        if not ahead:
+            return
+        merged = f" ({', '.join(self.merged)} merged in this run)" if self.merged else ""
+        print(
+            f"[worktree] {self.INTEGRATION_BRANCH} holds task work not yet in your branch{merged}. "
+            f"Bring it in with: git -C {self.workspace} merge {self.INTEGRATION_BRANCH}"
+        )
+
+    def _snapshot(self) -> str:
+        """Commit the working tree (tracked, modified and untracked files) without touching the user's index."""
+        has_head = self._git_ok(["rev-parse", "--verify", "-q", "HEAD"])
+        with tempfile.TemporaryDirectory() as scratch:
+            env = {**os.environ, "GIT_INDEX_FILE": str(Path(scratch) / "index")}
+            self._git(["read-tree", "HEAD"] if has_head else ["read-tree", "--empty"], cwd=self.workspace, env=env)
+            pathspec = ["."]
+            for path in self.exclude:
+                try:
+                    relative = path.resolve().relative_to(self.workspace.resolve()).as_posix()
+                except ValueError:
+                    continue
+                pathspec.append(f":(exclude){relative}")
+            self._git(["add", "-A", "--", *pathspec], cwd=self.workspace, env=env)
+            excluded = [spec.replace(":(exclude)", "", 1) for spec in pathspec[1:]]
+            if excluded:
+                # Excluded paths that were committed before still come from HEAD; drop them too.
+                self._git(
+                    ["rm", "-r", "--cached", "-q", "--ignore-unmatch", "--", *excluded],
+                    cwd=self.workspace,
+                    env=env,
+                )
+            tree = self._git(["write-tree"], cwd=self.workspace, env=env).strip()
+        parents = ["-p", "HEAD"] if has_head else []
+        return self._git(
+            ["commit-tree", tree, *parents, "-m", "automation: snapshot of the workspace for task worktrees"],
+            cwd=self.workspace,
+        ).strip()
+
+    def _discard(self, path: Path) -> None:
+        result = subprocess.run(
+            ["git", "worktree", "remove", "--force", str(path)],
+            cwd=self.workspace,
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode != 0 and path.exists():
+            shutil.rmtree(path, ignore_errors=True)
+            self._git(["worktree", "prune"], cwd=self.workspace)
+
+    def _exclude_root(self) -> None:
+        if self._excluded:
+            return
+        common_dir = Path(self._git(["rev-parse", "--git-common-dir"], cwd=self.workspace).strip())
+        if not common_dir.is_absolute():
+            common_dir = self.workspace / common_dir
+        try:
+            pattern = "/" + str(self.root.relative_to(self.workspace)).replace("\\", "/") + "/"
+        except ValueError:
+            self._excluded = True
+            return
+        exclude_path = common_dir / "info" / "exclude"
+        existing = exclude_path.read_text(encoding="utf-8") if exclude_path.exists() else ""
+        if pattern not in existing.splitlines():
+            exclude_path.parent.mkdir(parents=True, exist_ok=True)
+            with exclude_path.open("a", encoding="utf-8") as handle:
+                if existing and not existing.endswith("\n"):
+                    handle.write("\n")
+                handle.write(pattern + "\n")
+        self._excluded = True
+
+    def _git_ok(self, args: List[str]) -> bool:
+        return subprocess.run(["git", *args], cwd=self.workspace, capture_output=True, text=True).returncode == 0
+
+    @staticmethod
+    def _git(args: List[str], *, cwd: Path, env: Optional[Dict[str, str]] = None) -> str:
+        result = subprocess.run(
+            ["git", *args],
+            cwd=cwd,
+            capture_output=True,
+            text=True,
+            env=env,
+        )
+        if result.returncode != 0:
+            detail = (result.stderr or result.stdout).strip()
+            raise WorkflowError(f"git {' '.join(args)} failed in {cwd}: {detail}")
+        return result.stdout
@@ -4,6 +4,7 @@
 from __future__ import annotations
 
 import asyncio
+import codecs
 from datetime import datetime, timezone
 import math
 import json
@@ -12,12 +13,13 @@ import os
 import shlex
 import subprocess
 import sys
+import time
 import uuid
 from pathlib import Path
 from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, TextIO
 
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup, Update
-from telegram.error import BadRequest
+from telegram.error import BadRequest, RetryAfter, TelegramError
 from telegram.ext import (
     ApplicationBuilder,
     CallbackQueryHandler,
@@ -43,6 +45,27 @@ ARTIFACTS_DIR = PLATFORM_DIR / "ARTIFACTS"
 BUGS_DIR = PLATFORM_DIR / "automation_artifacts" / "bugs"
 FEEDBACK_DIR = PLATFORM_DIR / "automation_artifacts" / "feedback"
 
+if str(PLATFORM_DIR) not in sys.path:
+    sys.path.insert(0, str(PLATFORM_DIR))
+try:
+    from automation.blob_store import BLOBS_DIR_NAME, BlobStore, read_artifact_text
+    from automation.conversation_log import ConversationLog
+    from automation.daemon import SOCKET_NAME as DAEMON_SOCKET_NAME
+    from automation.daemon import request as daemon_request
+    from automation.liveness import PIDFILE_NAME, pid_alive, workflow_liveness
+    from automation.state_store import StateStore
+except ImportError:  # Bot deployed without the platform package; fall back to file scans.
+    ConversationLog = None  # type: ignore[assignment,misc]
+    StateStore = None  # type: ignore[assignment,misc]
+    BlobStore = None  # type: ignore[assignment,misc]
+    BLOBS_DIR_NAME = "blobs"
+    read_artifact_text = None  # type: ignore[assignment]
+    PIDFILE_NAME = "workflow.pid"
+    DAEMON_SOCKET_NAME = "workflow.sock"
+    daemon_request = None  # type: ignore[assignment]
+    pid_alive = None  # type: ignore[assignment]
+    workflow_liveness = None  # type: ignore[assignment]
+
 ALLOWED_USERNAMES = {
     username.strip().lower()
     for username in os.getenv("TELEGRAM_ALLOWED_USERS", "fishmaster2").split(",")
@@ -125,6 +148,18 @@ WORKFLOW_LOCK = asyncio.Lock()
 WORKFLOW_MONITOR_TASK: Optional[asyncio.Task] = None
 WORKFLOW_SUBSCRIBERS: Set[int] = set()
 STATUS_SUMMARY_PATH = TELEGRAM_BASE_DIR / "status.json"
+STATE_STORE: Optional["StateStore"] = None
+CONVERSATION_LOG = ConversationLog(CONVERSATIONS_LOG) if ConversationLog is not None else None
+# Codex turns run as asyncio subprocesses: at most CODEX_CONCURRENCY at once
+# across all chats, and one at a time per chat and per Codex session file.
+CODEX_CONCURRENCY = max(1, int(os.getenv("TELEGRAM_CODEX_CONCURRENCY", "4")))
+CODEX_SEMAPHORE = asyncio.Semaphore(CODEX_CONCURRENCY)
+CODEX_LOCKS: Dict[str, asyncio.Lock] = {}
+# While a turn runs, the tail of its output is streamed into one progress
+# message edited at most every TELEGRAM_STREAM_INTERVAL seconds (0 disables).
+STREAM_INTERVAL = max(0.0, float(os.getenv("TELEGRAM_STREAM_INTERVAL", "3")))
+STREAM_TAIL_CHARS = 1500
+TELEGRAM_MESSAGE_LIMIT = 4096
 STAGE_NAMES: Dict[int, str] = {
     0: "DevOps bootstrap",
     1: "PRD / Intake",
@@ -147,55 +182,271 @@ BUG_SUMMARY, BUG_SEVERITY, BUG_EXPECTED, BUG_OBSERVED, BUG_REPRO, BUG_ENV = rang
 ) = range(6, 13)
 
 
+def _state_store() -> Optional["StateStore"]:
+    global STATE_STORE
+    if STATE_STORE is None and StateStore is not None:
+        try:
+            STATE_STORE = StateStore.open(PLATFORM_DIR / "automation_artifacts", workspace=REPO_ROOT)
+        except Exception as exc:  # sqlite3.Error, OSError
+            logging.warning("State store unavailable, falling back to artifact files: %s", exc)
+            return None
+    return STATE_STORE
+
+
+class _WorkflowProbe:
+    """Cached answer to "is a workflow running that this bot did not start?".
+
+    The workflow's heartbeat pidfile is checked with ``os.kill(pid, 0)`` and
+    the heartbeat age; ``pgrep`` only runs when there is no live pidfile, at
+    most once per ``pgrep_interval``, and its pid is re-checked in between.
+    """
+
+    def __init__(self, pidfile: Path, *, ttl: float = 2.0, pgrep_interval: float = 60.0) -> None:
+        self.pidfile = pidfile
+        self.ttl = ttl
+        self.pgrep_interval = pgrep_interval
+        self._checked_at = float("-inf")
+        self._info: Optional[Dict[str, str]] = None
+        self._pgrep_at = float("-inf")
+        self._pgrep_info: Optional[Dict[str, str]] = None
+
+    def invalidate(self) -> None:
+        self._checked_at = float("-inf")
+
+    def info(self) -> Optional[Dict[str, str]]:
+        now = time.monotonic()
+        if now - self._checked_at >= self.ttl:
+            self._info = self._probe(now)
+            self._checked_at = now
+        return self._info
+
+    def _probe(self, now: float) -> Optional[Dict[str, str]]:
+        if workflow_liveness is not None:
+            record = workflow_liveness(self.pidfile)
+            if record is not None:
+                return {"pid": str(record["pid"]), "command": str(record.get("command") or WORKFLOW_SCRIPT)}
+        if now - self._pgrep_at >= self.pgrep_interval:
+            self._pgrep_info = self._pgrep()
+            self._pgrep_at = now
+        elif self._pgrep_info is not None and not self._alive(int(self._pgrep_info["pid"])):
+            self._pgrep_info = None
+        return self._pgrep_info
+
+    @staticmethod
+    def _alive(pid: int) -> bool:
+        if pid_alive is not None:
+            return pid_alive(pid)
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            return True
+        return True
+
+    @staticmethod
+    def _pgrep() -> Optional[Dict[str, str]]:
+        result = subprocess.run(
+            ["pgrep", "-fl", str(WORKFLOW_SCRIPT)],
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode != 0:
+            return None
+        line = result.stdout.strip().splitlines()[0]
+        pid_str, *cmd_parts = line.split(maxsplit=1)
+        try:
+            int(pid_str)
+        except ValueError:
+            return None
+        command = cmd_parts[0] if cmd_parts else str(WORKFLOW_SCRIPT)
+        return {"pid": pid_str, "command": command}
+
+
+WORKFLOW_PROBE = _WorkflowProbe(PLATFORM_DIR / "automation_artifacts" / PIDFILE_NAME)
+WORKFLOW_SOCKET = PLATFORM_DIR / "automation_artifacts" / DAEMON_SOCKET_NAME
+TRANSCRIPT_STORE = (
+    BlobStore(PLATFORM_DIR / "automation_artifacts" / BLOBS_DIR_NAME) if BlobStore is not None else None
+)
+
+
 def _workflow_process_info() -> Optional[Dict[str, str]]:
     if WORKFLOW_PROCESS and WORKFLOW_PROCESS.poll() is None:
         args = WORKFLOW_PROCESS.args if isinstance(WORKFLOW_PROCESS.args, (list, tuple)) else [str(WORKFLOW_PROCESS.args)]
         command = " ".join(str(arg) for arg in args)
         return {"pid": str(WORKFLOW_PROCESS.pid), "command": command}
-    result = subprocess.run(
-        ["pgrep", "-fl", str(WORKFLOW_SCRIPT)],
-        capture_output=True,
-        text=True,
-    )
-    if result.returncode != 0:
-        return None
-    line = result.stdout.strip().splitlines()[0]
-    pid_str, *cmd_parts = line.split(maxsplit=1)
+    return WORKFLOW_PROBE.info()
+
+
+def _file_signature(path: Path) -> Optional[tuple]:
     try:
-        int(pid_str)
-    except ValueError:
+        stat = path.stat()
+    except OSError:
         return None
-    command = cmd_parts[0] if cmd_parts else str(WORKFLOW_SCRIPT)
-    return {"pid": pid_str, "command": command}
+    return (stat.st_mtime_ns, stat.st_size)
 
 
-def _load_backlog_map() -> Dict[str, Dict[str, Any]]:
-    if not BACKLOG_FILE.exists():
-        return {}
-    try:
-        data = json.loads(BACKLOG_FILE.read_text(encoding="utf-8"))
-    except json.JSONDecodeError:
-        return {}
-    tasks: Dict[str, Dict[str, Any]] = {}
-    for item in data.get("tasks", []):
-        tasks[item.get("id", "")] = item
-    return tasks
+class _BacklogCache:
+    """``backlog.json`` parsed once per (mtime, size) change."""
 
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.signature: Optional[tuple] = None
+        self.tasks: Dict[str, Dict[str, Any]] = {}
 
-def _load_task_runs() -> Dict[str, Dict[str, Any]]:
-    runs: Dict[str, Dict[str, Any]] = {}
-    if not TASKS_ARTIFACT_DIR.exists():
-        return runs
-    for path in TASKS_ARTIFACT_DIR.iterdir():
-        if not path.is_dir():
-            continue
+    def load(self) -> Dict[str, Dict[str, Any]]:
+        signature = _file_signature(self.path)
+        if signature != self.signature:
+            self.tasks = self._parse()
+            self.signature = signature
+        return self.tasks
+
+    def _parse(self) -> Dict[str, Dict[str, Any]]:
+        if not self.path.exists():
+            return {}
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except json.JSONDecodeError:
+            return {}
+        tasks: Dict[str, Dict[str, Any]] = {}
+        for item in data.get("tasks", []):
+            tasks[item.get("id", "")] = item
+        return tasks
+
+
+class _TaskRunIndex:
+    """In-memory view of TASKS_ARTIFACT_DIR that only re-reads changed task directories.
+
+    Each task directory is summarized from its ``*.txt`` files and cached under
+    the (name, mtime, size) signature of those files. When the state store is
+    available, refreshes only revisit directories named by runs recorded since
+    the last refresh (plus any added or removed directory), so their cost
+    follows the number of new runs rather than the size of the tree. A full
+    signature scan still runs every ``full_scan_interval`` seconds, and refreshes
+    are throttled to one per ``ttl`` seconds. ``version`` changes whenever any
+    summary does, letting callers cache what they derive from the index.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        *,
+        ttl: float,
+        full_scan_interval: float = 60.0,
+        store: Optional[Callable[[], Optional["StateStore"]]] = None,
+    ) -> None:
+        self.root = root
+        self.ttl = ttl
+        self.full_scan_interval = full_scan_interval
+        self.version = 0
+        self._store = store
+        self._entries: Dict[str, tuple[tuple, Dict[str, Any]]] = {}
+        self._runs: Dict[str, Dict[str, Any]] = {}
+        self._checked_at: Optional[float] = None
+        self._full_scan_at: Optional[float] = None
+        self._root_signature: Optional[tuple] = None
+        self._run_cursor = 0
+        self._dirty: Set[str] = set()
+
+    def invalidate(self, task_dir_name: Optional[str] = None) -> None:
+        if task_dir_name is None:
+            self._full_scan_at = None
+        else:
+            self._dirty.add(task_dir_name)
+        self._checked_at = None
+
+    def runs(self) -> Dict[str, Dict[str, Any]]:
+        now = time.monotonic()
+        if self._checked_at is not None and now - self._checked_at < self.ttl:
+            return self._runs
+        self._checked_at = now
+        store = self._store() if self._store is not None else None
+        changed = False
+        if (
+            store is None
+            or self._full_scan_at is None
+            or now - self._full_scan_at >= self.full_scan_interval
+        ):
+            if store is not None:
+                self._run_cursor = store.last_run_id()
+            changed = self._refresh_all()
+            self._full_scan_at = now
+            self._dirty.clear()
+        else:
+            names = set(self._dirty)
+            self._dirty.clear()
+            rows = store.runs_since(self._run_cursor)
+            if rows:
+                self._run_cursor = rows[-1]["id"]
+            for row in rows:
+                parts = (row.get("agent_label") or "").split("/")
+                if len(parts) >= 2 and parts[0] == "tasks":
+                    names.add(parts[1])
+            root_signature = _file_signature(self.root)
+            if root_signature != self._root_signature:
+                self._root_signature = root_signature
+                listed = set(self._list_dirs())
+                names.update(listed.symmetric_difference(self._entries))
+            for name in names:
+                changed = self._refresh_dir(name) or changed
+        if changed or self.version == 0:
+            self.version += 1
+            self._runs = {name.upper(): entry for name, (_, entry) in self._entries.items()}
+        return self._runs
+
+    def _list_dirs(self) -> List[str]:
+        try:
+            return [entry.name for entry in os.scandir(self.root) if entry.is_dir()]
+        except OSError:
+            return []
+
+    def _refresh_all(self) -> bool:
+        self._root_signature = _file_signature(self.root)
+        names = set(self._list_dirs())
+        changed = False
+        for name in names | set(self._entries):
+            changed = self._refresh_dir(name) or changed
+        return changed
+
+    def _refresh_dir(self, name: str) -> bool:
+        task_dir = self.root / name
+        if not task_dir.is_dir():
+            return self._entries.pop(name, None) is not None
+        files = self._txt_files(task_dir)
+        signature = tuple(sorted((file_name, mtime, size) for file_name, (mtime, size, _) in files.items()))
+        cached = self._entries.get(name)
+        if cached is not None and cached[0] == signature:
+            return False
+        self._entries[name] = (signature, self._summarize(files))
+        return True
+
+    @staticmethod
+    def _txt_files(task_dir: Path) -> Dict[str, tuple[int, int, Path]]:
+        files: Dict[str, tuple[int, int, Path]] = {}
+        try:
+            entries = list(os.scandir(task_dir))
+        except OSError:
+            return files
+        for entry in entries:
+            if not entry.name.endswith(".txt") or not entry.is_file():
+                continue
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            files[entry.name] = (stat.st_mtime_ns, stat.st_size, Path(entry.path))
+        return files
+
+    @staticmethod
+    def _summarize(files: Dict[str, tuple[int, int, Path]]) -> Dict[str, Any]:
         entry: Dict[str, Any] = {"mtime": 0.0}
-        for file in path.glob("*.txt"):
+        # Oldest first so the most recent attempt of each role wins.
+        for name, (mtime_ns, _, path) in sorted(files.items(), key=lambda item: (item[1][0], item[0])):
             try:
-                payload = json.loads(file.read_text(encoding="utf-8"))
-            except json.JSONDecodeError:
+                payload = json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, json.JSONDecodeError):
                 payload = None
-            role_key = file.stem
+            role_key = Path(name).stem
             if role_key.startswith("agent"):
                 role_key = "agent"
             elif role_key.startswith("qa"):
@@ -203,9 +454,25 @@ def _load_task_runs() -> Dict[str, Dict[str, Any]]:
             elif role_key.startswith("manager"):
                 role_key = "manager"
             entry[role_key] = payload
-            entry["mtime"] = max(entry["mtime"], file.stat().st_mtime)
-        runs[path.name.upper()] = entry
-    return runs
+            entry["mtime"] = max(entry["mtime"], mtime_ns / 1e9)
+        return entry
+
+
+BACKLOG_CACHE = _BacklogCache(BACKLOG_FILE)
+TASK_RUN_INDEX = _TaskRunIndex(
+    TASKS_ARTIFACT_DIR,
+    ttl=float(os.getenv("TELEGRAM_TASK_INDEX_TTL", "2")),
+    store=lambda: _state_store(),
+)
+TASK_STATES_CACHE: Dict[str, Any] = {}
+
+
+def _load_backlog_map() -> Dict[str, Dict[str, Any]]:
+    return BACKLOG_CACHE.load()
+
+
+def _load_task_runs() -> Dict[str, Dict[str, Any]]:
+    return TASK_RUN_INDEX.runs()
 
 
 def _classify_status(run_info: Dict[str, Any]) -> str:
@@ -305,6 +572,9 @@ def _persist_bug_submission(bug_data: Dict[str, Any]) -> Path:
     state["last_submission_at"] = bug_data["submitted_at"]
     state["updated_at"] = bug_data["submitted_at"]
     state_path.write_text(json.dumps(state, indent=2), encoding="utf-8")
+    store = _state_store()
+    if store is not None:
+        store.save_item("bug", bug_data["bug_id"], state)
 
     return bug_dir
 
@@ -394,6 +664,9 @@ def _persist_feedback_submission(feedback_data: Dict[str, Any]) -> Path:
     state["last_submission_at"] = feedback_data["submitted_at"]
     state["updated_at"] = feedback_data["submitted_at"]
     state_path.write_text(json.dumps(state, indent=2), encoding="utf-8")
+    store = _state_store()
+    if store is not None:
+        store.save_item("feedback", feedback_data["feedback_id"], state)
 
     return fb_dir
 
@@ -408,8 +681,25 @@ def _read_json_file(path: Path) -> Optional[dict]:
         return None
 
 
+async def _notify_workflow_daemon(kind: str, item_id: str) -> bool:
+    """Hand a new submission to a running `workflow.py --daemon`; False when none is listening."""
+    if daemon_request is None or not WORKFLOW_SOCKET.exists():
+        return False
+    payload = {"op": "submit", "kind": kind, "id": item_id}
+    loop = asyncio.get_running_loop()
+    try:
+        reply = await loop.run_in_executor(None, lambda: daemon_request(WORKFLOW_SOCKET, payload))
+    except OSError as exc:
+        logging.info("Workflow daemon not reachable (%s); starting a one-shot run instead.", exc)
+        return False
+    if not reply.get("ok"):
+        logging.warning("Workflow daemon rejected %s %s: %s", kind, item_id, reply.get("error"))
+        return False
+    return True
+
+
 async def _trigger_workflow_after_submission(
-    update: Update, context: ContextTypes.DEFAULT_TYPE
+    update: Update, context: ContextTypes.DEFAULT_TYPE, *, kind: str, item_id: str
 ) -> None:
     chat = update.effective_chat
     if chat is None:
@@ -423,6 +713,10 @@ async def _trigger_workflow_after_submission(
         else:
             await context.bot.send_message(chat.id, text)
 
+    if await _notify_workflow_daemon(kind, item_id):
+        await send(f"The running workflow daemon picked up {item_id}; processing starts within seconds.")
+        return
+
     await _start_workflow_core(
         context=context,
         chat_id=chat.id,
@@ -607,6 +901,17 @@ def build_agents_menu(active_agent: Optional[int]) -> InlineKeyboardMarkup:
 def _collect_task_states() -> Dict[str, Any]:
     backlog = _load_backlog_map()
     runs = _load_task_runs()
+    cache_key = (BACKLOG_CACHE.signature, TASK_RUN_INDEX.version)
+    if TASK_STATES_CACHE.get("key") == cache_key:
+        return TASK_STATES_CACHE["summary"]
+    summary = _summarize_task_states(backlog, runs)
+    TASK_STATES_CACHE.update(key=cache_key, summary=summary)
+    return summary
+
+
+def _summarize_task_states(
+    backlog: Dict[str, Dict[str, Any]], runs: Dict[str, Dict[str, Any]]
+) -> Dict[str, Any]:
     tasks_summary: List[Dict[str, Any]] = []
     completed_ids: set[str] = set()
     counts = {"pass": 0, "fail": 0, "progress": 0, "pending": 0}
@@ -698,6 +1003,7 @@ def _mark_task_completed(task_id: str) -> Path:
     }
     result_path = task_dir / "manager-manual.txt"
     result_path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+    TASK_RUN_INDEX.invalidate(slug)
     return result_path
 
 
@@ -717,11 +1023,18 @@ def _parse_iso_datetime(value: Optional[str]) -> Optional[datetime]:
 
 def _collect_bug_states() -> List[Dict[str, Any]]:
     bugs: List[Dict[str, Any]] = []
-    if not BUGS_DIR.exists():
+    store = _state_store()
+    if store is not None:
+        states = store.item_states("bug")
+    elif BUGS_DIR.exists():
+        states = {
+            path.name: _read_json_file(path / "state.json") or {}
+            for path in sorted(path for path in BUGS_DIR.iterdir() if path.is_dir())
+        }
+    else:
         return bugs
-    for bug_dir in sorted(path for path in BUGS_DIR.iterdir() if path.is_dir()):
-        bug_id = bug_dir.name
-        state = _read_json_file(bug_dir / "state.json") or {}
+    for bug_id, state in states.items():
+        bug_dir = BUGS_DIR / bug_id
         submission = _read_json_file(bug_dir / "submission.json") or {}
         intake = _read_json_file(bug_dir / "intake.json") or {}
         triage = _read_json_file(bug_dir / "triage.json") or {}
@@ -763,11 +1076,18 @@ def _collect_bug_states() -> List[Dict[str, Any]]:
 
 def _collect_feedback_states() -> List[Dict[str, Any]]:
     feedback_items: List[Dict[str, Any]] = []
-    if not FEEDBACK_DIR.exists():
+    store = _state_store()
+    if store is not None:
+        states = store.item_states("feedback")
+    elif FEEDBACK_DIR.exists():
+        states = {
+            path.name: _read_json_file(path / "state.json") or {}
+            for path in sorted(path for path in FEEDBACK_DIR.iterdir() if path.is_dir())
+        }
+    else:
         return feedback_items
-    for fb_dir in sorted(path for path in FEEDBACK_DIR.iterdir() if path.is_dir()):
-        feedback_id = fb_dir.name
-        state = _read_json_file(fb_dir / "state.json") or {}
+    for feedback_id, state in states.items():
+        fb_dir = FEEDBACK_DIR / feedback_id
         submission = _read_json_file(fb_dir / "submission.json") or {}
         intake = _read_json_file(fb_dir / "intake.json") or {}
         review = _read_json_file(fb_dir / "review.json") or {}
@@ -805,10 +1125,15 @@ def _collect_feedback_states() -> List[Dict[str, Any]]:
 
 
 def _find_task_agent_session(task_id: str) -> Optional[str]:
-    if not CONVERSATIONS_LOG.exists():
-        return None
     slug = task_id.lower()
     agent_label = f"tasks/{slug}/agent"
+    store = _state_store()
+    if store is not None:
+        return store.latest_session(label_prefix=agent_label, role="agent")
+    if CONVERSATION_LOG is not None:
+        return CONVERSATION_LOG.latest_session(label_prefix=agent_label)
+    if not CONVERSATIONS_LOG.exists():
+        return None
     try:
         lines = [
             line
@@ -1012,6 +1337,11 @@ def build_feedback_detail(item: Dict[str, Any]) -> tuple[str, InlineKeyboardMark
 
 
 def _latest_stage_entry() -> Optional[Dict[str, Any]]:
+    store = _state_store()
+    if store is not None:
+        return store.latest_run(prompt_numbers=STAGE_NAMES)
+    if CONVERSATION_LOG is not None:
+        return CONVERSATION_LOG.latest(prompt_numbers=STAGE_NAMES)
     if not CONVERSATIONS_LOG.exists():
         return None
     try:
@@ -1308,7 +1638,7 @@ async def bug_collect_environment(update: Update, context: ContextTypes.DEFAULT_
         parse_mode="Markdown",
     )
     try:
-        await _trigger_workflow_after_submission(update, context)
+        await _trigger_workflow_after_submission(update, context, kind="bug", item_id=bug_data["bug_id"])
     except Exception:  # noqa: BLE001
         logging.exception("Failed to auto-start workflow after bug submission")
         await message.reply_text(
@@ -1530,7 +1860,7 @@ async def feedback_collect_links(update: Update, context: ContextTypes.DEFAULT_T
         parse_mode="Markdown",
     )
     try:
-        await _trigger_workflow_after_submission(update, context)
+        await _trigger_workflow_after_submission(update, context, kind="feedback", item_id=data["feedback_id"])
     except Exception:  # noqa: BLE001
         logging.exception("Failed to auto-start workflow after feedback submission")
         await message.reply_text(
@@ -1558,6 +1888,7 @@ def _cleanup_finished_process() -> None:
     WORKFLOW_PROCESS = None
     WORKFLOW_LOG_HANDLE = None
     WORKFLOW_LOG_PATH = None
+    WORKFLOW_PROBE.invalidate()
 
 
 def _cancel_workflow_monitor() -> None:
@@ -2101,6 +2432,67 @@ async def menu_callback(update: Update, context: ContextTypes.DEFAULT_TYPE) -> N
 
     await query.answer("Unsupported action", show_alert=True)
 
+def _latest_transcript(target: str) -> Optional[tuple[str, str]]:
+    """Return ``(label, text)`` of a transcript named by label, or the newest one of a task id."""
+    artifacts_dir = PLATFORM_DIR / "automation_artifacts"
+    if "/" in target:
+        label = target if target.endswith(".log") else f"{target}.log"
+    else:
+        prefix = f"tasks/{target.lower()}/"
+        candidates: Dict[str, float] = {}
+        if TRANSCRIPT_STORE is not None:
+            for archived in TRANSCRIPT_STORE.labels(prefix):
+                record = TRANSCRIPT_STORE.lookup(archived)
+                if record is not None:
+                    candidates[archived] = datetime.fromisoformat(record.archived_at).timestamp()
+        for path in (artifacts_dir / prefix).glob("*.log"):
+            try:
+                candidates[f"{prefix}{path.name}"] = path.stat().st_mtime
+            except OSError:
+                continue
+        if not candidates:
+            return None
+        label = max(candidates, key=lambda name: candidates[name])
+    # Labels come from chat input: keep them inside the artifacts directory.
+    if Path(label).is_absolute() or ".." in Path(label).parts:
+        return None
+    path = artifacts_dir / label
+    if not path.resolve().is_relative_to(artifacts_dir.resolve()):
+        return None
+    if read_artifact_text is not None:
+        text = read_artifact_text(path, artifacts_dir, TRANSCRIPT_STORE)
+    else:
+        text = path.read_text(encoding="utf-8") if path.exists() else None
+    return (label, text) if text is not None else None
+
+
+async def transcript_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    if not is_authorized(update):
+        return
+    if update.message is None:
+        return
+    if not context.args:
+        await update.message.reply_text(
+            "Usage: /transcript <TASK-ID> for the newest transcript of a task, "
+            "or /transcript <label> (e.g. tasks/t-011/agent-retry3)."
+        )
+        return
+    target = context.args[0].strip()
+    loop = asyncio.get_running_loop()
+    try:
+        found = await loop.run_in_executor(None, _latest_transcript, target)
+    except (OSError, RuntimeError) as exc:
+        await update.message.reply_text(f"Unable to read the transcript: {exc}")
+        return
+    if found is None:
+        await update.message.reply_text(f"No transcript found for {target}.")
+        return
+    label, text = found
+    header = f"📜 {label} (last lines):\n"
+    tail = text[-(TELEGRAM_MESSAGE_LIMIT - len(header) - 16):]
+    await update.message.reply_text(header + tail)
+
+
 def _format_log_path(path: Optional[Path]) -> str:
     if not path:
         return "(no log recorded)"
@@ -2264,6 +2656,7 @@ async def help_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
         "/end — Clear the active agent and task context selections.\n"
         "/refresh — Tell Codex the environment was refreshed and resume the existing session.\n"
         "/status — Show current workflow stage and task summary.\n"
+        "/transcript <task-id|label> — Show the end of the newest Codex transcript of a task.\n"
         "/bug — Guided flow to report a bug.\n"
         "/feedback — Guided flow to suggest improvements or new features.\n"
         "/workflow_start <args> — Launch platform/automation/workflow.py with optional CLI arguments.\n"
@@ -2394,6 +2787,176 @@ async def refresh(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     )
 
 
+def _codex_lock(key: Path) -> asyncio.Lock:
+    lock = CODEX_LOCKS.get(str(key))
+    if lock is None:
+        lock = CODEX_LOCKS[str(key)] = asyncio.Lock()
+    return lock
+
+
+async def _run_codex(
+    command: List[str],
+    prompt: str,
+    *,
+    on_output: Optional[Callable[[str], None]] = None,
+) -> tuple[int, str, str]:
+    async with CODEX_SEMAPHORE:
+        process = await asyncio.create_subprocess_exec(
+            *command,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            cwd=REPO_ROOT,
+        )
+        try:
+            _, stdout, stderr = await asyncio.gather(
+                _write_stdin(process, prompt.encode("utf-8")),
+                _read_stream(process.stdout, on_output),
+                _read_stream(process.stderr, on_output),
+            )
+            await process.wait()
+        except asyncio.CancelledError:
+            if process.returncode is None:
+                process.kill()
+                await asyncio.shield(process.wait())
+            raise
+    return (process.returncode if process.returncode is not None else -1, stdout, stderr)
+
+
+async def _write_stdin(process: asyncio.subprocess.Process, data: bytes) -> None:
+    assert process.stdin is not None
+    try:
+        process.stdin.write(data)
+        await process.stdin.drain()
+    except (BrokenPipeError, ConnectionResetError):
+        pass
+    finally:
+        process.stdin.close()
+
+
+async def _read_stream(
+    stream: Optional[asyncio.StreamReader],
+    on_output: Optional[Callable[[str], None]],
+) -> str:
+    if stream is None:
+        return ""
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    parts: List[str] = []
+    while True:
+        chunk = await stream.read(4096)
+        text = decoder.decode(chunk, final=not chunk)
+        if text:
+            parts.append(text)
+            if on_output is not None:
+                on_output(text)
+        if not chunk:
+            return "".join(parts)
+
+
+def _split_message(text: str, limit: int = TELEGRAM_MESSAGE_LIMIT) -> List[str]:
+    chunks: List[str] = []
+    while len(text) > limit:
+        cut = text.rfind("\n", 0, limit)
+        if cut <= 0:
+            cut = limit
+        chunks.append(text[:cut])
+        text = text[cut:].lstrip("\n")
+    if text.strip():
+        chunks.append(text)
+    return chunks
+
+
+async def _reply_long(message, text: str) -> None:
+    for chunk in _split_message(text):
+        try:
+            await message.reply_text(chunk, parse_mode="Markdown")
+        except BadRequest:
+            # Splitting can leave a Markdown entity unbalanced; send that part verbatim.
+            await message.reply_text(chunk)
+
+
+class _CodexProgress:
+    """Streams a running Codex turn into one Telegram message.
+
+    Output is buffered as it arrives and the message is edited with its tail
+    at most every ``interval`` seconds. The answer itself is only sent once
+    the process has exited: Codex may keep rewriting ``response.md`` after
+    its first draft. Progress is best effort; Telegram errors while updating
+    it are logged and never abort the turn.
+    """
+
+    def __init__(self, message, *, interval: float) -> None:
+        self.message = message
+        self.interval = interval
+        self.started = time.monotonic()
+        self._tail = ""
+        self._status_message = None
+        self._shown: Optional[str] = None
+        self._not_before = 0.0
+        self._done = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        # Let an in-flight edit finish rather than cancelling it half way.
+        self._done.set()
+        if self._task is not None:
+            task, self._task = self._task, None
+            try:
+                await task
+            except Exception:
+                logging.exception("Codex progress updates failed")
+
+    def feed(self, text: str) -> None:
+        self._tail = (self._tail + text)[-2 * STREAM_TAIL_CHARS:]
+
+    async def close(self, return_code: int) -> None:
+        if self._status_message is None:
+            return
+        elapsed = int(time.monotonic() - self.started)
+        if return_code == 0:
+            await self._show(f"Codex finished in {elapsed}s.", force=True)
+        else:
+            await self._show(f"Codex stopped after {elapsed}s (return code {return_code}).", force=True)
+
+    async def _run(self) -> None:
+        while not self._done.is_set():
+            try:
+                await asyncio.wait_for(self._done.wait(), self.interval)
+            except asyncio.TimeoutError:
+                await self._show(self._render())
+
+    def _render(self) -> str:
+        header = f"⏳ Codex is working ({int(time.monotonic() - self.started)}s)"
+        tail = self._tail[-STREAM_TAIL_CHARS:]
+        if len(self._tail) > STREAM_TAIL_CHARS and "\n" in tail:
+            tail = "…" + tail[tail.index("\n"):]
+        tail = tail.strip()
+        return f"{header}\n\n{tail}" if tail else header
+
+    async def _show(self, text: str, *, force: bool = False) -> None:
+        now = time.monotonic()
+        if text == self._shown or (not force and now < self._not_before):
+            return
+        try:
+            if self._status_message is None:
+                self._status_message = await self.message.reply_text(text)
+            else:
+                await self._status_message.edit_text(text)
+            self._shown = text
+        except RetryAfter as exc:
+            retry_after = exc.retry_after
+            seconds = retry_after.total_seconds() if hasattr(retry_after, "total_seconds") else retry_after
+            self._not_before = now + float(seconds)
+        except BadRequest as exc:
+            if "message is not modified" not in str(exc).lower():
+                logging.warning("Could not update Codex progress message: %s", exc)
+        except TelegramError as exc:
+            logging.warning("Could not update Codex progress message: %s", exc)
+
+
 async def process_prompt(
     update: Update,
     chat_dir: Path,
@@ -2404,6 +2967,30 @@ async def process_prompt(
 ) -> None:
     if session_path is None:
         session_path = chat_dir / "session.txt"
+    # Lock order is always chat, then session: a chat's turns share response.md,
+    # and agent session files are shared between chats.
+    chat_lock = _codex_lock(chat_dir)
+    session_lock = _codex_lock(session_path)
+    if (chat_lock.locked() or session_lock.locked()) and update.message:
+        await update.message.reply_text("Queued: waiting for the previous Codex turn to finish.")
+    async with chat_lock, session_lock:
+        await _process_prompt_locked(
+            update,
+            chat_dir,
+            user_text,
+            session_path=session_path,
+            log_label=log_label,
+        )
+
+
+async def _process_prompt_locked(
+    update: Update,
+    chat_dir: Path,
+    user_text: str,
+    *,
+    session_path: Path,
+    log_label: str,
+) -> None:
     session_path.parent.mkdir(parents=True, exist_ok=True)
     response_file = chat_dir / "response.md"
     logs_file = chat_dir / f"codex-{log_label}.log"
@@ -2426,35 +3013,43 @@ async def process_prompt(
     if session_id:
         command.extend(["resume", session_id])
 
-    process = subprocess.run(
-        command,
-        input=prompt,
-        capture_output=True,
-        text=True,
-        cwd=REPO_ROOT,
-    )
+    progress: Optional[_CodexProgress] = None
+    if STREAM_INTERVAL > 0 and update.message:
+        progress = _CodexProgress(update.message, interval=STREAM_INTERVAL)
+        progress.start()
+    try:
+        return_code, stdout, stderr = await _run_codex(
+            command,
+            prompt,
+            on_output=progress.feed if progress is not None else None,
+        )
+    finally:
+        if progress is not None:
+            await progress.stop()
+    if progress is not None:
+        await progress.close(return_code)
 
     logs_file.parent.mkdir(parents=True, exist_ok=True)
     with logs_file.open("a", encoding="utf-8") as log:
         log.write("\n--- Message ---\n")
         log.write(prompt + "\n")
         log.write("--- STDOUT ---\n")
-        log.write(process.stdout)
+        log.write(stdout)
         log.write("\n--- STDERR ---\n")
-        log.write(process.stderr)
+        log.write(stderr)
         log.write("\n")
 
-    if process.returncode != 0:
-        snippet = process.stderr.strip() or process.stdout.strip()
+    if return_code != 0:
+        snippet = stderr.strip() or stdout.strip()
         if snippet:
             snippet = "\n" + snippet[-500:]
         if update.message:
             await update.message.reply_text(
-                "Codex command failed (return code {}).{}".format(process.returncode, snippet or "")
+                "Codex command failed (return code {}).{}".format(return_code, snippet or "")
             )
         return
 
-    new_session = extract_session_id(process.stdout)
+    new_session = extract_session_id(stdout)
     if new_session:
         session_path.write_text(new_session, encoding="utf-8")
 
@@ -2469,7 +3064,7 @@ async def process_prompt(
 
     text = response_file.read_text(encoding="utf-8")
     if update.message:
-        await update.message.reply_text(text, parse_mode="Markdown")
+        await _reply_long(update.message, text)
 
 
 def main() -> None:
@@ -2486,8 +3081,9 @@ def main() -> None:
     application.add_handler(CommandHandler("stop", stop))
     application.add_handler(CommandHandler("end", end_command))
     application.add_handler(CommandHandler("help", help_command))
-    application.add_handler(CommandHandler("refresh", refresh))
+    application.add_handler(CommandHandler("refresh", refresh, block=False))
     application.add_handler(CommandHandler("status", status_command))
+    application.add_handler(CommandHandler("transcript", transcript_command))
     application.add_handler(CommandHandler("workflow_start", workflow_start))
     application.add_handler(CommandHandler("workflow_stop", workflow_stop))
     bug_handler = ConversationHandler(
@@ -2521,10 +3117,10 @@ def main() -> None:
     application.add_handler(feedback_handler)
     for command_name in sorted(PROMPT_COMMANDS):
         application.add_handler(
-            CommandHandler(command_name, handle_prompt_command_factory(command_name))
+            CommandHandler(command_name, handle_prompt_command_factory(command_name), block=False)
         )
     application.add_handler(CallbackQueryHandler(menu_callback))
-    application.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, handle_message))
+    application.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, handle_message, block=False))
 
     application.run_polling(drop_pending_updates=True)
 